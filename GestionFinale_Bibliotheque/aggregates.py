@@ -0,0 +1,160 @@
+
+from typing import Dict, Hashable, Optional
+
+import pandas as pd
+
+class FrequencyCounter:
+    """
+    Compteur d'occurrences avec élément le plus fréquent maintenu.
+    
+    Les clés sont rangées par nombre d'occurrences (une case par compte),
+    ce qui permet d'incrémenter, de décrémenter et de connaître le
+    maximum en temps constant. En cas d'égalité, most_common retourne la
+    plus petite clé, comme Series.mode()[0]; elle est gardée en cache et
+    n'est recherchée dans la case du maximum que si celle-ci a perdu cette
+    clé ou changé.
+    """
+    
+    def __init__(self):
+        self._counts: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, set] = {}
+        self._max = 0
+        self._top: Optional[Hashable] = None
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+    
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "FrequencyCounter":
+        """Initialise le compteur à partir d'une colonne (valeurs manquantes ignorées)."""
+        counter = cls()
+        for key, count in series.value_counts().items():
+            if not count:
+                # Catégorie déclarée mais absente (colonne "category")
+                continue
+            counter._counts[key] = int(count)
+            counter._buckets.setdefault(int(count), set()).add(key)
+        counter._max = max(counter._buckets, default=0)
+        return counter
+    
+    def add_series(self, series: pd.Series) -> None:
+        """Ajoute les occurrences d'une colonne (lecture du catalogue par blocs)."""
+        for key, count in series.value_counts().items():
+            if count:
+                old = self._counts.get(key, 0)
+                self._move(key, old, old + int(count))
+    
+    def _move(self, key: Hashable, old: int, new: int) -> None:
+        """Déplace une clé d'une case de compte à une autre."""
+        if old:
+            bucket = self._buckets[old]
+            bucket.discard(key)
+            if old == self._max and key == self._top:
+                self._top = None
+            if not bucket:
+                del self._buckets[old]
+                if old == self._max:
+                    # La clé déplacée était seule au maximum
+                    self._max = new
+                    self._top = None
+        if new:
+            self._counts[key] = new
+            self._buckets.setdefault(new, set()).add(key)
+            if new > self._max:
+                # Nouvelle case du maximum, qui ne contient que cette clé
+                self._max = new
+                self._top = key
+            elif new == self._max and self._top is not None and key < self._top:
+                self._top = key
+        else:
+            del self._counts[key]
+    
+    def increment(self, key: Hashable) -> None:
+        """Ajoute une occurrence de key."""
+        if pd.isna(key):
+            return
+        count = self._counts.get(key, 0)
+        self._move(key, count, count + 1)
+    
+    def decrement(self, key: Hashable) -> None:
+        """Retire une occurrence de key."""
+        if pd.isna(key):
+            return
+        count = self._counts.get(key, 0)
+        if count:
+            self._move(key, count, count - 1)
+    
+    def most_common(self) -> Optional[Hashable]:
+        """Retourne la clé la plus fréquente, ou None si le compteur est vide."""
+        if not self._max:
+            return None
+        if self._top is None:
+            self._top = min(self._buckets[self._max])
+        return self._top
+    
+    def to_dict(self) -> Dict[Hashable, int]:
+        """Retourne les comptes, du plus fréquent au moins fréquent."""
+        return dict(sorted(self._counts.items(), key=lambda item: -item[1]))
+
+class CatalogStatistics:
+    """
+    Statistiques du catalogue tenues à jour à chaque modification
+    (quantité totale, livres par catégorie, livres par auteur).
+    """
+    
+    def __init__(self):
+        self.total_books = 0
+        self.total_quantity = 0
+        self.categories = FrequencyCounter()
+        self.authors = FrequencyCounter()
+    
+    @staticmethod
+    def _quantity(row: Dict) -> int:
+        value = row.get("Quantity")
+        return 0 if pd.isna(value) else int(value)
+    
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "CatalogStatistics":
+        """Calcule les agrégats initiaux en une passe vectorisée."""
+        stats = cls()
+        stats.total_books = len(df)
+        stats.total_quantity = int(pd.to_numeric(df["Quantity"]).fillna(0).sum())
+        stats.categories = FrequencyCounter.from_series(df["Category"])
+        stats.authors = FrequencyCounter.from_series(df["Author"])
+        return stats
+    
+    def add_frame(self, df: pd.DataFrame) -> None:
+        """Prend en compte un bloc de livres (lecture du catalogue par blocs)."""
+        self.total_books += len(df)
+        self.total_quantity += int(pd.to_numeric(df["Quantity"]).fillna(0).sum())
+        self.categories.add_series(df["Category"])
+        self.authors.add_series(df["Author"])
+    
+    def add_row(self, row: Dict) -> None:
+        """Prend en compte un livre ajouté."""
+        self.total_books += 1
+        self.total_quantity += self._quantity(row)
+        self.categories.increment(row.get("Category"))
+        self.authors.increment(row.get("Author"))
+    
+    def remove_row(self, row: Dict) -> None:
+        """Prend en compte un livre supprimé."""
+        self.total_books -= 1
+        self.total_quantity -= self._quantity(row)
+        self.categories.decrement(row.get("Category"))
+        self.authors.decrement(row.get("Author"))
+    
+    def update_row(self, old_row: Dict, new_row: Dict) -> None:
+        """Prend en compte la modification d'un livre."""
+        self.remove_row(old_row)
+        self.add_row(new_row)
+    
+    def to_dict(self) -> Dict:
+        """Retourne les statistiques au format de LibraryDatabase.get_statistics."""
+        author = self.authors.most_common()
+        return {
+            "total_livres": self.total_books,
+            "quantité_totale": self.total_quantity,
+            "catégories_uniques": len(self.categories),
+            "auteur_frequent": author if author is not None else "N/A"
+        }
@@ -1,9 +1,15 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from PIL import Image, ImageTk
 import os
-from database import LibraryDatabase
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from database import LibraryDatabase, open_database
+from file_watcher import FileWatcher
+from persistence import WriteBehindWriter
+from thumbnails import ThumbnailCache, ThumbnailLoader
+from virtual_table import LazySource, VirtualTreeview
 
 class BibliothequApp:
   
@@ -18,12 +24,40 @@ class BibliothequApp:
     COULEUR_TEXTE_CLAIR = "#FFFFFF"       
     COULEUR_BOUTON_HOVER = "#34495E"      
     
-    def __init__(self, root):
+    # Recherche: délai d'attente après la dernière frappe et période de
+    # vérification du résultat calculé en arrière-plan (ms)
+    DELAI_RECHERCHE = 250
+    DELAI_POLL_RECHERCHE = 30
+    
+    # Période de traitement des modifications venant d'autres threads (ms)
+    DELAI_POLL_EVENEMENTS = 100
+    
+    # Taille maximale de l'aperçu de couverture du formulaire (pixels) et
+    # période de vérification de son décodage en arrière-plan (ms)
+    TAILLE_APERCU = (400, 300)
+    DELAI_POLL_IMAGE = 30
+    
+    # Colonne optionnelle de miniatures du tableau des livres: taille des
+    # miniatures, hauteur de ligne correspondante (pixels) et nombre de
+    # miniatures gardées en mémoire
+    TAILLE_MINIATURE = (32, 32)
+    HAUTEUR_LIGNE_MINIATURE = 36
+    MINIATURES_EN_MEMOIRE = 256
+    
+    # Méthodes de l'application chronométrées quand l'instrumentation est active
+    METHODES_MESUREES = (
+        "show_dashboard", "show_books", "show_statistics", "show_add_book",
+        "_update_tree", "_fill_tree", "_load_book_form",
+    )
+    
+    def __init__(self, root, db=None, instrumentation=None):
         """
         Initialise l'application principale.
         
         Args:
             root: Fenêtre Tkinter racine
+            db: Base de données à utiliser (par défaut open_database())
+            instrumentation: Mesures de performance (Instrumentation) ou None
         """
         self.root = root
         self.root.title("Gestion de Bibliothèque")
@@ -32,13 +66,70 @@ class BibliothequApp:
         self.root.configure(bg=self.COULEUR_FOND)
         
         # Initialiser la base de données
-        self.db = LibraryDatabase()
+        self.db = db if db is not None else open_database()
+        
+        # Écritures sur disque confiées à un thread: les modifications
+        # retournent immédiatement, les erreurs sont signalées par _poll_db_events.
+        # En mode partagé, chaque écriture a lieu sous le verrou de fichier.
+        if isinstance(self.db, LibraryDatabase) and not self.db.shared:
+            self.writer = WriteBehindWriter(self.db)
+        else:
+            self.writer = None
+        
+        # Miniatures des couvertures (disque + PhotoImage récents en mémoire)
+        self.thumbnails = ThumbnailCache()
+        
+        # Décodage des couvertures hors du thread Tk (une seule à la fois affichée)
+        self._cover_future = None
+        self._cover_generation = 0
+        self._image_executor = ThreadPoolExecutor(max_workers=2)
+        
+        # Miniatures du tableau: chargées seulement pour les lignes visibles
+        self.show_thumbnails = tk.BooleanVar(value=False)
+        self._thumbnail_loader = ThumbnailLoader(
+            self.root,
+            ThumbnailCache(max_photos=self.MINIATURES_EN_MEMOIRE),
+            self.TAILLE_MINIATURE,
+            self._image_executor,
+            self._on_thumbnail_ready
+        )
+        ttk.Style().configure("Couvertures.Treeview", rowheight=self.HAUTEUR_LIGNE_MINIATURE)
         
         # Variable pour stocker le livre actuellement édité
         self.current_book_id = None
         self.current_image_path = None
         self.current_page = None
         
+        # Recherche différée: une seule requête à la fois hors du thread Tk
+        self._search_after_id = None
+        self._search_future = None
+        self._search_generation = 0
+        self._search_executor = ThreadPoolExecutor(max_workers=1)
+        
+        # Modifications de la base appliquées au tableau ligne par ligne
+        self._db_events = queue.Queue()
+        self.db.add_listener(self._on_db_change)
+        self.root.after(self.DELAI_POLL_EVENEMENTS, self._poll_db_events)
+        
+        # Modifications faites hors de l'application (tableur, script, autre
+        # poste): détectées par un thread, appliquées par différence et
+        # répercutées par les mêmes événements
+        self._stat_labels = {}
+        self.file_watcher = None
+        if hasattr(self.db, "watched_paths"):
+            self.file_watcher = FileWatcher(self.db.watched_paths(), self._on_files_changed)
+            self.file_watcher.start()
+        
+        # Mesures de performance optionnelles: à installer avant la création
+        # des widgets, qui gardent des références aux méthodes des pages
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.instrument(self.db, prefix="db.")
+            instrumentation.instrument(self, self.METHODES_MESUREES, prefix="app.")
+            for cache in (self.thumbnails, self._thumbnail_loader.cache):
+                instrumentation.instrument(cache, ["get_image", "photo_from_image"], prefix="image.")
+            instrumentation.watch_event_loop(self.root)
+        
         # Configurer les styles
         self._configure_styles()
         
@@ -47,6 +138,9 @@ class BibliothequApp:
         
         # Afficher le dashboard au démarrage
         self.show_dashboard()
+        
+        # Compacter le journal à la fermeture
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
     
     def _configure_styles(self):
         """Configure les styles Tkinter avec couleurs modernes."""
@@ -250,8 +344,29 @@ class BibliothequApp:
         )
         return btn
     
+    def _on_close(self):
+        """Ferme l'application après avoir écrit et compacté la base de données."""
+        self._cancel_search()
+        self._search_executor.shutdown(wait=False)
+        self._cancel_cover()
+        self._thumbnail_loader.cancel()
+        self._image_executor.shutdown(wait=False)
+        try:
+            if self.file_watcher is not None:
+                self.file_watcher.stop()
+            if self.writer is not None:
+                self.writer.close()
+            self.db.close()
+        except Exception as e:
+            print(f"Erreur lors de la fermeture: {e}")
+        self.root.destroy()
+    
     def _clear_content(self):
         """Nettoie la zone de contenu (content_frame)."""
+        # Une recherche ou une image en cours ne concerne plus la page affichée
+        self._cancel_search()
+        self._cancel_cover()
+        self._thumbnail_loader.cancel()
         for widget in self.content_frame.winfo_children():
             widget.destroy()
     
@@ -514,23 +629,26 @@ class BibliothequApp:
         )
         search_entry.pack(side="left", fill="x", expand=True)
         
+        tk.Checkbutton(
+            search_frame,
+            text="Couvertures",
+            variable=self.show_thumbnails,
+            command=self._apply_thumbnail_mode,
+            font=('Segoe UI', 10),
+            bg=self.COULEUR_FOND,
+            fg=self.COULEUR_TEXTE,
+            activebackground=self.COULEUR_FOND
+        ).pack(side="left", padx=(10, 0))
+        
         # Tableau des livres
         table_frame = tk.Frame(content, bg=self.COULEUR_FOND)
         table_frame.pack(fill="both", expand=True, pady=(0, 15))
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(table_frame)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Treeview
+        # Treeview virtuel: seules les lignes visibles sont créées
         columns = ("ID", "Titre", "Auteur", "Année", "Catégorie", "Quantité")
-        self.tree = ttk.Treeview(
-            table_frame,
-            columns=columns,
-            height=20,
-            yscrollcommand=scrollbar.set
-        )
-        scrollbar.config(command=self.tree.yview)
+        self.table = VirtualTreeview(table_frame, columns, self._format_book_row,
+                                     on_window=self._thumbnail_loader.retain)
+        self.tree = self.table.tree
         
         # Configuration des colonnes
         self.tree.column("#0", width=0, stretch=False)
@@ -554,6 +672,7 @@ class BibliothequApp:
         self.tree.bind("<Double-1>", self._on_tree_double_click)
         
         self.tree.pack(fill="both", expand=True)
+        self._apply_thumbnail_mode()
         
         # Boutons d'actions
         actions_frame = tk.Frame(content, bg=self.COULEUR_FOND)
@@ -615,8 +734,9 @@ class BibliothequApp:
         # Récupérer les stats
         stats = self.db.get_statistics()
         
-        # Créer les cartes
-        self._create_stat_card(
+        # Créer les cartes (valeurs mises à jour par _refresh_statistics)
+        self._stat_labels = {}
+        self._stat_labels["total_livres"] = self._create_stat_card(
             content,
             " Total de Livres",
             str(stats['total_livres']),
@@ -625,7 +745,7 @@ class BibliothequApp:
             col=0
         )
         
-        self._create_stat_card(
+        self._stat_labels["quantité_totale"] = self._create_stat_card(
             content,
             " Quantité Totale",
             str(stats['quantité_totale']),
@@ -634,7 +754,7 @@ class BibliothequApp:
             col=1
         )
         
-        self._create_stat_card(
+        self._stat_labels["catégories_uniques"] = self._create_stat_card(
             content,
             " Catégories Uniques",
             str(stats['catégories_uniques']),
@@ -643,7 +763,7 @@ class BibliothequApp:
             col=2
         )
         
-        self._create_stat_card(
+        self._stat_labels["auteur_frequent"] = self._create_stat_card(
             content,
             " Auteur Fréquent",
             str(stats['auteur_frequent']),
@@ -665,6 +785,9 @@ class BibliothequApp:
             row: Ligne
             col: Colonne
             colspan: Nombre de colonnes
+            
+        Returns:
+            Label affichant la valeur
         """
         card = tk.Frame(
             parent,
@@ -696,6 +819,13 @@ class BibliothequApp:
         
         parent.grid_columnconfigure(col, weight=1)
         parent.grid_rowconfigure(row, weight=1)
+        return value_label
+    
+    def _refresh_statistics(self):
+        """Met à jour les valeurs de la page Statistiques (agrégats incrémentaux)."""
+        stats = self.db.get_statistics()
+        for key, label in self._stat_labels.items():
+            label.config(text=str(stats[key]))
     
     # ===================
     # HELPERS
@@ -709,14 +839,95 @@ class BibliothequApp:
         
         if file_path:
             self.current_image_path = file_path
-            try:
-                img = Image.open(file_path)
-                img.thumbnail((400, 300))
-                photo = ImageTk.PhotoImage(img)
-                self.image_preview.config(image=photo, text="")
-                self.image_preview.image = photo
-            except Exception as e:
+            self._show_cover(file_path, report_errors=True)
+    
+    def _show_cover(self, path, report_errors=False):
+        """
+        Affiche une couverture dans l'aperçu du formulaire sans bloquer.
+        
+        Une image déjà en mémoire est affichée immédiatement; sinon un
+        texte d'attente est affiché et le décodage est confié au pool
+        d'images, son résultat étant récupéré par _poll_cover.
+        
+        Args:
+            path: Chemin de l'image
+            report_errors: Afficher une boîte d'erreur si l'image est illisible
+        """
+        self._cancel_cover()
+        photo = self.thumbnails.cached_photo(path, self.TAILLE_APERCU)
+        if photo is not None:
+            self.image_preview.config(image=photo, text="")
+            self.image_preview.image = photo
+            return
+        
+        self.image_preview.config(image="", text="Chargement de l'image...")
+        self.image_preview.image = None
+        generation = self._cover_generation
+        self._cover_future = self._image_executor.submit(self.thumbnails.get_image, path, self.TAILLE_APERCU)
+        self.root.after(self.DELAI_POLL_IMAGE, self._poll_cover, self._cover_future, generation,
+                        path, report_errors)
+    
+    def _poll_cover(self, future, generation, path, report_errors):
+        """Affiche la couverture décodée si elle concerne toujours le formulaire."""
+        if generation != self._cover_generation or future.cancelled():
+            return
+        
+        if not future.done():
+            self.root.after(self.DELAI_POLL_IMAGE, self._poll_cover, future, generation,
+                            path, report_errors)
+            return
+        
+        self._cover_future = None
+        if not self.image_preview.winfo_exists():
+            return
+        try:
+            image = future.result()
+            photo = self.thumbnails.photo_from_image(path, self.TAILLE_APERCU, image) if image else None
+        except Exception as e:
+            self.image_preview.config(image="", text="Image illisible")
+            if report_errors:
                 messagebox.showerror("Erreur", f"Impossible de charger l'image: {e}")
+            else:
+                print(f"Erreur de chargement d'image: {e}")
+            return
+        
+        if photo is None:
+            self.image_preview.config(image="", text="Aucune image")
+        else:
+            self.image_preview.config(image=photo, text="")
+        self.image_preview.image = photo
+    
+    def _cancel_cover(self):
+        """Abandonne le chargement de couverture en cours; son résultat sera ignoré."""
+        if self._cover_future is not None:
+            self._cover_future.cancel()
+            self._cover_future = None
+        self._cover_generation += 1
+    
+    def _apply_thumbnail_mode(self):
+        """Affiche ou masque la colonne de miniatures du tableau des livres."""
+        if not hasattr(self, 'table'):
+            return
+        
+        if self.show_thumbnails.get():
+            self.tree.column("#0", width=self.TAILLE_MINIATURE[0] + 12, stretch=False)
+            self.table.set_row_image(self._row_thumbnail, style="Couvertures.Treeview")
+        else:
+            self._thumbnail_loader.cancel()
+            self.tree.column("#0", width=0, stretch=False)
+            self.table.set_row_image(None)
+    
+    def _row_thumbnail(self, row):
+        """Miniature d'une ligne si elle est en mémoire; sinon son chargement est lancé."""
+        path = row.get("ImagePath")
+        if not isinstance(path, str) or not path:
+            return None
+        return self._thumbnail_loader.request(int(row["ID"]), path)
+    
+    def _on_thumbnail_ready(self, book_id, photo):
+        """Affiche une miniature chargée en arrière-plan."""
+        if self.current_page == "view_books" and hasattr(self, 'table'):
+            self.table.set_image(book_id, photo)
     
     def _save_book(self):
         """Sauvegarde un livre (ajout ou modification)."""
@@ -738,30 +949,34 @@ class BibliothequApp:
             messagebox.showerror("Erreur", "L'année et la quantité doivent être des nombres!")
             return
         
-        if self.current_book_id is None:
-            self.db.add_book(
-                titre, auteur, annee, categorie, isbn, quantite,
-                self.current_image_path or ""
-            )
-            messagebox.showinfo("Succès", "Livre ajouté avec succès!")
-        else:
-            self.db.update_book(
-                self.current_book_id,
-                titre=titre,
-                auteur=auteur,
-                année=annee,
-                catégorie=categorie,
-                isbn=isbn,
-                quantité=quantite,
-                chemin_image=self.current_image_path or ""
-            )
-            messagebox.showinfo("Succès", "Livre modifié avec succès!")
+        # Les valeurs hors plage (année 20255...) sont refusées par la base
+        try:
+            if self.current_book_id is None:
+                self.db.add_book(
+                    titre, auteur, annee, categorie, isbn, quantite,
+                    self.current_image_path or ""
+                )
+                message = "Livre ajouté avec succès!"
+            else:
+                self.db.update_book(
+                    self.current_book_id,
+                    titre=titre,
+                    auteur=auteur,
+                    année=annee,
+                    catégorie=categorie,
+                    isbn=isbn,
+                    quantité=quantite,
+                    chemin_image=self.current_image_path or ""
+                )
+                message = "Livre modifié avec succès!"
+        except ValueError as e:
+            messagebox.showerror("Erreur", str(e))
+            return
+        messagebox.showinfo("Succès", message)
         
+        # Le formulaire est simplement vidé; le tableau des livres est mis à
+        # jour par les événements de la base
         self._clear_form()
-        
-        # Si on est sur la page afficher, rafraîchir
-        if self.current_page == "add_book":
-            self.show_add_book()
     
     def _clear_form(self):
         """Réinitialise le formulaire."""
@@ -771,16 +986,62 @@ class BibliothequApp:
         self.entry_categorie.delete(0, tk.END)
         self.entry_isbn.delete(0, tk.END)
         self.entry_quantite.delete(0, tk.END)
+        self._cancel_cover()
         self.image_preview.config(image="", text="Aucune image")
         self.image_preview.image = None
         self.current_book_id = None
         self.current_image_path = None
     
     def _on_search_change(self, *args):
-        """Callback pour les changements dans la barre de recherche."""
+        """
+        Callback pour les changements dans la barre de recherche.
+        
+        Les frappes rapprochées sont regroupées: la recherche n'est lancée
+        qu'après DELAI_RECHERCHE ms sans nouvelle frappe.
+        """
         if self.current_page == "view_books":
-            query = self.search_var.get()
-            self._update_tree(query)
+            if self._search_after_id is not None:
+                self.root.after_cancel(self._search_after_id)
+            self._search_after_id = self.root.after(self.DELAI_RECHERCHE, self._start_search)
+    
+    def _cancel_search(self):
+        """Annule la recherche planifiée ou en cours; son résultat sera ignoré."""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        if self._search_future is not None:
+            self._search_future.cancel()
+            self._search_future = None
+        self._search_generation += 1
+    
+    def _start_search(self):
+        """Lance la requête en arrière-plan et attend son résultat."""
+        self._search_after_id = None
+        if self._search_future is not None:
+            self._search_future.cancel()
+        
+        self._search_generation += 1
+        generation = self._search_generation
+        query = self.search_var.get()
+        self._search_future = self._search_executor.submit(self._query_books, query)
+        self.root.after(self.DELAI_POLL_RECHERCHE, self._poll_search, self._search_future, generation)
+    
+    def _poll_search(self, future, generation):
+        """Affiche le résultat d'une recherche s'il est prêt et toujours d'actualité."""
+        if generation != self._search_generation or future.cancelled():
+            return
+        
+        if not future.done():
+            self.root.after(self.DELAI_POLL_RECHERCHE, self._poll_search, future, generation)
+            return
+        
+        self._search_future = None
+        try:
+            books_df = future.result()
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de la recherche: {e}")
+            return
+        self._fill_tree(books_df)
     
     def _on_tree_double_click(self, event):
         """Double-clic sur une ligne du tableau."""
@@ -829,14 +1090,7 @@ class BibliothequApp:
             # Charger l'image si elle existe
             if book["ImagePath"] and os.path.exists(book["ImagePath"]):
                 self.current_image_path = book["ImagePath"]
-                try:
-                    img = Image.open(book["ImagePath"])
-                    img.thumbnail((400, 300))
-                    photo = ImageTk.PhotoImage(img)
-                    self.image_preview.config(image=photo, text="")
-                    self.image_preview.image = photo
-                except Exception as e:
-                    print(f"Erreur de chargement d'image: {e}")
+                self._show_cover(book["ImagePath"])
     
     def _edit_selected(self):
         """Édite le livre sélectionné."""
@@ -851,6 +1105,9 @@ class BibliothequApp:
         item = selection[0]
         values = self.tree.item(item, "values")
         book_id = int(values[0])
+        if not self.db.has_book(book_id):
+            messagebox.showwarning("Attention", "Ce livre n'existe plus!")
+            return
         self._load_book_form(book_id)
     
     def _delete_selected(self):
@@ -868,38 +1125,156 @@ class BibliothequApp:
         book_id = int(values[0])
         titre = values[1]
         
+        if not self.db.has_book(book_id):
+            messagebox.showwarning("Attention", "Ce livre n'existe plus!")
+            return
+        
         if messagebox.askyesno("Confirmation", f"Supprimer '{titre}'?"):
+            # La ligne est retirée du tableau par l'événement "deleted"
             self.db.delete_book(book_id)
             messagebox.showinfo("Succès", "Livre supprimé!")
-            if self.current_page == "view_books":
-                self.show_books()
+    
+    def _on_db_change(self, kind, book_ids):
+        """
+        Abonné aux modifications de la base.
+        
+        Peut être appelé depuis n'importe quel thread: l'événement est mis
+        en file et appliqué sur le thread Tk.
+        """
+        self._db_events.put((kind, book_ids))
+        if threading.current_thread() is threading.main_thread():
+            self._process_db_events()
+    
+    def _poll_db_events(self):
+        """
+        Traite périodiquement les événements venant d'autres threads.
+        Le prochain passage est programmé même si le traitement échoue.
+        """
+        try:
+            self._process_db_events()
+            self._report_write_errors()
+        finally:
+            self.root.after(self.DELAI_POLL_EVENEMENTS, self._poll_db_events)
+    
+    def _report_write_errors(self):
+        """Signale les erreurs du thread d'écriture (une fenêtre par lot)."""
+        if self.writer is None:
+            return
+        errors = []
+        while True:
+            try:
+                errors.append(self.writer.errors.get_nowait())
+            except queue.Empty:
+                break
+        if errors:
+            messagebox.showerror(
+                "Erreur",
+                f"Erreur lors de la sauvegarde: {errors[-1]}\n"
+                "Les modifications sont conservées et l'écriture sera retentée."
+            )
+    
+    def _on_files_changed(self, paths):
+        """
+        Appelé par le FileWatcher (dans son thread) quand les fichiers du
+        catalogue ont été modifiés: seule la différence est appliquée, et
+        les événements qui en résultent passent par _on_db_change.
+        """
+        try:
+            self.db.apply_external_changes()
+        except Exception as e:
+            print(f"Erreur lors du rechargement du catalogue: {e}")
+    
+    def _process_db_events(self):
+        """Applique au tableau (ou aux statistiques) les événements en attente."""
+        processed = False
+        while True:
+            try:
+                kind, book_ids = self._db_events.get_nowait()
+            except queue.Empty:
+                break
+            self._apply_db_event(kind, book_ids)
+            processed = True
+        if processed and self.current_page == "statistics" and self._stat_labels:
+            self._refresh_statistics()
+    
+    def _apply_db_event(self, kind, book_ids):
+        """
+        Répercute une modification sur le tableau affiché par des
+        opérations ciblées (insertion, mise à jour ou suppression de lignes).
+        
+        Args:
+            kind: "inserted", "updated", "deleted" ou "reloaded"
+            book_ids: IDs concernés
+        """
+        if self.current_page != "view_books" or not hasattr(self, 'table'):
+            return
+        
+        if kind == "reloaded":
+            self._update_tree(self.search_var.get())
+            return
+        if kind == "deleted":
+            self.table.remove_rows(book_ids)
+            return
+        
+        query = self.search_var.get().lower()
+        rows = [book for book in map(self.db.get_book_by_id, book_ids) if book]
+        matching = [row for row in rows if self._matches_query(row, query)]
+        
+        if kind == "updated":
+            # Les lignes qui ne correspondent plus à la recherche disparaissent
+            matching_ids = {row["ID"] for row in matching}
+            self.table.remove_rows([row["ID"] for row in rows if row["ID"] not in matching_ids])
+            self.table.update_rows([row for row in matching if self.table.contains(row["ID"])])
+            matching = [row for row in matching if not self.table.contains(row["ID"])]
+        self.table.append_rows(matching)
+    
+    @staticmethod
+    def _matches_query(row, query):
+        """Indique si un livre correspond à la recherche (mêmes champs que search_books)."""
+        if not query:
+            return True
+        return any(
+            isinstance(row.get(field), str) and query in row.get(field).lower()
+            for field in ("Title", "Author", "Category", "ISBN")
+        )
+    
+    def _query_books(self, query=""):
+        """
+        Retourne les livres correspondant à la requête (tous si vide).
+        
+        Avec le catalogue à faible empreinte mémoire, seuls les IDs sont
+        récupérés: le tableau lit les lignes visibles à la demande.
+        """
+        if getattr(self.db, "low_memory", False):
+            return LazySource(self.db.search_book_ids(query), self.db.get_books_by_ids)
+        if query:
+            return self.db.search_books(query)
+        return self.db.get_all_books()
     
     def _update_tree(self, query=""):
         """Met à jour le tableau des livres."""
         if not hasattr(self, 'tree'):
             return
         
-        # Vider le tableau
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._fill_tree(self._query_books(query))
+    
+    def _fill_tree(self, books):
+        """Remplace le contenu du tableau par les livres fournis (DataFrame ou LazySource)."""
+        if not hasattr(self, 'table'):
+            return
         
-        # Récupérer les livres
-        if query:
-            books_df = self.db.search_books(query)
+        if isinstance(books, LazySource):
+            self.table.set_source(books)
         else:
-            books_df = self.db.get_all_books()
-        
-        # Ajouter les livres au tableau
-        for _, row in books_df.iterrows():
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    int(row["ID"]),
-                    row["Title"],
-                    row["Author"],
-                    int(row["Year"]),
-                    row["Category"],
-                    int(row["Quantity"])
-                )
-            )
+            self.table.set_data(books)
+    
+    def _format_book_row(self, row):
+        """Valeurs affichées dans le tableau pour une ligne du catalogue."""
+        return (
+            int(row["ID"]),
+            row["Title"],
+            row["Author"],
+            int(row["Year"]),
+            row["Category"],
+            int(row["Quantity"])
+        )
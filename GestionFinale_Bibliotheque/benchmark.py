@@ -0,0 +1,435 @@
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le répertoire courant au chemin Python
+current_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(current_dir))
+
+from database import LibraryDatabase, open_database
+
+# ===================
+# CATALOGUE SYNTHÉTIQUE
+# ===================
+
+MOTS_TITRE = [
+    "nuit", "jardin", "mémoire", "ombre", "voyage", "silence", "empire", "mer",
+    "étoile", "guerre", "paix", "maison", "secret", "lumière", "hiver", "été",
+    "chemin", "roi", "reine", "ville", "forêt", "rivière", "histoire", "temps",
+    "amour", "fleuve", "montagne", "dernier", "premier", "perdu", "rouge", "noir",
+    "blanc", "petit", "grand", "vie", "mort", "ciel", "terre", "feu",
+    "night", "garden", "shadow", "journey", "empire", "river", "house", "secret",
+    "light", "winter", "road", "king", "queen", "city", "forest", "time",
+]
+ARTICLES = ["", "", "Le ", "La ", "Les ", "L'", "Un ", "Une ", "The "]
+PRENOMS = [
+    "Marie", "Jean", "Claire", "Pierre", "Sophie", "Louis", "Camille", "Paul",
+    "Émilie", "Victor", "Alice", "Hugo", "Anne", "Jules", "Léa", "Albert",
+    "George", "Jane", "Virginia", "Ernest", "Agatha", "Fiodor", "Haruki", "Toni",
+]
+NOMS = [
+    "Martin", "Bernard", "Dubois", "Durand", "Lefebvre", "Moreau", "Laurent",
+    "Simon", "Michel", "Garcia", "Roux", "Fournier", "Girard", "Bonnet",
+    "Dupont", "Lambert", "Fontaine", "Rousseau", "Vincent", "Muller", "Blanc",
+    "Austen", "Orwell", "Woolf", "Christie", "Murakami", "Morrison", "Camus",
+]
+# Catégories et poids relatifs (quelques catégories dominent le catalogue)
+CATEGORIES = {
+    "Roman": 30, "Policier": 12, "Science-fiction": 9, "Jeunesse": 9,
+    "Histoire": 7, "Biographie": 6, "Poésie": 4, "Théâtre": 3, "Sciences": 5,
+    "Philosophie": 3, "Art": 3, "Cuisine": 3, "Voyage": 3, "Bande dessinée": 8,
+    "Informatique": 2,
+}
+
+def _isbn13(rng: np.random.Generator, n: int) -> List[str]:
+    """Génère n ISBN-13 valides (préfixe 978, clé de contrôle calculée)."""
+    digits = np.hstack([
+        np.tile([9, 7, 8], (n, 1)),
+        rng.integers(0, 10, size=(n, 9))
+    ])
+    check = (10 - (digits @ np.tile([1, 3], 6)) % 10) % 10
+    numbers = digits @ (10 ** np.arange(12, 0, -1, dtype=np.int64)) + check
+    return numbers.astype(str).tolist()
+
+def generate_catalog(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Génère un catalogue synthétique aux distributions réalistes.
+    
+    - titres de 1 à 4 mots, avec article et numéro de tome occasionnels;
+    - auteurs tirés selon une loi de Zipf (quelques auteurs très prolifiques,
+      une longue traîne d'auteurs à un ou deux livres);
+    - catégories déséquilibrées (voir CATEGORIES);
+    - années concentrées sur les dernières décennies;
+    - ISBN-13 valides et quantités faibles (1 + loi de Poisson).
+    
+    Args:
+        n: Nombre de livres
+        seed: Graine du générateur (catalogue reproductible)
+        
+    Returns:
+        DataFrame avec les colonnes du catalogue et des IDs 1..n
+    """
+    rng = np.random.default_rng(seed)
+    
+    # Titres
+    words = np.array(MOTS_TITRE, dtype=object)
+    lengths = rng.choice([1, 2, 3, 4], size=n, p=[0.2, 0.4, 0.3, 0.1])
+    picks = words[rng.integers(0, len(words), size=(n, 4))]
+    articles = np.array(ARTICLES, dtype=object)[rng.integers(0, len(ARTICLES), size=n)]
+    tomes = rng.random(n) < 0.05
+    titles = []
+    for i in range(n):
+        title = articles[i] + " ".join(picks[i, :lengths[i]])
+        title = title[0].upper() + title[1:]
+        if tomes[i]:
+            title += f" (tome {i % 7 + 1})"
+        titles.append(title)
+    
+    # Auteurs: rang tiré selon une loi de Zipf tronquée; au-delà des
+    # combinaisons prénom + nom, des initiales distinguent les homonymes
+    n_authors = max(50, n // 20)
+    combinations = len(PRENOMS) * len(NOMS)
+    authors = []
+    for i in range(n_authors):
+        name = f"{PRENOMS[i % len(PRENOMS)]} {NOMS[(i // len(PRENOMS)) % len(NOMS)]}"
+        k = i // combinations
+        if k:
+            first, last = name.split(" ", 1)
+            initials = chr(65 + k % 26) + "." + (chr(65 + k // 26 % 26) + "." if k >= 26 else "")
+            name = f"{first} {initials} {last}"
+        authors.append(name)
+    authors = np.array(authors, dtype=object)
+    weights = 1.0 / np.arange(1, n_authors + 1) ** 1.1
+    author_rank = rng.choice(n_authors, size=n, p=weights / weights.sum())
+    
+    categories = np.array(list(CATEGORIES), dtype=object)
+    category_weights = np.array(list(CATEGORIES.values()), dtype=float)
+    category = rng.choice(categories, size=n, p=category_weights / category_weights.sum())
+    
+    years = np.clip(2024 - rng.exponential(25, size=n), 1450, 2024).astype(int)
+    
+    return pd.DataFrame({
+        "ID": np.arange(1, n + 1),
+        "Title": titles,
+        "Author": authors[author_rank],
+        "Year": years,
+        "Category": category,
+        "ISBN": _isbn13(rng, n),
+        "Quantity": 1 + rng.poisson(1.5, size=n),
+        "ImagePath": "",
+    })
+
+def write_catalog(df: pd.DataFrame, directory: str, backend: str = "csv") -> str:
+    """
+    Écrit un catalogue synthétique pour le moteur de stockage donné.
+    
+    Args:
+        df: Catalogue (generate_catalog)
+        directory: Répertoire de destination
+        backend: "csv", "rowstore" ou "sqlite"
+        
+    Returns:
+        Chemin à passer à open_database
+    """
+    csv_path = os.path.join(directory, "library.csv")
+    df.to_csv(csv_path, index=False)
+    if backend != "sqlite":
+        return csv_path
+    
+    # Base SQLite migrée une fois depuis le CSV (non mesuré)
+    db_path = os.path.join(directory, "library.db")
+    open_database(db_path, backend="sqlite", csv_source=csv_path).close()
+    return db_path
+
+# ===================
+# MESURES
+# ===================
+
+def percentiles(samples_ns: List[int]) -> Dict[str, float]:
+    """
+    Résume des durées mesurées.
+    
+    Args:
+        samples_ns: Durées en nanosecondes
+        
+    Returns:
+        Dictionnaire p50, p90, p99, max (ms) et throughput (opérations/s)
+    """
+    values = np.array(samples_ns, dtype=float) / 1e6
+    total = values.sum()
+    return {
+        "p50_ms": float(np.percentile(values, 50)),
+        "p90_ms": float(np.percentile(values, 90)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+        "ops_per_s": float(len(values) / (total / 1e3)) if total > 0 else float("inf"),
+    }
+
+def measure(operation: Callable[[int], None], samples: int, memory_samples: int) -> Dict:
+    """
+    Mesure une opération: latences puis pic de mémoire.
+    
+    Le premier appel est rapporté à part (first_ms): il inclut la
+    construction des index paresseux (ID, recherche, statistiques). Les
+    percentiles portent sur les appels suivants. Le pic de mémoire est
+    mesuré dans une seconde passe sous tracemalloc, pour ne pas fausser
+    les latences.
+    
+    Args:
+        operation: Fonction appelée avec le numéro d'appel
+        samples: Nombre d'appels chronométrés
+        memory_samples: Nombre d'appels sous tracemalloc
+        
+    Returns:
+        Résultats de la mesure
+    """
+    durations = []
+    for i in range(samples):
+        start = time.perf_counter_ns()
+        operation(i)
+        durations.append(time.perf_counter_ns() - start)
+    
+    result = {"calls": samples, "first_ms": durations[0] / 1e6}
+    result.update(percentiles(durations[1:] or durations))
+    
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for i in range(samples, samples + memory_samples):
+            operation(i)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    result["peak_mib"] = max(0, peak - baseline) / (1024 * 1024)
+    return result
+
+def bench_operations(n: int, samples: int = 200, load_samples: int = 3, backend: str = "csv",
+                     seed: int = 0) -> Dict[str, Dict]:
+    """
+    Mesure les opérations principales sur un catalogue synthétique de n livres.
+    
+    Args:
+        n: Taille du catalogue
+        samples: Appels chronométrés par opération
+        load_samples: Chargements complets chronométrés
+        backend: Moteur de stockage ("csv", "rowstore" ou "sqlite")
+        seed: Graine du générateur
+        
+    Returns:
+        Dictionnaire {opération: résultats de measure}
+    """
+    catalog = generate_catalog(n, seed)
+    rng = np.random.default_rng(seed + 1)
+    memory_samples = max(1, min(samples, 20))
+    results = {}
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = write_catalog(catalog, tmp_dir, backend)
+        
+        # Chargement complet (constructeur => _load_or_create_database)
+        def load(i):
+            open_database(path, backend=backend).close()
+        results["load"] = measure(load, load_samples, 1)
+        
+        db = open_database(path, backend=backend)
+        try:
+            ids = rng.permutation(catalog["ID"].to_numpy())
+            lookups = rng.choice(ids, size=samples + memory_samples)
+            queries = [
+                "nuit", "garden", "martin", "policier", "978", "tome 3",
+                "introuvable-xyz", "ombre du", "murakami", "la mer",
+            ]
+            
+            results["get_book_by_id"] = measure(
+                lambda i: db.get_book_by_id(int(lookups[i])), samples, memory_samples)
+            results["search_books"] = measure(
+                lambda i: db.search_books(queries[i % len(queries)]), samples, memory_samples)
+            results["get_statistics"] = measure(
+                lambda i: db.get_statistics(), samples, memory_samples)
+            
+            new_rows = generate_catalog(samples + memory_samples, seed + 2).to_dict("records")
+            results["add_book"] = measure(
+                lambda i: db.add_book(new_rows[i]["Title"], new_rows[i]["Author"],
+                                      new_rows[i]["Year"], new_rows[i]["Category"],
+                                      new_rows[i]["ISBN"], new_rows[i]["Quantity"]),
+                samples, memory_samples)
+            results["update_book"] = measure(
+                lambda i: db.update_book(int(lookups[i]), quantité=int(i % 9) + 1),
+                samples, memory_samples)
+            # IDs distincts: chaque suppression porte sur un livre existant
+            victims = ids[-(samples + memory_samples):]
+            results["delete_book"] = measure(
+                lambda i: db.delete_book(int(victims[i])), samples, memory_samples)
+        finally:
+            db.close()
+    return results
+
+# ===================
+# RÉFÉRENCE
+# ===================
+
+def compare_to_baseline(results: Dict, baseline: Dict, tolerance: float = 0.25,
+                        min_delta_ms: float = 0.05) -> List[str]:
+    """
+    Compare des résultats à une référence enregistrée.
+    
+    Une opération régresse si sa latence médiane (p50) ou son p99 dépasse
+    la référence de plus de tolerance (et d'au moins min_delta_ms, pour
+    ignorer le bruit des opérations très courtes), ou si son pic de
+    mémoire dépasse la référence de plus de tolerance.
+    
+    Args:
+        results: Résultats {taille: {opération: mesure}}
+        baseline: Référence au même format
+        tolerance: Dégradation relative tolérée
+        min_delta_ms: Écart absolu minimal pour signaler une latence
+        
+    Returns:
+        Messages décrivant les régressions (liste vide si aucune)
+    """
+    regressions = []
+    for size, operations in results.items():
+        for name, current in operations.items():
+            reference = baseline.get(size, {}).get(name)
+            if reference is None:
+                continue
+            for metric in ("p50_ms", "p99_ms"):
+                before, after = reference[metric], current[metric]
+                if after > before * (1 + tolerance) and after - before > min_delta_ms:
+                    regressions.append(
+                        f"{size:>8} {name:<15} {metric}: {before:.3f} -> {after:.3f} ms "
+                        f"(+{(after / before - 1) * 100:.0f} %)"
+                    )
+            before, after = reference.get("peak_mib", 0), current.get("peak_mib", 0)
+            if before > 0 and after > before * (1 + tolerance):
+                regressions.append(
+                    f"{size:>8} {name:<15} peak_mib: {before:.2f} -> {after:.2f} MiB"
+                )
+    return regressions
+
+def print_results(n: int, results: Dict[str, Dict]) -> None:
+    """Affiche les mesures d'une taille de catalogue."""
+    print(f"\n{n} livres")
+    print(f"{'Opération':<15} {'1er (ms)':>9} {'p50':>9} {'p90':>9} {'p99':>9} "
+          f"{'max':>9} {'ops/s':>10} {'pic MiB':>8}")
+    for name, r in results.items():
+        print(f"{name:<15} {r['first_ms']:>9.3f} {r['p50_ms']:>9.3f} {r['p90_ms']:>9.3f} "
+              f"{r['p99_ms']:>9.3f} {r['max_ms']:>9.3f} {r['ops_per_s']:>10.0f} {r['peak_mib']:>8.2f}")
+
+# ===================
+# INSERTIONS
+# ===================
+
+def bench_inserts(n: int, journal: bool = True) -> float:
+    """
+    Mesure le temps d'insertion de n livres un par un avec add_book.
+    
+    Args:
+        n: Nombre de livres à insérer
+        journal: Utiliser le mode journal (sinon réécriture du CSV)
+        
+    Returns:
+        Durée totale en secondes
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = LibraryDatabase(os.path.join(tmp_dir, "library.csv"), journal=journal)
+        start = time.perf_counter()
+        for i in range(n):
+            db.add_book(f"Titre {i}", f"Auteur {i % 1000}", 1900 + i % 120,
+                        f"Catégorie {i % 20}", f"{i:013d}", 1 + i % 5)
+        # Forcer la fusion du tampon pour inclure son coût
+        len(db.df)
+        return time.perf_counter() - start
+
+def run_inserts(sizes: List[int]) -> None:
+    """Lance le benchmark d'insertion et vérifie la linéarité."""
+    print(f"{'Livres':>10} {'Durée (s)':>10} {'µs/ajout':>10}")
+    per_insert = []
+    for n in sizes:
+        duration = bench_inserts(n)
+        per_insert.append(duration / n * 1e6)
+        print(f"{n:>10} {duration:>10.2f} {per_insert[-1]:>10.1f}")
+    
+    # Coût linéaire => le coût par ajout reste stable quand n augmente
+    ratio = per_insert[-1] / per_insert[0]
+    print(f"\nRapport du coût par ajout (plus grand / plus petit): {ratio:.2f}")
+    if ratio > 3:
+        print("Attention: la croissance du coût par ajout n'est pas linéaire")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Lance les benchmarks et compare éventuellement à une référence.
+    
+    Returns:
+        Code de sortie (1 si une régression est détectée)
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks des opérations du catalogue")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000],
+                        help="Tailles de catalogue")
+    parser.add_argument("--samples", type=int, default=200,
+                        help="Appels chronométrés par opération")
+    parser.add_argument("--load-samples", type=int, default=3,
+                        help="Chargements complets chronométrés")
+    parser.add_argument("--backend", choices=["csv", "rowstore", "sqlite"], default="csv",
+                        help="Moteur de stockage mesuré")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du catalogue synthétique")
+    parser.add_argument("--output", help="Enregistrer les résultats (JSON)")
+    parser.add_argument("--baseline", help="Référence JSON à laquelle comparer")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Dégradation relative tolérée par rapport à la référence")
+    parser.add_argument("--inserts", action="store_true",
+                        help="Benchmark de linéarité des insertions seulement")
+    args = parser.parse_args(argv)
+    
+    if args.inserts:
+        run_inserts(args.sizes)
+        return 0
+    
+    results = {}
+    for n in args.sizes:
+        results[str(n)] = bench_operations(n, args.samples, args.load_samples, args.backend, args.seed)
+        print_results(n, results[str(n)])
+    
+    report = {
+        "meta": {
+            "backend": args.backend,
+            "samples": args.samples,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRésultats enregistrés dans {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("backend", args.backend) != args.backend:
+            print("Attention: la référence a été mesurée avec un autre moteur de stockage")
+        regressions = compare_to_baseline(results, baseline.get("results", {}), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) par rapport à {args.baseline}:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nAucune régression par rapport à {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+# Ajouter le répertoire courant au chemin Python
+current_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(current_dir))
+
+from database import open_database
+from dedup import FENETRE, SEUIL_SIMILARITE, find_duplicates, merge_duplicates, value_counts
+from importer import TAILLE_BLOC, BulkImporter, read_chunks
+from schema import COLUMNS, INTEGER_COLUMNS, check_fields
+
+EXEMPLES = """exemples:
+  python catalog.py import fournisseur.csv --rejects rejets.csv
+  python catalog.py import notices.mrk --format marc
+  python catalog.py export --format jsonl > catalogue.jsonl
+  python catalog.py search "hugo" --limit 20
+  python catalog.py stats --json
+  python catalog.py update --where "policier" --set Quantity=2
+  python catalog.py update corrections.csv
+  python catalog.py compact
+  python catalog.py dedup --column Author
+  python catalog.py dedup --column Category --apply
+"""
+
+# ===================
+# LECTURE ET ÉCRITURE PAR BLOCS
+# ===================
+
+def write_chunks(chunks, out, fmt: str = "csv") -> int:
+    """
+    Écrit des blocs de livres au fil de l'eau.
+    
+    Args:
+        chunks: Itérable de DataFrames
+        out: Flux texte de sortie
+        fmt: "csv" (en-tête écrit une fois) ou "jsonl"
+        
+    Returns:
+        Nombre de livres écrits
+    """
+    written = 0
+    for chunk in chunks:
+        chunk = chunk.reindex(columns=COLUMNS)
+        if fmt == "jsonl":
+            if len(chunk):
+                text = chunk.to_json(orient="records", lines=True, force_ascii=False)
+                out.write(text if text.endswith("\n") else text + "\n")
+        else:
+            chunk.to_csv(out, index=False, header=written == 0, lineterminator="\n")
+        written += len(chunk)
+    out.flush()
+    return written
+
+def search_chunks(db, query: str, chunk_size: int = TAILLE_BLOC) -> Iterator[pd.DataFrame]:
+    """
+    Résultats d'une recherche par blocs.
+    
+    Avec le catalogue à faible empreinte mémoire, seuls les IDs sont
+    calculés d'avance et les lignes sont lues bloc par bloc.
+    """
+    if getattr(db, "low_memory", False):
+        book_ids = db.search_book_ids(query)
+        for start in range(0, len(book_ids), chunk_size):
+            yield pd.DataFrame(db.get_books_by_ids(book_ids[start:start + chunk_size]), columns=COLUMNS)
+        return
+    books = db.search_books(query)
+    for start in range(0, len(books), chunk_size):
+        yield books.iloc[start:start + chunk_size]
+
+def _progress(message: str, quiet: bool) -> None:
+    if not quiet:
+        print(message, file=sys.stderr, flush=True)
+
+# ===================
+# SOUS-COMMANDES
+# ===================
+
+def cmd_import(db, args) -> int:
+    """
+    Importe un fichier par blocs: validation, regroupement des ISBN en
+    quantités, une transaction par bloc (voir BulkImporter).
+    """
+    def progress(report):
+        _progress(
+            f"{report['lus']} lus, {report['ajoutés']} ajoutés, {report['fusionnés']} fusionnés, "
+            f"{report['rejetés']} rejetés ({report['lus'] / max(report['durée_s'], 1e-9):.0f} lignes/s)",
+            args.quiet
+        )
+    
+    importer = BulkImporter(db, args.chunk_size, merge_duplicates=not args.no_merge, progress=progress)
+    report = importer.run(args.file, args.format, args.rejects)
+    print(f"{report['ajoutés']} livres ajoutés, {report['fusionnés']} fusionnés par ISBN, "
+          f"{report['rejetés']} rejetés ({report['durée_s']:.1f} s)")
+    return 0
+
+def cmd_export(db, args) -> int:
+    """Écrit le catalogue (ou le résultat d'une recherche) en CSV ou JSON lines."""
+    chunks = search_chunks(db, args.query, args.chunk_size) if args.query else db.iter_books(args.chunk_size)
+    if args.file in (None, "-"):
+        written = write_chunks(chunks, sys.stdout, args.format)
+    else:
+        with open(args.file, "w", encoding="utf-8", newline="") as out:
+            written = write_chunks(chunks, out, args.format)
+    _progress(f"{written} livres exportés", args.quiet)
+    return 0
+
+def cmd_search(db, args) -> int:
+    """Affiche les livres correspondant à une recherche."""
+    def limited(chunks):
+        remaining = args.limit
+        for chunk in chunks:
+            if remaining is not None:
+                chunk = chunk.iloc[:remaining]
+                remaining -= len(chunk)
+            yield chunk
+            if remaining == 0:
+                return
+    
+    chunks = limited(search_chunks(db, args.query, args.chunk_size))
+    if args.format == "table":
+        found = 0
+        for chunk in chunks:
+            for row in chunk.itertuples(index=False):
+                print(f"{row.ID:>7}  {row.Title[:40]:<40}  {str(row.Author)[:25]:<25}  "
+                      f"{row.Year!s:>4}  {row.Quantity!s:>3}")
+            found += len(chunk)
+        _progress(f"{found} livre(s)", args.quiet)
+    else:
+        write_chunks(chunks, sys.stdout, args.format)
+    return 0
+
+def cmd_stats(db, args) -> int:
+    """Affiche les statistiques du catalogue."""
+    stats = db.get_statistics()
+    if args.json:
+        stats = dict(stats)
+        stats["catégories"] = db.get_category_distribution()
+        print(json.dumps(stats, ensure_ascii=False, indent=2, default=str))
+        return 0
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+    return 0
+
+def parse_assignments(assignments: List[str]) -> Dict:
+    """
+    Convertit des affectations "Colonne=valeur" en champs de update_books.
+    
+    Raises:
+        ValueError: Colonne inconnue, non modifiable ou valeur entière invalide
+                    (ou hors plage)
+    """
+    fields = {}
+    for assignment in assignments:
+        column, sep, value = assignment.partition("=")
+        if not sep or column not in COLUMNS or column == "ID":
+            raise ValueError(f"Affectation invalide: {assignment}")
+        fields[column] = int(value) if column in INTEGER_COLUMNS else value
+    return check_fields(fields)
+
+def updates_from_chunk(chunk: pd.DataFrame) -> Dict[int, Dict]:
+    """
+    Convertit un bloc (colonne ID + colonnes à modifier) en argument de
+    update_books. Les cellules vides ne modifient pas le livre.
+    """
+    columns = [column for column in chunk.columns if column in COLUMNS and column != "ID"]
+    updates = {}
+    for row in chunk.to_dict("records"):
+        fields = {}
+        for column in columns:
+            value = row[column]
+            if value is None or (isinstance(value, float) and pd.isna(value)) or value == "":
+                continue
+            fields[column] = int(value) if column in INTEGER_COLUMNS else value
+        if fields:
+            updates[int(row["ID"])] = fields
+    return updates
+
+def cmd_update(db, args) -> int:
+    """
+    Met à jour des livres par lots: soit depuis un fichier (colonne ID +
+    colonnes à modifier), soit les résultats d'une recherche (--where) avec
+    les mêmes valeurs (--set).
+    """
+    if bool(args.file) == bool(args.where is not None):
+        print("Erreur: indiquer un fichier ou --where (mais pas les deux)", file=sys.stderr)
+        return 2
+    
+    total = 0
+    if args.file:
+        for chunk in read_chunks(args.file, args.format, args.chunk_size):
+            if "ID" not in chunk.columns:
+                print("Erreur: colonne ID manquante", file=sys.stderr)
+                return 2
+            total += db.update_books(updates_from_chunk(chunk))
+            _progress(f"{total} livres mis à jour", args.quiet)
+    else:
+        try:
+            fields = parse_assignments(args.set or [])
+        except ValueError as e:
+            print(f"Erreur: {e}", file=sys.stderr)
+            return 2
+        if not fields:
+            print("Erreur: --set est requis avec --where", file=sys.stderr)
+            return 2
+        for chunk in search_chunks(db, args.where, args.chunk_size):
+            total += db.update_books({int(book_id): fields for book_id in chunk["ID"]})
+            _progress(f"{total} livres mis à jour", args.quiet)
+    print(f"{total} livres mis à jour")
+    return 0
+
+def cmd_compact(db, args) -> int:
+    """Fusionne le journal dans le stockage principal."""
+    db.compact()
+    print("Catalogue compacté")
+    return 0
+
+def cmd_dedup(db, args) -> int:
+    """
+    Liste les variantes orthographiques d'une colonne ("OUssama Muslim" /
+    "OUsama Muslim") et, avec --apply, les remplace toutes par leur forme
+    canonique en un seul lot (voir dedup.find_duplicates).
+    """
+    counts = value_counts(db, args.column, args.chunk_size)
+    # L'ordre des mots ne distingue que les titres et catégories
+    clusters = find_duplicates(counts, args.threshold, args.window, any_order=args.column == "Author")
+    if args.json:
+        print(json.dumps(clusters, ensure_ascii=False, indent=2))
+    else:
+        for cluster in clusters:
+            variants = ", ".join(f"{value} ({count})" for value, count in cluster["variantes"].items())
+            print(f"{cluster['canonique']} ({counts[cluster['canonique']]}) <- {variants}")
+    _progress(f"{len(clusters)} groupes, {sum(c['livres'] for c in clusters)} livres à corriger "
+              f"({len(counts)} valeurs distinctes)", args.quiet)
+    
+    if args.apply:
+        merged = merge_duplicates(db, args.column, clusters, args.chunk_size)
+        _progress(f"{merged} livres corrigés", args.quiet)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur des arguments de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        prog="catalog",
+        description="Maintenance du catalogue sans interface graphique (ni tkinter ni PIL)",
+        epilog=EXEMPLES,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--db", default="data/library.csv", help="Fichier du catalogue")
+    parser.add_argument("--backend", choices=["csv", "sqlite", "rowstore"],
+                        help="Moteur de stockage (déduit de l'extension par défaut)")
+    parser.add_argument("--chunk-size", type=int, default=TAILLE_BLOC, help="Lignes par bloc")
+    parser.add_argument("--shared", action="store_true",
+                        help="Catalogue ouvert en même temps par d'autres postes (verrou de fichier)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Pas de progression sur stderr")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    p = subparsers.add_parser("import", help="Importer les livres d'un fichier CSV/JSON/MARC texte")
+    p.add_argument("file", help="Fichier à importer (- pour l'entrée standard)")
+    p.add_argument("--format", choices=["auto", "csv", "jsonl", "json", "marc"], default="auto")
+    p.add_argument("--rejects", metavar="FICHIER", help="Écrire les lignes rejetées et leur motif (CSV)")
+    p.add_argument("--no-merge", action="store_true",
+                   help="Rejeter les ISBN déjà présents au lieu d'ajouter leur quantité")
+    p.set_defaults(func=cmd_import)
+    
+    p = subparsers.add_parser("export", help="Exporter le catalogue")
+    p.add_argument("file", nargs="?", help="Fichier de sortie (sortie standard par défaut)")
+    p.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    p.add_argument("--query", help="N'exporter que les résultats de cette recherche")
+    p.set_defaults(func=cmd_export)
+    
+    p = subparsers.add_parser("search", help="Rechercher des livres")
+    p.add_argument("query", help="Texte recherché (titre, auteur, catégorie, ISBN)")
+    p.add_argument("--format", choices=["table", "csv", "jsonl"], default="table")
+    p.add_argument("--limit", type=int, help="Nombre maximal de résultats")
+    p.set_defaults(func=cmd_search)
+    
+    p = subparsers.add_parser("stats", help="Afficher les statistiques")
+    p.add_argument("--json", action="store_true", help="Sortie JSON")
+    p.set_defaults(func=cmd_stats)
+    
+    p = subparsers.add_parser("update", help="Modifier des livres par lots")
+    p.add_argument("file", nargs="?", help="Fichier ID + colonnes à modifier (- pour l'entrée standard)")
+    p.add_argument("--format", choices=["auto", "csv", "jsonl", "json"], default="auto")
+    p.add_argument("--where", help="Modifier les résultats de cette recherche")
+    p.add_argument("--set", nargs="+", metavar="COLONNE=VALEUR", help="Valeurs à affecter avec --where")
+    p.set_defaults(func=cmd_update)
+    
+    p = subparsers.add_parser("compact", help="Fusionner le journal dans le stockage principal")
+    p.set_defaults(func=cmd_compact)
+    
+    p = subparsers.add_parser("dedup", help="Repérer (et fusionner) les auteurs, titres ou catégories presque identiques")
+    p.add_argument("--column", choices=["Author", "Title", "Category"], default="Author")
+    p.add_argument("--threshold", type=float, default=SEUIL_SIMILARITE,
+                   help="Similarité minimale entre deux variantes (0 à 1)")
+    p.add_argument("--window", type=int, default=FENETRE, help="Voisins comparés dans l'ordre trié")
+    p.add_argument("--json", action="store_true", help="Rapport JSON")
+    p.add_argument("--apply", action="store_true", help="Remplacer les variantes par la forme canonique")
+    p.set_defaults(func=cmd_dedup)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée de la ligne de commande.
+    
+    Returns:
+        Code de sortie
+    """
+    args = build_parser().parse_args(argv)
+    options = {"shared": True} if args.shared else {}
+    db = open_database(args.db, backend=args.backend, **options)
+    try:
+        return args.func(db, args)
+    except BrokenPipeError:
+        # Sortie interrompue (par exemple | head)
+        return 0
+    except ValueError as e:
+        # Valeur refusée par la base (hors plage), rien n'est écrit pour ce lot
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 2
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,746 @@
 
+import numpy as np
 import pandas as pd
+import functools
+import json
 import os
+import threading
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Set, Tuple
+
+from aggregates import CatalogStatistics
+from file_lock import FileLock
+from file_watcher import file_stamp
+from schema import (COLUMNS, READ_DTYPES, append_rows, apply_schema, check_fields, check_frame,
+                    ensure_categories, in_range, memory_report, set_cell)
+from search_index import TrigramIndex
+from snapshot import is_fresh, read_snapshot, snapshot_available, snapshot_path_for, write_snapshot
+
+def synchronized(method):
+    """
+    Exécute une méthode sous le verrou de la base de données, pour que
+    les lectures lancées depuis un autre thread (recherche en arrière-plan)
+    ne voient jamais une modification à moitié appliquée.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def exclusive(method):
+    """
+    Comme synchronized, pour les méthodes qui modifient le catalogue: en
+    mode partagé, la méthode s'exécute de plus sous le verrou entre
+    processus, après intégration des modifications des autres processus
+    (les IDs attribués et les livres modifiés sont ceux du catalogue à jour).
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock, self._exclusive():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+# Première opération d'un journal en mode partagé: numéro de génération,
+# incrémenté à chaque compaction (voir LibraryDatabase._truncate_journal)
+OP_GENERATION = "generation"
+
+def read_journal(journal_path: str) -> List[Dict]:
+    """
+    Lit les enregistrements d'un journal (une ligne JSON par opération).
+    
+    Args:
+        journal_path: Chemin du journal
+        
+    Returns:
+        Liste des opérations, dans l'ordre d'écriture
+    """
+    return read_journal_tail(journal_path)[0]
+
+def read_journal_tail(journal_path: str, offset: int = 0) -> Tuple[List[Dict], int]:
+    """
+    Lit les enregistrements d'un journal à partir d'une position en octets.
+    
+    Une dernière ligne incomplète et invalide (en cours d'écriture, ou
+    tronquée par un arrêt) n'est pas comptée comme lue.
+    
+    Args:
+        journal_path: Chemin du journal
+        offset: Position de départ (fin de la dernière ligne déjà lue)
+        
+    Returns:
+        Tuple (opérations dans l'ordre d'écriture, position de fin de lecture)
+    """
+    if not os.path.exists(journal_path):
+        return [], 0
+    with open(journal_path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    
+    records = []
+    end = offset
+    for line in data.splitlines(keepends=True):
+        text = line.strip()
+        if text:
+            try:
+                records.append(json.loads(text))
+            except ValueError:
+                if not line.endswith(b"\n"):
+                    break
+                print(f"Avertissement: entrée de journal ignorée: {text[:80].decode('utf-8', 'replace')}")
+        end += len(line)
+    return records, end
+
+def read_journal_generation(journal_path: str) -> int:
+    """Numéro de génération d'un journal (0 s'il n'a pas d'en-tête)."""
+    try:
+        with open(journal_path, "rb") as f:
+            line = f.readline()
+        record = json.loads(line)
+    except (OSError, ValueError):
+        return 0
+    return journal_generation([record])
+
+def journal_generation(records: List[Dict]) -> int:
+    """Numéro de génération porté par la première opération lue d'un journal."""
+    if records and isinstance(records[0], dict) and records[0].get("op") == OP_GENERATION:
+        return int(records[0].get("value", 0))
+    return 0
+
+def append_journal(journal_path: str, records: List[Dict]) -> int:
+    """
+    Ajoute des opérations à la fin d'un journal, en une seule écriture.
+    
+    Args:
+        journal_path: Chemin du journal
+        records: Opérations à enregistrer
+        
+    Returns:
+        Position de fin du journal après l'ajout
+    """
+    data = "".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records
+    ).encode("utf-8")
+    with open(journal_path, "ab") as f:
+        f.write(data)
+        return f.tell()
+
+def reduce_journal(records: List[Dict]) -> Tuple[Dict[int, Dict], Dict[int, Dict], Set[int]]:
+    """
+    Réduit des opérations de journal à leur effet final par ID.
+    
+    Un ajout d'un ID existant le remplace, ce qui rend le rejeu idempotent.
+    
+    Args:
+        records: Opérations, dans l'ordre d'écriture
+        
+    Returns:
+        Tuple (ajoutés, modifiés, supprimés): lignes complètes ajoutées par
+        ID, champs modifiés par ID pour les lignes préexistantes, et IDs
+        des lignes préexistantes à retirer (y compris celles remplacées
+        par un ajout)
+    """
+    added = {}
+    updated = {}
+    deleted = set()
+    for record in records:
+        op = record.get("op")
+        if op == "add":
+            row = record["row"]
+            book_id = int(row["ID"])
+            added[book_id] = dict(row)
+            updated.pop(book_id, None)
+            deleted.add(book_id)
+        elif op == "update":
+            book_id = int(record["id"])
+            if book_id in added:
+                added[book_id].update(record["fields"])
+            else:
+                updated.setdefault(book_id, {}).update(record["fields"])
+        elif op == "delete":
+            book_id = int(record["id"])
+            added.pop(book_id, None)
+            updated.pop(book_id, None)
+            deleted.add(book_id)
+    return added, updated, deleted
+
+def diff_records(old: pd.DataFrame, new: pd.DataFrame) -> List[Dict]:
+    """
+    Calcule les opérations qui transforment un catalogue en un autre.
+    
+    Les lignes sont alignées par ID (pour un ID en double dans new, la
+    dernière ligne l'emporte) et comparées colonne par colonne de façon
+    vectorielle; seuls les champs modifiés figurent dans les opérations.
+    
+    Args:
+        old: Catalogue de départ
+        new: Catalogue d'arrivée
+        
+    Returns:
+        Opérations au format du journal (delete, update puis add)
+    """
+    new = new.drop_duplicates("ID", keep="last")
+    old_ids = old["ID"].astype("int64")
+    new_ids = new["ID"].astype("int64")
+    kept = old_ids.isin(new_ids)
+    records = [{"op": "delete", "id": int(book_id)} for book_id in old_ids[~kept].tolist()]
+    
+    columns = [column for column in COLUMNS if column != "ID"]
+    before = old[kept.to_numpy()].set_index(old_ids[kept].to_numpy())[columns]
+    after = new.set_index(new_ids.to_numpy())[columns].reindex(before.index)
+    changed = (before.astype("string").fillna("\x00") != after.astype("string").fillna("\x00")).to_numpy()
+    rows = changed.any(axis=1)
+    if rows.any():
+        values = json.loads(after[rows].to_json(orient="values", force_ascii=False))
+        for book_id, mask, row in zip(before.index[rows].tolist(), changed[rows], values):
+            fields = {column: value for column, flag, value in zip(columns, mask, row) if flag}
+            records.append({"op": "update", "id": int(book_id), "fields": fields})
+    
+    added = new[~new_ids.isin(old_ids).to_numpy()]
+    if len(added):
+        for row in json.loads(added.to_json(orient="records", force_ascii=False)):
+            records.append({"op": "add", "row": row})
+    return records
 
 class LibraryDatabase:
     """
     Classe pour gérer toutes les opérations de base de données.
     Stocke les données dans un fichier CSV avec Pandas DataFrame.
+    
+    En mode journal, chaque modification est ajoutée à la fin d'un fichier
+    journal (une ligne JSON par opération) au lieu de réécrire tout le CSV.
+    Le journal est rejoué au chargement puis fusionné dans le CSV
+    (compaction) lorsqu'il dépasse un seuil ou à la fermeture.
+    
+    Si pyarrow (ou fastparquet) est installé, chaque compaction écrit aussi
+    un instantané Parquet à côté du CSV; il est lu à la place du CSV au
+    démarrage tant qu'il n'est pas plus ancien que lui. Avec
+    primary="parquet", l'instantané devient le stockage principal et le CSV
+    ne sert plus qu'à l'import/export (voir save_to_csv).
+    
+    En mode partagé (shared=True), plusieurs processus (postes sur un
+    lecteur réseau) peuvent modifier le même catalogue: chaque écriture
+    prend un verrou de fichier (library.csv.lock), rattrape d'abord les
+    lignes ajoutées au journal par les autres processus depuis sa dernière
+    lecture, puis écrit directement dans le journal. La compaction change
+    la génération du journal et garde l'ancien (.prev), ce qui permet aux
+    autres processus de rattraper leur retard sans relire le stockage.
+    Toutes les instances ouvrant le catalogue doivent être partagées.
+    
+    Le stockage principal peut aussi être modifié par un autre programme
+    (tableur, script): apply_external_changes() le relit, calcule la
+    différence ligne à ligne avec le catalogue en mémoire (voir
+    diff_records) et n'applique que celle-ci, avec les événements
+    habituels. Voir file_watcher.FileWatcher pour la détection.
     """
     
-    def __init__(self, csv_path: str = "data/library.csv"):
+    COLUMNS = COLUMNS
+    
+    # Taille minimale du tampon d'ajouts avant fusion dans le DataFrame
+    BUFFER_MIN_CHUNK = 1024
+    
+    def __init__(self, csv_path: str = "data/library.csv", journal: bool = True,
+                 compaction_threshold: int = 1000, snapshot: Optional[bool] = None,
+                 primary: str = "csv", shared: bool = False):
+        
+        if primary not in ("csv", "parquet"):
+            raise ValueError(f"Stockage principal inconnu: {primary}")
+        if shared and not journal:
+            raise ValueError("Le mode partagé nécessite le journal")
+        if snapshot is None:
+            snapshot = snapshot_available()
+        if primary == "parquet" and not snapshot_available():
+            raise ImportError("Le stockage Parquet nécessite pyarrow ou fastparquet")
         
         self.csv_path = csv_path
+        self.journal_path = csv_path + ".journal"
+        self.snapshot_path = snapshot_path_for(csv_path)
+        self.snapshot = snapshot or primary == "parquet"
+        self.primary = primary
+        self.lock = threading.RLock()
+        self.journal = journal
+        self.compaction_threshold = compaction_threshold
+        self._journal_entries = 0
+        self._transaction_depth = 0
+        self._pending_records = []
+        self._id_index = None
+        self._buffer = []
+        self._search_index = None
+        self._stats = None
+        self._listeners = []
+        self.writer = None
+        self._storage_stamp = None
+        self._init_sharing(shared)
+        with self._file_locked():
+            self.df = self._load_or_create_database()
+        self._next_id = int(self._df["ID"].max()) + 1 if len(self._df) > 0 else 1
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        """DataFrame du catalogue (les ajouts en attente y sont fusionnés)."""
+        if self._buffer:
+            self._flush_buffer()
+        return self._df
+    
+    @df.setter
+    def df(self, value: pd.DataFrame) -> None:
+        # Toute réaffectation invalide l'index des positions par ID
+        self._df = value
+        self._buffer = []
+        self._id_index = None
+    
+    def __len__(self) -> int:
+        """Nombre de livres, tampon d'ajouts compris."""
+        return len(self._df) + len(self._buffer)
+    
+    # ===================
+    # ÉVÉNEMENTS
+    # ===================
+    
+    def add_listener(self, callback: Callable[[str, List[int]], None]) -> None:
+        """
+        Abonne une fonction aux modifications du catalogue.
+        
+        La fonction reçoit le type d'événement ("inserted", "updated",
+        "deleted" ou "reloaded") et la liste des IDs concernés. Elle est
+        appelée dans le thread qui a effectué la modification.
+        
+        Args:
+            callback: Fonction (type, ids) -> None
+        """
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str, List[int]], None]) -> None:
+        """Désabonne une fonction ajoutée par add_listener."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _emit(self, kind: str, book_ids: List[int]) -> None:
+        """Notifie les abonnés d'une modification."""
+        for callback in list(self._listeners):
+            try:
+                callback(kind, book_ids)
+            except Exception as e:
+                print(f"Erreur dans un abonné aux modifications: {e}")
+    
+    # ===================
+    # MODE PARTAGÉ
+    # ===================
+    
+    def _init_sharing(self, shared: bool) -> None:
+        """Prépare le mode partagé: verrou de fichier et position de lecture du journal."""
+        self.shared = shared
+        self.file_lock = None
+        if shared:
+            # Le fichier de verrou est créé avant le chargement du catalogue
+            Path(self.csv_path).parent.mkdir(parents=True, exist_ok=True)
+            self.file_lock = FileLock(self.csv_path + ".lock")
+        self._journal_offset = 0
+        self._journal_generation = 0
+        self._journal_stamp = None
+    
+    def _file_locked(self):
+        """Verrou de fichier en mode partagé, contexte vide sinon."""
+        return self.file_lock if self.file_lock is not None else nullcontext()
+    
+    @contextmanager
+    def _exclusive(self):
+        """
+        Section critique entre processus: le verrou de fichier est pris et
+        le journal des autres processus rattrapé avant le bloc. Sans effet
+        hors mode partagé, ou si le verrou est déjà détenu.
+        """
+        if self.file_lock is None or self.file_lock.held:
+            yield
+            return
+        with self.file_lock:
+            self._sync()
+            yield
+    
+    @synchronized
+    def refresh(self) -> bool:
+        """
+        Intègre les modifications enregistrées par les autres processus
+        (mode partagé). Les abonnés reçoivent les événements habituels.
+        
+        Returns:
+            True si des modifications ont été intégrées
+        """
+        if self.file_lock is None:
+            return False
+        with self.file_lock:
+            return self._sync()
+    
+    def _journal_state(self) -> Optional[Tuple[int, int]]:
+        """(inode, taille) du journal, ou None s'il n'existe pas."""
+        try:
+            st = os.stat(self.journal_path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_size
+    
+    def _mark_journal_read(self) -> None:
+        """Mémorise l'état du journal lu jusqu'à _journal_offset."""
+        state = self._journal_state()
+        self._journal_stamp = (state[0], self._journal_offset) if state is not None else None
+    
+    def _sync(self) -> bool:
+        """
+        Rattrape le journal écrit par les autres processus (sous le verrou
+        de fichier).
+        
+        - journal inchangé (inode et taille): un seul stat, rien à lire;
+        - même génération: seules les lignes ajoutées depuis la position
+          mémorisée sont lues et appliquées;
+        - une compaction d'avance: la fin de l'ancien journal (.prev) puis
+          le nouveau journal sont appliqués, sans relire le stockage;
+        - sinon (plusieurs compactions manquées): rechargement complet.
+        
+        Returns:
+            True si des modifications ont été intégrées
+        """
+        state = self._journal_state()
+        if state == self._journal_stamp or (state is None and self._journal_offset == 0):
+            return False
+        
+        generation = read_journal_generation(self.journal_path)
+        size = state[1] if state is not None else 0
+        prev_path = self.journal_path + ".prev"
+        if generation == self._journal_generation and size >= self._journal_offset:
+            records, self._journal_offset = read_journal_tail(self.journal_path, self._journal_offset)
+            self._journal_entries += len(records)
+            changed = self._merge_records(records)
+        elif (generation == self._journal_generation + 1
+              and read_journal_generation(prev_path) == self._journal_generation):
+            records, _ = read_journal_tail(prev_path, self._journal_offset)
+            changed = self._merge_records(records)
+            self._after_compaction()
+            records, self._journal_offset = read_journal_tail(self.journal_path)
+            self._journal_generation = generation
+            self._journal_entries = len(records)
+            changed = self._merge_records(records) or changed
+        else:
+            self._reload()
+            return True
+        self._mark_journal_read()
+        return changed
+    
+    def _merge_records(self, records: List[Dict]) -> bool:
+        """
+        Applique au catalogue en mémoire des opérations écrites par un autre
+        processus (ou calculées par diff_records), en tenant à jour les
+        structures dérivées.
+        
+        Returns:
+            True si le catalogue a changé
+        """
+        added, updated, deleted = reduce_journal(records)
+        added_ids = [int(r["row"]["ID"]) for r in records if r.get("op") == "add"]
+        if added_ids:
+            self._next_id = max(self._next_id, max(added_ids) + 1)
+        
+        df = self.df
+        removed = [book_id for book_id in deleted if book_id in self._get_id_index()]
+        if removed:
+            mask = df["ID"].isin(removed)
+            removed_rows = df[mask].to_dict("records")
+            self._drop_rows(np.flatnonzero(mask.to_numpy()))
+            self._after_delete(removed_rows)
+        
+        # Regrouper les nouvelles valeurs par colonne pour une affectation vectorielle
+        id_index = self._get_id_index()
+        positions, by_column = [], {}
+        for book_id, fields in updated.items():
+            pos = id_index.get(book_id)
+            if pos is None:
+                continue
+            positions.append(pos)
+            for column, value in fields.items():
+                by_column.setdefault(column, ([], []))
+                by_column[column][0].append(pos)
+                by_column[column][1].append(value)
+        if positions:
+            df = self.df
+            old_rows = df.iloc[positions].to_dict("records")
+            for column, (rows, values) in by_column.items():
+                values = [in_range(column, value) for value in values]
+                ensure_categories(df, column, values)
+                df.iloc[rows, df.columns.get_loc(column)] = values
+            self._after_update(old_rows, df.iloc[positions].to_dict("records"))
+        
+        if added:
+            new = apply_schema(pd.DataFrame(list(added.values()), columns=self.COLUMNS))
+            id_index = self._get_id_index()
+            offset = len(self._df)
+            self._df = append_rows(self._df, new)
+            id_index.update(zip(new["ID"].tolist(), range(offset, len(self._df))))
+            self._after_add(json.loads(new.to_json(orient="records", force_ascii=False)))
+        return bool(removed or positions or added)
+    
+    def _after_compaction(self) -> None:
+        """
+        Appelé quand un autre processus a compacté le journal: le stockage
+        principal contient désormais exactement le catalogue en mémoire.
+        """
+        self._storage_stamp = file_stamp(self._storage_path())
+    
+    def _reload(self) -> None:
+        """Relit entièrement le catalogue (retard impossible à rattraper)."""
         self.df = self._load_or_create_database()
+        if len(self._df) > 0:
+            self._next_id = max(self._next_id, int(self._df["ID"].max()) + 1)
+        self._reset_derived()
+    
+    # ===================
+    # MODIFICATIONS EXTERNES
+    # ===================
+    
+    def _storage_path(self) -> str:
+        """Fichier du stockage principal (CSV ou instantané Parquet)."""
+        return self.snapshot_path if self.primary == "parquet" else self.csv_path
+    
+    def watched_paths(self) -> List[str]:
+        """
+        Fichiers à surveiller pour détecter les modifications externes:
+        le stockage principal, et le journal en mode partagé.
+        """
+        paths = [self._storage_path()]
+        if self.shared:
+            paths.append(self.journal_path)
+        return paths
+    
+    def apply_external_changes(self) -> bool:
+        """
+        Intègre les modifications faites hors de cette instance.
+        
+        Le journal des autres processus est d'abord rattrapé (mode
+        partagé). Si le stockage principal a été réécrit par un autre
+        programme, il est relu hors verrou, le journal lui est appliqué,
+        puis seule la différence avec le catalogue en mémoire est
+        appliquée (voir diff_records): les abonnés reçoivent des
+        événements "inserted", "updated" et "deleted" limités aux livres
+        réellement modifiés, et les index et statistiques sont mis à jour
+        incrémentalement. Les écritures de cette instance ne sont pas
+        prises pour des modifications externes.
+        
+        Si le fichier change encore pendant la lecture, ou si des écritures
+        différées sont en attente, rien n'est appliqué: l'appel suivant
+        (prochaine notification du FileWatcher) réessaiera.
+        
+        Returns:
+            True si le catalogue a changé
+        """
+        if self.writer is not None:
+            self.writer.flush()
+        changed = self.refresh()
+        
+        stamp = file_stamp(self._storage_path())
+        if stamp is None or stamp == self._storage_stamp:
+            return changed
+        fresh = self._read_storage()
+        if fresh is None:
+            return changed
+        with self.lock, self._exclusive():
+            return self._merge_storage(fresh, stamp) or changed
+    
+    def _merge_storage(self, fresh: Optional[pd.DataFrame] = None, stamp=None,
+                       background: bool = False) -> bool:
+        """
+        Applique la différence entre le stockage principal (plus le journal)
+        et le catalogue en mémoire, si le stockage a été modifié hors de
+        cette instance (sous verrou). Rien n'est fait tant que des
+        opérations ne sont pas journalisées: la différence les annulerait.
+        
+        Args:
+            fresh: Stockage déjà lu (relu sinon)
+            stamp: État du fichier lors de cette lecture
+            background: Appel depuis le thread d'écriture différée
+            
+        Returns:
+            True si le catalogue a changé
+        """
+        if not self._storage_modified():
+            return False
+        current = file_stamp(self._storage_path())
+        if (stamp is not None and current != stamp) or self._unjournaled(background) > 0:
+            return False
+        if fresh is None:
+            fresh = self._read_storage()
+            if fresh is None:
+                return False
+        target = self._apply_journal(fresh, read_journal(self.journal_path))
+        self._storage_stamp = current
+        return self._merge_records(diff_records(self.df, target))
+    
+    def _storage_modified(self) -> bool:
+        """Indique si le stockage principal a été modifié hors de cette instance."""
+        current = file_stamp(self._storage_path())
+        return current is not None and current != self._storage_stamp
+    
+    def _unjournaled(self, background: bool = False) -> int:
+        """
+        Nombre d'opérations confiées au thread d'écriture différée et pas
+        encore journalisées. Le lot en cours d'écriture n'est pas compté
+        depuis ce thread (background): il ne compacte qu'après l'avoir
+        journalisé.
+        """
+        if self.writer is None:
+            return 0
+        return self.writer.queued if background else self.writer.pending
+    
+    # ===================
+    # STRUCTURES DÉRIVÉES
+    # ===================
+    
+    def _reset_derived(self) -> None:
+        """Invalide les structures dérivées après un rechargement complet."""
+        self._id_index = None
+        self._search_index = None
+        self._stats = None
+        self._emit("reloaded", [])
+    
+    def _after_add(self, rows: List[Dict]) -> None:
+        """
+        Met à jour les structures dérivées après des ajouts.
+        
+        Args:
+            rows: Lignes ajoutées
+        """
+        if self._search_index is not None:
+            for row in rows:
+                self._search_index.add(row["ID"], row)
+        if self._stats is not None:
+            for row in rows:
+                self._stats.add_row(row)
+        self._emit("inserted", [int(row["ID"]) for row in rows])
+    
+    def _after_update(self, old_rows: List[Dict], new_rows: List[Dict]) -> None:
+        """
+        Met à jour les structures dérivées après des modifications.
+        
+        Args:
+            old_rows: Lignes avant modification
+            new_rows: Lignes après modification, dans le même ordre
+        """
+        if self._search_index is not None:
+            for row in new_rows:
+                self._search_index.update(row["ID"], row)
+            if self._search_index.needs_rebuild:
+                self._search_index = None
+        if self._stats is not None:
+            for old_row, new_row in zip(old_rows, new_rows):
+                self._stats.update_row(old_row, new_row)
+        self._emit("updated", [int(row["ID"]) for row in new_rows])
+    
+    def _after_delete(self, rows: List[Dict]) -> None:
+        """
+        Met à jour les structures dérivées après des suppressions.
+        
+        Args:
+            rows: Lignes supprimées
+        """
+        if self._search_index is not None:
+            for row in rows:
+                self._search_index.remove(row["ID"])
+            if self._search_index.needs_rebuild:
+                self._search_index = None
+        if self._stats is not None:
+            for row in rows:
+                self._stats.remove_row(row)
+        self._emit("deleted", [int(row["ID"]) for row in rows])
+    
+    def _get_stats(self) -> CatalogStatistics:
+        """Retourne les agrégats du catalogue, calculés à la première utilisation."""
+        if self._stats is None:
+            self._stats = CatalogStatistics.from_dataframe(self.df)
+        return self._stats
+    
+    def _get_search_index(self) -> TrigramIndex:
+        """Retourne l'index de recherche, construit à la première utilisation."""
+        if self._search_index is None:
+            self._search_index = TrigramIndex.build(self.df)
+        return self._search_index
+    
+    # ===================
+    # TAMPON D'AJOUTS
+    # ===================
+    
+    def _flush_buffer(self) -> None:
+        """
+        Fusionne le tampon d'ajouts dans le DataFrame en un seul pd.concat.
+        
+        Les nouvelles lignes sont placées à la fin, donc les positions déjà
+        enregistrées dans l'index par ID restent valides.
+        """
+        new_rows = pd.DataFrame(self._buffer, columns=self.COLUMNS)
+        self._buffer = []
+        self._df = append_rows(self._df, new_rows)
+    
+    # ===================
+    # INDEX PAR ID
+    # ===================
+    
+    def _get_id_index(self) -> Dict[int, int]:
+        """
+        Retourne l'index ID -> position de ligne, reconstruit si besoin.
+        
+        Returns:
+            Dictionnaire {ID: position dans self.df}
+        """
+        if self._id_index is None:
+            df = self.df
+            self._id_index = dict(zip(df["ID"].astype(int).tolist(), range(len(df))))
+        return self._id_index
+    
+    @synchronized
+    def get_position(self, book_id: int) -> Optional[int]:
+        """
+        Retourne la position d'un livre dans le DataFrame en temps constant.
+        
+        Args:
+            book_id: ID du livre
+            
+        Returns:
+            Position de la ligne ou None si l'ID est inconnu
+        """
+        try:
+            return self._get_id_index().get(int(book_id))
+        except (TypeError, ValueError):
+            return None
+    
+    def _drop_rows(self, positions) -> None:
+        """
+        Retire des lignes du DataFrame en conservant l'index par ID: seules
+        les positions des lignes qui suivent la première ligne retirée sont
+        décalées, au lieu d'une reconstruction complète à la lecture suivante.
+        
+        Args:
+            positions: Positions des lignes à retirer
+        """
+        df = self.df
+        id_index = self._get_id_index()
+        keep = np.ones(len(df), dtype=bool)
+        keep[positions] = False
+        for book_id in df["ID"].to_numpy()[~keep].tolist():
+            del id_index[int(book_id)]
+        
+        self._df = df[keep].reset_index(drop=True)
+        first = int(np.min(positions))
+        following = self._df["ID"].iloc[first:].astype(int).tolist()
+        id_index.update(zip(following, range(first, len(self._df))))
+    
+    def has_book(self, book_id: int) -> bool:
+        """
+        Indique si un livre existe, sans parcourir le catalogue.
+        
+        Args:
+            book_id: ID du livre
+            
+        Returns:
+            True si le livre existe
+        """
+        return self.get_position(book_id) is not None
     
     def _load_or_create_database(self) -> pd.DataFrame:
        
@@ -21,57 +748,380 @@ class LibraryDatabase:
         # Créer le répertoire data s'il n'existe pas
         Path(self.csv_path).parent.mkdir(parents=True, exist_ok=True)
         
-        # Colonnes de la base de données
-        columns = ["ID", "Title", "Author", "Year", "Category", "ISBN", "Quantity", "ImagePath"]
+        # Créer le CSV vide s'il n'existe pas (et qu'aucun instantané ne le remplace)
+        if (self.primary == "csv" and not os.path.exists(self.csv_path)
+                and not (self.snapshot and os.path.exists(self.snapshot_path))):
+            pd.DataFrame(columns=self.COLUMNS).to_csv(self.csv_path, index=False)
+        
+        # État du fichier relevé avant la lecture: une modification faite
+        # pendant celle-ci sera vue par apply_external_changes
+        self._storage_stamp = file_stamp(self._storage_path())
+        df = self._read_storage()
+        if df is None:
+            return apply_schema(pd.DataFrame(columns=self.COLUMNS))
+        
+        # Rejouer les opérations du journal non encore compactées
+        return self._replay_journal(df)
+    
+    def _read_storage(self) -> Optional[pd.DataFrame]:
+        """
+        Lit le stockage principal, sans le journal.
         
-        # Charger ou créer le fichier CSV
-        if os.path.exists(self.csv_path):
+        Returns:
+            DataFrame au schéma déclaré, ou None si le CSV est illisible
+        """
+        # Instantané binaire: lu en priorité s'il est à jour (toujours
+        # lorsqu'il est le stockage principal)
+        if self.snapshot and (self.primary == "parquet" or is_fresh(self.snapshot_path, self.csv_path)):
             try:
-                df = pd.read_csv(self.csv_path)
-                return df
+                return read_snapshot(self.snapshot_path)
             except Exception as e:
-                print(f"Erreur lors de la lecture du CSV: {e}")
-                return pd.DataFrame(columns=columns)
-        else:
-            df = pd.DataFrame(columns=columns)
-            df.to_csv(self.csv_path, index=False)
+                print(f"Erreur lors de la lecture de l'instantané: {e}")
+        
+        if not os.path.exists(self.csv_path):
+            return apply_schema(pd.DataFrame(columns=self.COLUMNS))
+        try:
+            df = pd.read_csv(self.csv_path, dtype=READ_DTYPES)
+        except Exception as e:
+            print(f"Erreur lors de la lecture du CSV: {e}")
+            return None
+        
+        # Appliquer le schéma déclaré (les lignes sans ID valide sont ignorées)
+        df = apply_schema(df)
+        return df[df["ID"].notna()].reset_index(drop=True)
+    
+    # ===================
+    # JOURNAL
+    # ===================
+    
+    def _read_journal(self) -> List[Dict]:
+        """
+        Lit les enregistrements du journal.
+        
+        Returns:
+            Liste des opérations, dans l'ordre d'écriture
+        """
+        records, self._journal_offset = read_journal_tail(self.journal_path)
+        self._journal_generation = journal_generation(records)
+        self._mark_journal_read()
+        return records
+    
+    def _replay_journal(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applique les opérations du journal au DataFrame chargé du CSV.
+        
+        Les opérations sont d'abord réduites à leur effet final par ID
+        (voir reduce_journal), puis appliquées en une seule passe.
+        
+        Args:
+            df: DataFrame lu depuis le CSV
+            
+        Returns:
+            DataFrame à jour
+        """
+        records = self._read_journal()
+        self._journal_entries = len(records)
+        return self._apply_journal(df, records)
+    
+    def _apply_journal(self, df: pd.DataFrame, records: List[Dict]) -> pd.DataFrame:
+        """
+        Applique des opérations du journal à un DataFrame (sans le modifier).
+        
+        Args:
+            df: DataFrame de départ
+            records: Opérations, dans l'ordre d'écriture
+            
+        Returns:
+            DataFrame à jour
+        """
+        if not records:
             return df
+        
+        added, updated, deleted = reduce_journal(records)
+        if deleted:
+            df = df[~df["ID"].isin(deleted)]
+        if updated:
+            positions = {book_id: pos for pos, book_id in enumerate(df["ID"].tolist())}
+            df = df.copy()
+            for book_id, fields in updated.items():
+                if book_id not in positions:
+                    continue
+                for column, value in fields.items():
+                    set_cell(df, positions[book_id], column, value)
+        if added:
+            df = append_rows(df, pd.DataFrame(list(added.values()), columns=self.COLUMNS))
+        return df.reset_index(drop=True)
+    
+    def _persist(self, records: List[Dict]) -> None:
+        """
+        Rend durables des modifications déjà appliquées au DataFrame.
+        
+        En mode journal, les opérations sont ajoutées à la fin du journal
+        (coût indépendant de la taille du catalogue); sinon le CSV complet
+        est réécrit. Si un thread d'écriture différée est attaché
+        (self.writer, voir persistence.WriteBehindWriter), l'écriture lui
+        est confiée et la méthode retourne immédiatement.
+        
+        Args:
+            records: Opérations à enregistrer
+        """
+        # Dans une transaction, la persistance est différée au commit
+        if self._transaction_depth > 0:
+            self._pending_records.extend(records)
+            return
+        
+        # En mode partagé, l'écriture doit avoir lieu sous le verrou de
+        # fichier: pas d'écriture différée
+        if self.writer is not None and self.file_lock is None:
+            self.writer.submit(records)
+            return
+        
+        self._write_records(records)
+    
+    def _write_records(self, records: List[Dict], background: bool = False) -> None:
+        """
+        Écrit des opérations dans le journal, ou réécrit le stockage complet.
+        
+        Args:
+            records: Opérations à enregistrer
+            background: Appel depuis le thread d'écriture différée (la
+                        sauvegarde complète utilise alors background_save)
+        """
+        if self.journal:
+            try:
+                self._journal_offset = append_journal(self.journal_path, records)
+                self._mark_journal_read()
+            except Exception as e:
+                print(f"Erreur lors de l'écriture du journal: {e}")
+                raise
+            
+            # Le seuil croît avec le catalogue pour que le coût de la
+            # compaction (proportionnel à sa taille) reste amorti par opération
+            self._journal_entries += len(records)
+            if not self._compaction_due():
+                return
+        
+        if background:
+            self.background_save()
+        else:
+            self.save()
+    
+    def _compaction_due(self) -> bool:
+        """Indique si le journal doit être fusionné dans le stockage principal."""
+        return self._journal_entries >= max(self.compaction_threshold, len(self))
+    
+    @exclusive
+    def compact(self) -> None:
+        """Fusionne le journal dans le stockage principal puis le vide."""
+        self.save()
+    
+    @synchronized
+    def close(self) -> None:
+        """Compacte le journal s'il contient des opérations en attente."""
+        if self.journal and self._journal_entries > 0:
+            self.compact()
+    
+    @exclusive
+    def save(self) -> None:
+        """
+        Sauvegarde le catalogue dans le stockage principal.
+        
+        Les fichiers (CSV et/ou instantané Parquet) sont écrits dans un
+        fichier temporaire renommé ensuite, puis le journal (désormais
+        inclus) est vidé. L'instantané est écrit après le CSV pour ne
+        jamais paraître plus récent qu'un CSV qui n'a pas pu être écrit.
+        Une modification externe du stockage pas encore intégrée l'est
+        d'abord, pour ne pas être écrasée.
+        """
+        self._merge_storage()
+        self._write_files(self.df)
+        self._truncate_journal()
     
-    def save_to_csv(self) -> None:
-        """Sauvegarde le DataFrame dans le fichier CSV."""
+    def background_save(self) -> None:
+        """
+        Variante de save() pour le thread d'écriture différée.
+        
+        Le catalogue est copié sous verrou puis écrit hors verrou: les
+        autres threads peuvent continuer à modifier la base pendant
+        l'écriture. Les opérations postérieures à la copie restent dans la
+        file du thread et sont journalisées après la troncature; celles qui
+        seraient écrites deux fois sont rejouées sans effet (rejeu
+        idempotent). Suppose que ce thread est le seul à écrire le journal.
+        
+        Une modification externe du stockage est intégrée avant la copie;
+        si elle ne peut pas l'être (opérations encore en file), la
+        compaction est reportée à une écriture suivante plutôt que de
+        l'écraser.
+        """
+        with self.lock:
+            self._merge_storage(background=True)
+            if self._storage_modified():
+                return
+            frame = self.df.copy()
+        self._write_files(frame)
+        with self.lock:
+            self._truncate_journal()
+    
+    def _write_files(self, df: pd.DataFrame) -> None:
+        """Écrit le stockage principal (CSV et/ou instantané Parquet)."""
         try:
-            self.df.to_csv(self.csv_path, index=False, encoding='utf-8')
+            if self.primary == "csv":
+                self._write_csv(df, self.csv_path)
+            if self.snapshot:
+                write_snapshot(df, self.snapshot_path,
+                               self.csv_path if self.primary == "csv" else None)
+            self._storage_stamp = file_stamp(self._storage_path())
         except Exception as e:
             print(f"Erreur lors de la sauvegarde: {e}")
             raise
     
+    def _truncate_journal(self) -> None:
+        """
+        Vide le journal, désormais inclus dans le stockage principal.
+        
+        En mode partagé, le journal est remplacé par un journal de la
+        génération suivante et l'ancien est gardé (.prev): un processus qui
+        n'en avait pas lu la fin peut la rattraper sans relire le stockage.
+        """
+        if self.file_lock is not None:
+            self._journal_generation += 1
+            tmp_path = self.journal_path + ".tmp"
+            with open(tmp_path, "wb"):
+                pass
+            self._journal_offset = append_journal(
+                tmp_path, [{"op": OP_GENERATION, "value": self._journal_generation}])
+            if os.path.exists(self.journal_path):
+                os.replace(self.journal_path, self.journal_path + ".prev")
+            os.replace(tmp_path, self.journal_path)
+            self._mark_journal_read()
+        elif os.path.exists(self.journal_path):
+            open(self.journal_path, "w", encoding="utf-8").close()
+        self._journal_entries = 0
+    
+    @synchronized
+    def save_to_csv(self, csv_path: Optional[str] = None) -> None:
+        """
+        Sauvegarde le DataFrame dans un fichier CSV.
+        
+        Sans argument et avec le CSV comme stockage principal, équivaut à
+        save(); sinon le catalogue est seulement exporté.
+        
+        Args:
+            csv_path: Fichier de destination (par défaut csv_path)
+        """
+        if csv_path is None and self.primary == "csv":
+            self.save()
+            return
+        try:
+            self._write_csv(self.df, csv_path or self.csv_path)
+        except Exception as e:
+            print(f"Erreur lors de l'export CSV: {e}")
+            raise
+    
+    @staticmethod
+    def _write_csv(df: pd.DataFrame, csv_path: str) -> None:
+        """Écrit un DataFrame en CSV via un fichier temporaire renommé ensuite."""
+        tmp_path = csv_path + ".tmp"
+        df.to_csv(tmp_path, index=False, encoding='utf-8')
+        os.replace(tmp_path, csv_path)
+    
+    # ===================
+    # TRANSACTIONS
+    # ===================
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Regroupe plusieurs modifications en une seule écriture.
+        
+        Les modifications sont appliquées immédiatement au DataFrame mais
+        persistées une seule fois à la sortie du bloc. En cas d'exception,
+        le DataFrame est restauré et rien n'est écrit. Les transactions
+        imbriquées rejoignent la transaction englobante.
+        
+        Exemple:
+            with db.transaction():
+                db.add_book(...)
+                db.delete_book(3)
+        """
+        with self.lock, self._exclusive():
+            if self._transaction_depth > 0:
+                self._transaction_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._transaction_depth -= 1
+                return
+            
+            snapshot = self._snapshot()
+            self._transaction_depth = 1
+            self._pending_records = []
+            try:
+                yield self
+            except BaseException:
+                self._restore(snapshot)
+                self._reset_derived()
+                self._pending_records = []
+                raise
+            finally:
+                self._transaction_depth = 0
+            
+            records = self._pending_records
+            self._pending_records = []
+            if records:
+                self._persist(records)
+    
+    def _snapshot(self):
+        """Capture l'état du catalogue pour pouvoir annuler une transaction."""
+        return self.df.copy()
+    
+    def _restore(self, snapshot) -> None:
+        """Restaure un état capturé par _snapshot."""
+        self.df = snapshot
+    
+    @exclusive
     def add_book(self, titre: str, auteur: str, année: int, 
                  catégorie: str, isbn: str, quantité: int, 
                  chemin_image: str = "") -> int:
-       
-        # Générer un ID unique
-        new_id = int(self.df["ID"].max()) + 1 if len(self.df) > 0 else 1
+        
+        # Année inconnue (None) => valeur manquante
+        year = None if année is None else int(année)
+        # Refuser une valeur hors plage avant de la journaliser: elle
+        # rendrait le catalogue impossible à relire
+        check_fields({"Year": year, "Quantity": int(quantité)})
+        
+        # Générer un ID unique (compteur croissant, jamais réutilisé)
+        new_id = self._next_id
+        self._next_id += 1
         
         # Créer une nouvelle ligne
         new_row = {
             "ID": new_id,
             "Title": titre,
             "Author": auteur,
-            "Year": int(année),
+            "Year": year,
             "Category": catégorie,
             "ISBN": isbn,
             "Quantity": int(quantité),
             "ImagePath": chemin_image
         }
         
-        # Ajouter la ligne au DataFrame
-        self.df = pd.concat([self.df, pd.DataFrame([new_row])], ignore_index=True)
+        # Ajouter la ligne au tampon; il est fusionné au DataFrame à la
+        # prochaine lecture ou dès qu'il atteint la taille du DataFrame
+        # (croissance géométrique => coût amorti constant par ajout)
+        id_index = self._get_id_index()
+        self._buffer.append(new_row)
+        id_index[new_id] = len(self) - 1
+        if len(self._buffer) >= max(self.BUFFER_MIN_CHUNK, len(self._df)):
+            self._flush_buffer()
+        self._after_add([new_row])
         
         # Sauvegarder
-        self.save_to_csv()
+        self._persist([{"op": "add", "row": new_row}])
         
         return new_id
     
+    @synchronized
     def get_all_books(self) -> pd.DataFrame:
         """
         Retourne tous les livres de la base de données.
@@ -81,6 +1131,25 @@ class LibraryDatabase:
         """
         return self.df.copy()
     
+    def iter_books(self, chunk_size: int = 50000) -> Iterator[pd.DataFrame]:
+        """
+        Parcourt le catalogue par blocs, pour écrire un export sans en
+        construire une copie complète.
+        
+        Args:
+            chunk_size: Nombre maximal de livres par bloc
+            
+        Yields:
+            DataFrames d'au plus chunk_size livres
+        """
+        with self.lock:
+            df = self.df
+        for start in range(0, len(df), chunk_size):
+            with self.lock:
+                chunk = df.iloc[start:start + chunk_size].copy()
+            yield chunk
+    
+    @synchronized
     def get_book_by_id(self, book_id: int) -> Optional[Dict]:
         """
         Récupère un livre par son ID.
@@ -91,11 +1160,14 @@ class LibraryDatabase:
         Returns:
             Dictionnaire avec les données du livre ou None
         """
-        book = self.df[self.df["ID"] == book_id]
-        if not book.empty:
-            return book.iloc[0].to_dict()
-        return None
+        pos = self.get_position(book_id)
+        if pos is None:
+            return None
+        if pos >= len(self._df):
+            return dict(self._buffer[pos - len(self._df)])
+        return self._df.iloc[pos].to_dict()
     
+    @synchronized
     def search_books(self, query: str) -> pd.DataFrame:
         """
         Recherche des livres par titre, auteur, catégorie ou ISBN.
@@ -106,15 +1178,61 @@ class LibraryDatabase:
         Returns:
             DataFrame avec les livres correspondants
         """
+        positions = self._search_positions(query)
+        if positions is None:
+            return self.df.copy()
+        return self.df.iloc[positions].copy()
+    
+    @synchronized
+    def search_page(self, query: str, offset: int = 0, limit: int = 50) -> Tuple[int, pd.DataFrame]:
+        """
+        Recherche paginée: seules les lignes de la page sont copiées.
+        
+        Args:
+            query: Texte de recherche
+            offset: Rang du premier résultat retourné
+            limit: Nombre maximal de résultats retournés
+            
+        Returns:
+            (nombre total de résultats, DataFrame de la page)
+        """
+        positions = self._search_positions(query)
+        if positions is None:
+            return len(self.df), self.df.iloc[offset:offset + limit].copy()
+        return len(positions), self.df.iloc[positions[offset:offset + limit]].copy()
+    
+    def _search_positions(self, query: str) -> Optional[List[int]]:
+        """
+        Positions des livres correspondant à une recherche.
+        
+        Returns:
+            Positions croissantes, ou None pour une recherche vide (tous les livres)
+        """
         query = query.lower()
+        if not query:
+            return None
+        
+        # Requêtes d'au moins 3 caractères: index de trigrammes
+        book_ids = self._get_search_index().search(query)
+        if book_ids is not None:
+            if len(book_ids) * 8 < len(self.df):
+                id_index = self._get_id_index()
+                return sorted(id_index[book_id] for book_id in book_ids if book_id in id_index)
+            # Beaucoup de résultats: un passage vectorisé sur la colonne ID
+            # coûte moins que le tri des positions
+            wanted = np.fromiter(book_ids, dtype="int64", count=len(book_ids))
+            return np.isin(self.df["ID"].to_numpy(dtype="int64"), wanted).nonzero()[0].tolist()
+        
+        # Requêtes plus courtes: parcours vectorisé des colonnes
         mask = (
-            self.df["Title"].str.lower().str.contains(query, na=False) |
-            self.df["Author"].str.lower().str.contains(query, na=False) |
-            self.df["Category"].str.lower().str.contains(query, na=False) |
-            self.df["ISBN"].str.lower().str.contains(query, na=False)
+            self.df["Title"].str.lower().str.contains(query, na=False, regex=False) |
+            self.df["Author"].str.lower().str.contains(query, na=False, regex=False) |
+            self.df["Category"].str.lower().str.contains(query, na=False, regex=False) |
+            self.df["ISBN"].str.lower().str.contains(query, na=False, regex=False)
         )
-        return self.df[mask].copy()
+        return mask.to_numpy().nonzero()[0].tolist()
     
+    @exclusive
     def update_book(self, book_id: int, titre: str = None, auteur: str = None,
                     année: int = None, catégorie: str = None, isbn: str = None,
                     quantité: int = None, chemin_image: str = None) -> bool:
@@ -134,32 +1252,47 @@ class LibraryDatabase:
         Returns:
             True si la mise à jour a réussi, False sinon
         """
-        idx = self.df[self.df["ID"] == book_id].index
+        pos = self.get_position(book_id)
         
-        if len(idx) == 0:
+        if pos is None:
             return False
         
-        idx = idx[0]
-        
         # Mettre à jour les champs fournis
+        fields = self._book_fields(titre, auteur, année, catégorie, isbn, quantité, chemin_image)
+        
+        old_row = self.get_book_by_id(book_id)
+        if pos >= len(self._df):
+            self._buffer[pos - len(self._df)].update(fields)
+        else:
+            for column, value in fields.items():
+                set_cell(self._df, pos, column, value)
+        self._after_update([old_row], [self.get_book_by_id(book_id)])
+        
+        self._persist([{"op": "update", "id": int(book_id), "fields": fields}])
+        return True
+    
+    @staticmethod
+    def _book_fields(titre=None, auteur=None, année=None, catégorie=None, isbn=None,
+                     quantité=None, chemin_image=None) -> Dict:
+        """Convertit les arguments fournis à update_book en {colonne: valeur}."""
+        fields = {}
         if titre is not None:
-            self.df.at[idx, "Title"] = titre
+            fields["Title"] = titre
         if auteur is not None:
-            self.df.at[idx, "Author"] = auteur
+            fields["Author"] = auteur
         if année is not None:
-            self.df.at[idx, "Year"] = int(année)
+            fields["Year"] = int(année)
         if catégorie is not None:
-            self.df.at[idx, "Category"] = catégorie
+            fields["Category"] = catégorie
         if isbn is not None:
-            self.df.at[idx, "ISBN"] = isbn
+            fields["ISBN"] = isbn
         if quantité is not None:
-            self.df.at[idx, "Quantity"] = int(quantité)
+            fields["Quantity"] = int(quantité)
         if chemin_image is not None:
-            self.df.at[idx, "ImagePath"] = chemin_image
-        
-        self.save_to_csv()
-        return True
+            fields["ImagePath"] = chemin_image
+        return check_fields(fields)
     
+    @exclusive
     def delete_book(self, book_id: int) -> bool:
         """
         Supprime un livre de la base de données.
@@ -170,37 +1303,138 @@ class LibraryDatabase:
         Returns:
             True si la suppression a réussi, False sinon
         """
-        initial_len = len(self.df)
-        self.df = self.df[self.df["ID"] != book_id]
+        pos = self.get_position(book_id)
         
-        if len(self.df) < initial_len:
-            self.save_to_csv()
+        if pos is not None:
+            old_row = self.get_book_by_id(book_id)
+            self._drop_rows([pos])
+            self._after_delete([old_row])
+            self._persist([{"op": "delete", "id": int(book_id)}])
             return True
         return False
     
+    # ===================
+    # OPÉRATIONS EN LOT
+    # ===================
+    
+    @exclusive
+    def add_books(self, books) -> List[int]:
+        """
+        Ajoute plusieurs livres en une seule opération.
+        
+        Args:
+            books: Liste de dictionnaires ou DataFrame avec les colonnes
+                   Title, Author, Year, Category, ISBN, Quantity et
+                   éventuellement ImagePath
+                   
+        Returns:
+            Liste des IDs attribués, dans l'ordre des livres fournis
+        """
+        new_rows = pd.DataFrame(books)
+        if new_rows.empty:
+            return []
+        check_frame(new_rows)
+        
+        start_id = self._next_id
+        self._next_id += len(new_rows)
+        new_rows = new_rows.reindex(columns=self.COLUMNS)
+        new_rows["ID"] = range(start_id, start_id + len(new_rows))
+        new_rows = apply_schema(new_rows)
+        
+        with self.transaction():
+            id_index = self._get_id_index()
+            offset = len(self.df)
+            self._df = append_rows(self._df, new_rows)
+            id_index.update(zip(new_rows["ID"].tolist(), range(offset, len(self._df))))
+            rows = json.loads(new_rows.to_json(orient="records", force_ascii=False))
+            self._after_add(rows)
+            self._persist([{"op": "add", "row": row} for row in rows])
+        
+        return new_rows["ID"].tolist()
+    
+    @exclusive
+    def update_books(self, updates: Dict[int, Dict]) -> int:
+        """
+        Met à jour plusieurs livres en une seule opération.
+        
+        Args:
+            updates: Dictionnaire {ID: {colonne: nouvelle valeur}}
+            
+        Returns:
+            Nombre de livres mis à jour
+        """
+        found = {}
+        for book_id in updates:
+            pos = self.get_position(book_id)
+            if pos is not None:
+                found[book_id] = pos
+        if not found:
+            return 0
+        
+        # Regrouper les nouvelles valeurs par colonne pour une affectation vectorielle
+        by_column = {}
+        records = []
+        for book_id, pos in found.items():
+            fields = dict(updates[book_id])
+            for column in ("Year", "Quantity"):
+                if column in fields:
+                    fields[column] = int(fields[column])
+            check_fields(fields)
+            for column, value in fields.items():
+                by_column.setdefault(column, ([], []))
+                by_column[column][0].append(pos)
+                by_column[column][1].append(value)
+            records.append({"op": "update", "id": int(book_id), "fields": fields})
+        
+        positions = list(found.values())
+        with self.transaction():
+            old_rows = self.df.iloc[positions].to_dict("records")
+            for column, (rows, values) in by_column.items():
+                ensure_categories(self.df, column, values)
+                self.df.iloc[rows, self.df.columns.get_loc(column)] = values
+            self._after_update(old_rows, self.df.iloc[positions].to_dict("records"))
+            self._persist(records)
+        
+        return len(found)
+    
+    @exclusive
+    def delete_books(self, book_ids: List[int]) -> int:
+        """
+        Supprime plusieurs livres en une seule opération.
+        
+        Args:
+            book_ids: IDs des livres à supprimer
+            
+        Returns:
+            Nombre de livres supprimés
+        """
+        mask = self.df["ID"].isin(list(book_ids))
+        deleted_rows = self.df[mask].to_dict("records")
+        deleted_ids = [int(row["ID"]) for row in deleted_rows]
+        if not deleted_ids:
+            return 0
+        
+        with self.transaction():
+            self._drop_rows(np.flatnonzero(mask.to_numpy()))
+            self._after_delete(deleted_rows)
+            self._persist([{"op": "delete", "id": book_id} for book_id in deleted_ids])
+        
+        return len(deleted_ids)
+    
+    @synchronized
     def get_statistics(self) -> Dict:
         """
-        Calcule les statistiques de la bibliothèque.
+        Retourne les statistiques de la bibliothèque.
+        
+        Les agrégats sont tenus à jour par chaque ajout, modification et
+        suppression; l'appel ne parcourt donc pas le catalogue.
         
         Returns:
             Dictionnaire avec les statistiques
         """
-        if len(self.df) == 0:
-            return {
-                "total_livres": 0,
-                "quantité_totale": 0,
-                "catégories_uniques": 0,
-                "auteur_frequent": "N/A"
-            }
-        
-        stats = {
-            "total_livres": len(self.df),
-            "quantité_totale": int(self.df["Quantity"].sum()),
-            "catégories_uniques": int(self.df["Category"].nunique()),
-            "auteur_frequent": self.df["Author"].mode()[0] if len(self.df["Author"].mode()) > 0 else "N/A"
-        }
-        return stats
+        return self._get_stats().to_dict()
     
+    @synchronized
     def get_categories(self) -> List[str]:
         """
         Retourne la liste des catégories uniques.
@@ -208,8 +1442,9 @@ class LibraryDatabase:
         Returns:
             Liste des catégories
         """
-        return sorted(self.df["Category"].unique().tolist())
+        return sorted(self._get_stats().categories.to_dict())
     
+    @synchronized
     def get_category_distribution(self) -> Dict[str, int]:
         """
         Retourne la distribution des livres par catégorie.
@@ -217,4 +1452,54 @@ class LibraryDatabase:
         Returns:
             Dictionnaire avec le nombre de livres par catégorie
         """
-        return self.df["Category"].value_counts().to_dict()
+        return self._get_stats().categories.to_dict()
+    
+    @synchronized
+    def memory_report(self) -> Dict[str, int]:
+        """
+        Retourne la mémoire occupée par le catalogue, colonne par colonne.
+        
+        Returns:
+            Dictionnaire {colonne: octets} avec une entrée "total"
+        """
+        return memory_report(self.df)
+
+
+def open_database(path: str = "data/library.csv", backend: Optional[str] = None, **kwargs):
+    """
+    Ouvre le catalogue avec le moteur de stockage adapté.
+    
+    Args:
+        path: Chemin du fichier de données
+        backend: "csv", "sqlite" ou "rowstore" (catalogue laissé sur
+                 disque, voir RowStoreLibraryDatabase); par défaut
+                 déduit de l'extension (.db, .sqlite, .sqlite3 => SQLite;
+                 .parquet => moteur CSV avec l'instantané Parquet comme
+                 stockage principal)
+        **kwargs: Options transmises au constructeur du moteur (par
+                  exemple shared=True pour les moteurs CSV et rowstore)
+        
+    Returns:
+        Instance de LibraryDatabase, SQLiteLibraryDatabase ou
+        RowStoreLibraryDatabase
+    """
+    suffix = Path(path).suffix.lower()
+    if backend is None:
+        backend = "sqlite" if suffix in (".db", ".sqlite", ".sqlite3") else "csv"
+    
+    if backend == "csv" and suffix == ".parquet":
+        # Instantané Parquet comme stockage principal (CSV pour l'export)
+        kwargs.setdefault("primary", "parquet")
+        path = str(Path(path).with_suffix(".csv"))
+    
+    if backend == "sqlite":
+        # SQLite gère lui-même les accès de plusieurs processus
+        kwargs.pop("shared", None)
+        from sqlite_database import SQLiteLibraryDatabase
+        return SQLiteLibraryDatabase(path, **kwargs)
+    if backend == "rowstore":
+        from row_store import RowStoreLibraryDatabase
+        return RowStoreLibraryDatabase(path, **kwargs)
+    if backend == "csv":
+        return LibraryDatabase(path, **kwargs)
+    raise ValueError(f"Moteur de stockage inconnu: {backend}")
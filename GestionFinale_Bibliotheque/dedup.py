@@ -0,0 +1,309 @@
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List
+
+from importer import TAILLE_BLOC
+
+# Similarité minimale (1 - distance d'édition / longueur) entre deux variantes
+SEUIL_SIMILARITE = 0.85
+
+# Nombre de voisins comparés à chaque valeur dans l'ordre trié
+FENETRE = 8
+
+# En dessous de cette longueur, seules les clés identiques sont regroupées
+LONGUEUR_MIN = 4
+
+# Une variante doit être au moins 1 / RAPPORT_MAX fois moins fréquente que
+# la forme canonique, sauf si elle ne concerne que LIVRES_RARES livres au
+# plus: deux valeurs proches et toutes deux fréquentes ("Jane Martin" /
+# "Anne Martin"), même de clé identique ("Thomas More" / "Thomas Moore",
+# les lettres répétées étant simplifiées), désignent des auteurs différents
+RAPPORT_MAX = 0.2
+LIVRES_RARES = 2
+
+_SEPARATEURS = re.compile(r"[\W_]+")
+_REPETITIONS = re.compile(r"(.)\1+")
+_NOMBRES = re.compile(r"\d+")
+
+# ===================
+# CLÉS ET SIMILARITÉ
+# ===================
+
+def normalize_key(text) -> str:
+    """
+    Clé de comparaison d'un auteur ou d'un titre: sans casse, sans accents
+    ni ponctuation, espaces réduits et lettres répétées simplifiées
+    ("OUssama Muslim" et "Ousama  MUSLIM" donnent "ousama muslim").
+    """
+    text = unicodedata.normalize("NFKD", str(text).casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = " ".join(_SEPARATEURS.sub(" ", text).split())
+    return _REPETITIONS.sub(r"\1", text)
+
+def levenshtein(a: str, b: str) -> int:
+    """
+    Distance d'édition (insertions, suppressions, substitutions).
+    
+    Algorithme bit-parallèle de Myers (variante de Hyyrö): une colonne de
+    la matrice de programmation dynamique tient dans un entier, d'où un
+    nombre d'opérations proportionnel à len(b) seulement.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    m = len(a)
+    if m == 0:
+        return len(b)
+    
+    peq = {}
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+def _common_prefix(a: str, b: str) -> int:
+    """Longueur du préfixe commun, par dichotomie sur des tranches."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def _within_distance(a: str, b: str, max_distance: int) -> bool:
+    """
+    Indique si levenshtein(a, b) <= max_distance.
+    
+    Le préfixe et le suffixe communs (longs entre voisins triés) ne
+    changent pas la distance et sont retirés; ce qui reste suffit souvent
+    à conclure sans calcul: une seule différence laisse au plus un
+    caractère de chaque côté, et chaque caractère présent d'un seul côté
+    coûte au moins une opération.
+    """
+    prefix = _common_prefix(a, b)
+    a, b = a[prefix:], b[prefix:]
+    suffix = _common_prefix(a[::-1], b[::-1])
+    a, b = a[:len(a) - suffix], b[:len(b) - suffix]
+    longest = max(len(a), len(b))
+    if longest <= max_distance:
+        return True
+    if max_distance <= 1 or min(len(a), len(b)) == 0:
+        return False
+    chars_a, chars_b = set(a), set(b)
+    if len(chars_a - chars_b) > max_distance or len(chars_b - chars_a) > max_distance:
+        return False
+    return levenshtein(a, b) <= max_distance
+
+def _word_typos(a: str, b: str) -> bool:
+    """
+    Indique si les mots qui diffèrent ne sont que des fautes de frappe les
+    uns des autres ("hugp" / "hugo"), et non des mots différents ("terre"
+    / "time", "le" / "la": une faute par tranche de quatre lettres, aucune
+    dans les mots courts). Un nombre de mots différent n'est accepté que
+    s'il ne tient qu'aux espaces ("victorhugo" / "victor hugo").
+    """
+    words_a, words_b = a.split(), b.split()
+    if len(words_a) != len(words_b):
+        return "".join(words_a) == "".join(words_b)
+    return all(
+        word_a == word_b or levenshtein(word_a, word_b) <= max(len(word_a), len(word_b)) // 4
+        for word_a, word_b in zip(words_a, words_b)
+    )
+
+def _token_sorted(key: str) -> str:
+    return " ".join(sorted(key.split()))
+
+def is_similar(a: str, b: str, threshold: float = SEUIL_SIMILARITE, any_order: bool = False) -> bool:
+    """
+    Indique si deux clés (voir normalize_key) désignent probablement la
+    même valeur: distance d'édition assez faible, dans l'ordre des mots ou,
+    avec any_order, mots triés ("Hugo Victor" / "Victor Hugo").
+    
+    Les clés courtes, dont les nombres diffèrent ("Tome 1" / "Tome 2") ou
+    dont un mot est remplacé par un autre (voir _word_typos) ne sont pas
+    rapprochées.
+    """
+    if a == b:
+        return True
+    max_distance = int((1 - threshold) * max(len(a), len(b)))
+    if abs(len(a) - len(b)) > max_distance or min(len(a), len(b)) < LONGUEUR_MIN:
+        return False
+    if _NOMBRES.findall(a) != _NOMBRES.findall(b):
+        return False
+    if _within_distance(a, b, max_distance) and _word_typos(a, b):
+        return True
+    if not any_order or " " not in a:
+        return False
+    sorted_a, sorted_b = _token_sorted(a), _token_sorted(b)
+    return ((sorted_a, sorted_b) != (a, b) and _within_distance(sorted_a, sorted_b, max_distance)
+            and _word_typos(sorted_a, sorted_b))
+
+# ===================
+# REGROUPEMENT
+# ===================
+
+class _UnionFind:
+    """Partition d'indices 0..n-1 (compression de chemin, union par taille)."""
+    
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+    
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+    
+    def union(self, i: int, j: int) -> None:
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return
+        if self.size[i] < self.size[j]:
+            i, j = j, i
+        self.parent[j] = i
+        self.size[i] += self.size[j]
+
+def value_counts(db, column: str, chunk_size: int = TAILLE_BLOC) -> Counter:
+    """Nombre de livres par valeur d'une colonne, catalogue parcouru par blocs."""
+    counts = Counter()
+    for chunk in db.iter_books(chunk_size):
+        # Les colonnes "category" comptent aussi les catégories inutilisées
+        chunk_counts = chunk[column].dropna().astype(str).value_counts()
+        counts.update(chunk_counts[chunk_counts > 0].to_dict())
+    return counts
+
+def find_duplicates(counts: Dict[str, int], threshold: float = SEUIL_SIMILARITE,
+                    window: int = FENETRE, any_order: bool = False) -> List[Dict]:
+    """
+    Regroupe les variantes orthographiques d'une même valeur.
+    
+    Les comparaisons portent sur les valeurs distinctes, pas sur les
+    livres. Les valeurs de même clé (voir normalize_key) sont regroupées
+    d'office; les clés distinctes ne sont comparées qu'à leurs window
+    voisines dans les ordres triés de la clé, de la clé inversée et, avec
+    any_order (noms d'auteurs), des mots triés. Le nombre de comparaisons
+    reste ainsi en O(n * window) au lieu de O(n²), tout en rapprochant
+    les fautes placées en début comme en fin de chaîne. Les paires
+    similaires (is_similar) sont réunies par union-find; une variante trop
+    éloignée de la forme canonique de son groupe (rapprochée par
+    enchaînement), ou presque aussi fréquente qu'elle (voir RAPPORT_MAX),
+    même de clé identique, en est retirée.
+    
+    Args:
+        counts: Nombre de livres par valeur (voir value_counts)
+        threshold: Similarité minimale
+        window: Nombre de voisins comparés
+        any_order: Ignorer l'ordre des mots ("Hugo Victor" / "Victor Hugo")
+        
+    Returns:
+        Groupes triés par nombre de livres à corriger, chacun sous la forme
+        {"canonique": valeur la plus fréquente, "variantes": {valeur:
+        nombre de livres}, "livres": livres portant une variante}
+    """
+    values = list(counts)
+    keys = [normalize_key(value) for value in values]
+    groups = _UnionFind(len(values))
+    
+    # Clés identiques
+    first = {}
+    for i, key in enumerate(keys):
+        if key:
+            groups.union(first.setdefault(key, i), i)
+    
+    # Voisinages triés (une seule valeur par clé). Dans l'ordre des mots
+    # triés, les paires de clés déjà triées sont ignorées: le premier
+    # passage les a classées de la même façon
+    distinct = list(first.values())
+    passes = [(lambda i: keys[i], None), (lambda i: keys[i][::-1], None)]
+    if any_order:
+        sorted_keys = {i: _token_sorted(keys[i]) for i in distinct}
+        reordered = {i for i in distinct if sorted_keys[i] != keys[i]}
+        passes.append((sorted_keys.__getitem__, reordered))
+    for order, required in passes:
+        ranked = sorted(distinct, key=order)
+        for pos, i in enumerate(ranked):
+            for j in ranked[pos + 1:pos + 1 + window]:
+                if required is not None and i not in required and j not in required:
+                    continue
+                if groups.find(i) != groups.find(j) and is_similar(keys[i], keys[j], threshold, any_order):
+                    groups.union(i, j)
+    
+    members = {}
+    for i in range(len(values)):
+        members.setdefault(groups.find(i), []).append(i)
+    
+    clusters = []
+    for indices in members.values():
+        if len(indices) < 2:
+            continue
+        canonical = max(indices, key=lambda i: (counts[values[i]], len(values[i]), values[i]))
+        limit = max(RAPPORT_MAX * counts[values[canonical]], LIVRES_RARES)
+        variants = {
+            values[i]: counts[values[i]] for i in indices
+            if i != canonical and counts[values[i]] <= limit and (
+                keys[i] == keys[canonical] or is_similar(keys[i], keys[canonical], threshold, any_order))
+        }
+        if variants:
+            clusters.append({
+                "canonique": values[canonical],
+                "variantes": variants,
+                "livres": sum(variants.values()),
+            })
+    clusters.sort(key=lambda cluster: (-cluster["livres"], cluster["canonique"]))
+    return clusters
+
+# ===================
+# FUSION
+# ===================
+
+def merge_duplicates(db, column: str, clusters: List[Dict], chunk_size: int = TAILLE_BLOC) -> int:
+    """
+    Remplace les variantes par leur forme canonique, en un seul appel à
+    update_books (une transaction, un lot d'événements "updated").
+    
+    Args:
+        db: Catalogue (tous moteurs)
+        column: Colonne corrigée
+        clusters: Groupes retournés par find_duplicates
+        chunk_size: Taille des blocs lus pour trouver les livres
+        
+    Returns:
+        Nombre de livres modifiés
+    """
+    replacements = {
+        variant: cluster["canonique"]
+        for cluster in clusters
+        for variant in cluster["variantes"]
+    }
+    if not replacements:
+        return 0
+    
+    updates = {}
+    for chunk in db.iter_books(chunk_size):
+        values = chunk[column].astype(object)
+        found = chunk[values.isin(list(replacements))]
+        for book_id, value in zip(found["ID"].tolist(), found[column].astype(str).tolist()):
+            updates[int(book_id)] = {column: replacements[value]}
+    return db.update_books(updates) if updates else 0
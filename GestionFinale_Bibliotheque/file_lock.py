@@ -0,0 +1,111 @@
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+class FileLock:
+    """
+    Verrou exclusif entre processus, posé sur un fichier à côté du catalogue.
+    
+    Utilise fcntl.lockf (verrou POSIX, également honoré par les partages
+    NFS) ou msvcrt.locking sous Windows. Le verrou est réentrant pour le
+    thread qui le détient et libéré automatiquement par le système si le
+    processus s'arrête.
+    
+    Exemple:
+        lock = FileLock("data/library.csv.lock")
+        with lock:
+            ...  # aucun autre processus ne détient le verrou
+    """
+    
+    DELAI_ATTENTE = 10.0
+    INTERVALLE = 0.05
+    
+    def __init__(self, path: str, timeout: float = None):
+        """
+        Args:
+            path: Fichier de verrou (créé s'il n'existe pas)
+            timeout: Attente maximale en secondes (DELAI_ATTENTE par défaut)
+        """
+        self.path = path
+        self.timeout = self.DELAI_ATTENTE if timeout is None else timeout
+        self._thread_lock = threading.RLock()
+        self._fd = None
+        self._depth = 0
+    
+    @property
+    def held(self) -> bool:
+        """Indique si le verrou est détenu par ce processus."""
+        return self._depth > 0
+    
+    def acquire(self) -> None:
+        """
+        Prend le verrou, en attendant au plus timeout secondes.
+        
+        Raises:
+            TimeoutError: Un autre processus garde le verrou trop longtemps
+        """
+        self._thread_lock.acquire()
+        if self._depth > 0:
+            self._depth += 1
+            return
+        
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+            deadline = time.monotonic() + self.timeout
+            while not self._try_lock(fd):
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Catalogue verrouillé par un autre processus ({self.path})")
+                time.sleep(self.INTERVALLE)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._fd = fd
+        self._depth = 1
+    
+    def release(self) -> None:
+        """Relâche le verrou (le dernier niveau le rend aux autres processus)."""
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                self._unlock(fd)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+    
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.release()
+    
+    @staticmethod
+    def _try_lock(fd: int) -> bool:
+        """Tente de poser le verrou sans attendre."""
+        try:
+            if fcntl is not None:
+                fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _unlock(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,186 @@
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Événements inotify surveillés (voir <sys/inotify.h>): écriture, fermeture
+# après écriture, création, remplacement par renommage et suppression
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+MASQUE = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EN_TETE_EVENEMENT = struct.Struct("iIII")
+
+def file_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    """(inode, taille, date de modification en ns) d'un fichier, ou None."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+class FileWatcher:
+    """
+    Surveille des fichiers et signale leurs modifications dans un thread.
+    
+    Sous Linux, inotify (appelé via ctypes, sans dépendance) réveille le
+    thread dès qu'un fichier des répertoires surveillés change; ailleurs,
+    ou si inotify n'est pas disponible, les fichiers sont scrutés toutes
+    les interval secondes. Dans les deux cas, un fichier n'est signalé que
+    si son état (inode, taille, date) a changé, et les écritures
+    rapprochées sont regroupées (DELAI_REGROUPEMENT). La scrutation reste
+    active avec inotify: les modifications faites depuis un autre poste
+    sur un lecteur réseau ne produisent pas d'événement inotify.
+    
+    Exemple:
+        watcher = FileWatcher(["data/library.csv"], lambda paths: print(paths))
+        watcher.start()
+        ...
+        watcher.stop()
+    """
+    
+    DELAI_REGROUPEMENT = 0.2
+    INTERVALLE_SCRUTATION = 1.0
+    
+    def __init__(self, paths: Iterable[str], callback: Callable[[List[str]], None],
+                 interval: float = None, use_inotify: bool = True):
+        """
+        Args:
+            paths: Fichiers surveillés (ils peuvent ne pas encore exister)
+            callback: Fonction appelée depuis le thread de surveillance avec
+                      la liste des fichiers modifiés
+            interval: Période de scrutation en secondes
+            use_inotify: Utiliser inotify lorsqu'il est disponible
+        """
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.callback = callback
+        self.interval = self.INTERVALLE_SCRUTATION if interval is None else interval
+        self.use_inotify = use_inotify
+        self.backend = None
+        self._stamps: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._fd = None
+    
+    def start(self) -> None:
+        """Mémorise l'état actuel des fichiers et démarre la surveillance."""
+        self._stamps = {path: file_stamp(path) for path in self.paths}
+        self._fd = self._open_inotify() if self.use_inotify else None
+        self.backend = "inotify" if self._fd is not None else "polling"
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Arrête la surveillance (attend la fin du thread)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
+    def check(self) -> List[str]:
+        """
+        Compare l'état des fichiers au dernier état connu.
+        
+        Returns:
+            Fichiers modifiés depuis le dernier appel
+        """
+        changed = []
+        for path in self.paths:
+            stamp = file_stamp(path)
+            if stamp != self._stamps.get(path):
+                self._stamps[path] = stamp
+                changed.append(path)
+        return changed
+    
+    # ===================
+    # THREAD DE SURVEILLANCE
+    # ===================
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._fd is not None:
+                if self._wait_inotify(self.interval):
+                    # Laisser l'écriture en cours se terminer
+                    self._stop.wait(self.DELAI_REGROUPEMENT)
+                    self._drain_inotify()
+            elif self._stop.wait(self.interval):
+                break
+            
+            changed = self.check()
+            if changed and not self._stop.is_set():
+                try:
+                    self.callback(changed)
+                except Exception as e:
+                    print(f"Erreur lors du traitement d'une modification de fichier: {e}")
+    
+    # ===================
+    # INOTIFY
+    # ===================
+    
+    def _open_inotify(self) -> Optional[int]:
+        """Crée l'instance inotify et surveille les répertoires des fichiers."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        
+        # Les répertoires, et non les fichiers: un fichier remplacé par
+        # renommage (écriture atomique) garderait sinon l'ancien inode
+        watched = 0
+        for directory in {os.path.dirname(path) for path in self.paths}:
+            if libc.inotify_add_watch(fd, os.fsencode(directory), MASQUE) >= 0:
+                watched += 1
+        if not watched:
+            os.close(fd)
+            return None
+        return fd
+    
+    def _wait_inotify(self, timeout: float) -> bool:
+        """Attend un événement inotify concernant un fichier surveillé."""
+        try:
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+        except (OSError, ValueError):
+            return False
+        return bool(ready) and self._drain_inotify()
+    
+    def _drain_inotify(self) -> bool:
+        """
+        Lit les événements en attente.
+        
+        Returns:
+            True si l'un d'eux concerne un fichier surveillé
+        """
+        names = {os.path.basename(path).encode() for path in self.paths}
+        relevant = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return relevant
+            except OSError:
+                return relevant
+            offset = 0
+            while offset + EN_TETE_EVENEMENT.size <= len(data):
+                _, _, _, length = EN_TETE_EVENEMENT.unpack_from(data, offset)
+                start = offset + EN_TETE_EVENEMENT.size
+                name = data[start:start + length].rstrip(b"\0")
+                relevant = relevant or name in names
+                offset = start + length
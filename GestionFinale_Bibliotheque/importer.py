@@ -0,0 +1,428 @@
+
+import csv
+import re
+import sys
+import time
+import unicodedata
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from schema import COLUMNS
+
+TAILLE_BLOC = 50000
+
+# Bornes de validation des livres importés
+ANNEE_MIN = 1450
+QUANTITE_MAX = 10000
+CATEGORIE_DEFAUT = "Non classé"
+
+# Noms de colonnes rencontrés dans les exports d'autres logiciels (comparés
+# sans casse ni accents) -> colonnes du catalogue
+ALIAS_COLONNES = {
+    "Title": ["title", "titre", "book title", "nom"],
+    "Author": ["author", "auteur", "auteurs", "authors", "creator", "ecrivain"],
+    "Year": ["year", "annee", "date", "publication year", "annee de publication", "date de publication"],
+    "Category": ["category", "categorie", "genre", "subject", "sujet", "rayon"],
+    "ISBN": ["isbn", "isbn13", "isbn 13", "isbn10", "ean", "ean13"],
+    "Quantity": ["quantity", "quantite", "qty", "qte", "copies", "exemplaires", "stock"],
+    "ImagePath": ["imagepath", "image", "cover", "couverture", "chemin image"],
+}
+
+# ===================
+# LECTURE PAR BLOCS
+# ===================
+
+def detect_format(path: str, requested: str = "auto") -> str:
+    """
+    Détermine le format d'un fichier d'après son extension.
+    
+    Args:
+        path: Chemin du fichier ("-" pour l'entrée ou la sortie standard)
+        requested: Format demandé ("auto", "csv", "jsonl", "json" ou "marc")
+        
+    Returns:
+        "csv", "jsonl", "json" ou "marc"
+    """
+    if requested != "auto":
+        return requested
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".json":
+        return "json"
+    if suffix in (".mrk", ".marc", ".txt"):
+        return "marc"
+    return "csv"
+
+def read_chunks(path: str, fmt: str = "auto", chunk_size: int = TAILLE_BLOC) -> Iterator[pd.DataFrame]:
+    """
+    Lit un fichier de livres par blocs.
+    
+    Un tableau JSON (format "json") ne peut pas être lu par morceaux: il est
+    chargé entier puis découpé. Préférer JSON lines pour les gros fichiers.
+    
+    Args:
+        path: Chemin du fichier, ou "-" pour l'entrée standard
+        fmt: Format ("auto", "csv", "jsonl", "json" ou "marc")
+        chunk_size: Nombre de lignes par bloc
+        
+    Yields:
+        DataFrames d'au plus chunk_size lignes (texte lu tel quel)
+    """
+    source = sys.stdin if path == "-" else path
+    fmt = detect_format(path, fmt)
+    if fmt == "csv":
+        yield from pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunk_size)
+    elif fmt == "jsonl":
+        yield from pd.read_json(source, lines=True, dtype=False, chunksize=chunk_size)
+    elif fmt == "marc":
+        yield from read_marc_chunks(source, chunk_size)
+    else:
+        df = pd.read_json(source, dtype=False)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+def _subfields(content: str) -> Dict[str, str]:
+    """Sous-champs "$a...$c..." d'un champ MARC texte (premier de chaque code)."""
+    result = {}
+    for part in content.split("$")[1:]:
+        if part:
+            result.setdefault(part[0], part[1:].strip())
+    return result
+
+def _marc_record(fields: Dict[str, List[str]]) -> Dict:
+    """Convertit les champs d'une notice MARC texte en ligne du catalogue."""
+    def first(tags, code):
+        for tag in tags:
+            for content in fields.get(tag, []):
+                value = _subfields(content).get(code)
+                if value:
+                    return value
+        return ""
+    
+    title = first(["245"], "a")
+    subtitle = first(["245"], "b")
+    if subtitle:
+        title = f"{title.rstrip(' :/;')} : {subtitle}"
+    isbn = first(["020"], "a").split(" ")[0]
+    quantity = first(["876", "852"], "t") or first(["876"], "q")
+    return {
+        "Title": title.rstrip(" /:;,."),
+        "Author": first(["100", "110", "700"], "a").rstrip(" ,."),
+        "Year": first(["264", "260"], "c") or first(["008"], "a"),
+        "Category": first(["650", "655"], "a").rstrip(" ."),
+        "ISBN": isbn,
+        "Quantity": quantity,
+    }
+
+def read_marc_chunks(source, chunk_size: int = TAILLE_BLOC) -> Iterator[pd.DataFrame]:
+    """
+    Lit un export MARC au format texte (mnémonique, une ligne "=TAG  ..."
+    par champ, notices séparées par une ligne vide) par blocs de notices.
+    
+    Champs utilisés: 245 $a/$b (titre), 100/110/700 $a (auteur), 264/260 $c
+    (année), 650/655 $a (catégorie), 020 $a (ISBN), 876/852 $t
+    (exemplaires).
+    
+    Args:
+        source: Chemin du fichier ou flux texte
+        chunk_size: Nombre de notices par bloc
+        
+    Yields:
+        DataFrames d'au plus chunk_size notices
+    """
+    handle = open(source, encoding="utf-8") if isinstance(source, (str, Path)) else source
+    try:
+        records = []
+        fields: Dict[str, List[str]] = {}
+        for line in handle:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                if fields:
+                    records.append(_marc_record(fields))
+                    fields = {}
+                    if len(records) >= chunk_size:
+                        yield pd.DataFrame(records)
+                        records = []
+                continue
+            if line.startswith("=") and len(line) >= 4:
+                fields.setdefault(line[1:4], []).append(line[4:].lstrip())
+        if fields:
+            records.append(_marc_record(fields))
+        if records:
+            yield pd.DataFrame(records)
+    finally:
+        if handle is not source:
+            handle.close()
+
+# ===================
+# VALIDATION VECTORIELLE
+# ===================
+
+def _fold(name: str) -> str:
+    """Nom de colonne sans casse, accents ni séparateurs."""
+    name = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[\s_\-]+", " ", name.strip().lower())
+
+def map_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Renomme les colonnes connues (ALIAS_COLONNES) vers celles du catalogue.
+    
+    Args:
+        df: Bloc lu dans le fichier source
+        
+    Returns:
+        Bloc avec les colonnes du catalogue (les autres sont ignorées)
+    """
+    lookup = {alias: column for column, aliases in ALIAS_COLONNES.items() for alias in aliases}
+    renamed = {}
+    for name in df.columns:
+        column = lookup.get(_fold(name))
+        if column is not None and column not in renamed.values():
+            renamed[name] = column
+    return df.rename(columns=renamed).reindex(columns=[c for c in COLUMNS if c != "ID"])
+
+def _digits(values: pd.Series, width: int) -> np.ndarray:
+    """Matrice (n, width) des chiffres de chaînes de longueur width (X => 10)."""
+    codes = np.array(values.tolist(), dtype=f"U{width}").view(np.uint32).reshape(-1, width).astype(np.int64)
+    return np.where(codes == ord("X"), 10, codes - ord("0"))
+
+def normalize_isbn(isbn: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Normalise et vérifie des ISBN.
+    
+    Les séparateurs sont retirés; un ISBN-10 valide est converti en
+    ISBN-13 (préfixe 978), ce qui donne une clé unique pour repérer les
+    doublons quelle que soit la forme d'origine.
+    
+    Args:
+        isbn: ISBN tels que lus
+        
+    Returns:
+        (ISBN-13 normalisés, masque des ISBN valides)
+    """
+    cleaned = isbn.fillna("").astype(str).str.upper().str.replace(r"[^0-9X]", "", regex=True)
+    result = pd.Series("", index=isbn.index, dtype=object)
+    valid = pd.Series(False, index=isbn.index)
+    
+    is13 = cleaned.str.fullmatch(r"97[89]\d{10}")
+    if is13.any():
+        digits = _digits(cleaned[is13], 13)
+        ok = (digits @ np.array([1, 3] * 6 + [1])) % 10 == 0
+        index = cleaned[is13].index
+        valid[index] = ok
+        result[index] = cleaned[is13]
+    
+    is10 = cleaned.str.fullmatch(r"\d{9}[\dX]")
+    if is10.any():
+        digits = _digits(cleaned[is10], 10)
+        ok = (digits @ np.arange(10, 0, -1)) % 11 == 0
+        body = np.hstack([np.tile([9, 7, 8], (len(digits), 1)), digits[:, :9]])
+        check = (10 - (body @ np.array([1, 3] * 6)) % 10) % 10
+        index = cleaned[is10].index
+        valid[index] = ok
+        result[index] = ["978" + s[:9] + str(c) for s, c in zip(cleaned[is10], check)]
+    return result, valid
+
+def validate_chunk(chunk: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Valide et convertit un bloc de livres par opérations vectorielles.
+    
+    - titre et auteur obligatoires (espaces retirés);
+    - année extraite du texte ("c1999.", "1999-05-01"), entre ANNEE_MIN et
+      l'année prochaine;
+    - quantité entière entre 0 et QUANTITE_MAX (1 si absente);
+    - ISBN facultatif; s'il est présent, ISBN-10 ou ISBN-13 à clé de
+      contrôle valide, normalisé en ISBN-13;
+    - catégorie CATEGORIE_DEFAUT si absente.
+    
+    Args:
+        chunk: Bloc aux colonnes du catalogue (voir map_columns)
+        
+    Returns:
+        (livres valides, livres rejetés avec une colonne Motif)
+    """
+    text = {
+        column: chunk[column].fillna("").astype(str).str.strip()
+        for column in ("Title", "Author", "Category", "ImagePath")
+    }
+    year = pd.to_numeric(chunk["Year"].fillna("").astype(str).str.extract(r"(\d{4})")[0], errors="coerce")
+    quantity_text = chunk["Quantity"].fillna("").astype(str).str.strip()
+    quantity = pd.to_numeric(quantity_text.mask(quantity_text == "", "1"), errors="coerce")
+    isbn, isbn_valid = normalize_isbn(chunk["ISBN"])
+    isbn_present = chunk["ISBN"].fillna("").astype(str).str.strip() != ""
+    
+    reasons = pd.Series("", index=chunk.index, dtype=object)
+    checks = [
+        (text["Title"] == "", "titre manquant"),
+        (text["Author"] == "", "auteur manquant"),
+        (~year.between(ANNEE_MIN, date.today().year + 1), "année invalide"),
+        (~quantity.between(0, QUANTITE_MAX) | (quantity % 1 != 0), "quantité invalide"),
+        (isbn_present & (isbn == ""), "ISBN mal formé"),
+        ((isbn != "") & ~isbn_valid, "clé de contrôle ISBN invalide"),
+    ]
+    for mask, reason in checks:
+        mask = mask.fillna(True)
+        reasons[mask & (reasons == "")] = reason
+    ok = reasons == ""
+    
+    valid = pd.DataFrame({
+        "Title": text["Title"][ok],
+        "Author": text["Author"][ok],
+        "Year": year[ok].astype(int),
+        "Category": text["Category"][ok].mask(text["Category"][ok] == "", CATEGORIE_DEFAUT),
+        "ISBN": isbn[ok],
+        "Quantity": quantity[ok].astype(int),
+        "ImagePath": text["ImagePath"][ok],
+    })
+    rejected = chunk[~ok].assign(Motif=reasons[~ok])
+    return valid, rejected
+
+# ===================
+# IMPORT
+# ===================
+
+class BulkImporter:
+    """
+    Import en masse dans le catalogue, en mémoire bornée.
+    
+    Le fichier est lu par blocs de chunk_size lignes; chaque bloc est
+    validé vectoriellement (validate_chunk), ses doublons d'ISBN sont
+    regroupés, puis il est écrit en une transaction: les ISBN déjà connus
+    (catalogue ou blocs précédents) deviennent des ajouts de quantité
+    (update_books), les autres des livres ajoutés (add_books). Les livres
+    sans ISBN ne peuvent pas être rapprochés et sont toujours ajoutés.
+    
+    Seule une table ISBN -> (ID, quantité) est gardée entre les blocs. Elle
+    est construite au démarrage à partir du catalogue: les quantités
+    modifiées par ailleurs pendant l'import ne sont pas relues.
+    
+    Exemple:
+        importer = BulkImporter(db, progress=print)
+        report = importer.run("fournisseur.csv", rejects_path="rejets.csv")
+    """
+    
+    def __init__(self, db, chunk_size: int = TAILLE_BLOC, merge_duplicates: bool = True,
+                 progress: Optional[Callable[[Dict], None]] = None):
+        """
+        Args:
+            db: Base de données (LibraryDatabase ou moteur compatible)
+            chunk_size: Lignes lues et écrites par bloc
+            merge_duplicates: Regrouper les ISBN déjà présents en quantités
+                              (sinon ils sont rejetés)
+            progress: Fonction appelée après chaque bloc avec le rapport courant
+        """
+        self.db = db
+        self.chunk_size = chunk_size
+        self.merge_duplicates = merge_duplicates
+        self.progress = progress
+        self.report = {"lus": 0, "ajoutés": 0, "fusionnés": 0, "rejetés": 0, "durée_s": 0.0}
+        self._known: Optional[Dict[str, Tuple[int, int]]] = None
+        self._rejects_writer = None
+        self._rejects_header = False
+        self._start = None
+    
+    def _load_known_isbns(self) -> Dict[str, Tuple[int, int]]:
+        """Table ISBN normalisé -> (ID, quantité) des livres du catalogue."""
+        known = {}
+        for chunk in self.db.iter_books(self.chunk_size):
+            isbn, valid = normalize_isbn(chunk["ISBN"])
+            keep = valid.to_numpy()
+            ids = chunk["ID"].to_numpy()[keep]
+            quantities = chunk["Quantity"].fillna(0).to_numpy()[keep]
+            for key, book_id, quantity in zip(isbn[keep], ids, quantities):
+                known.setdefault(key, (int(book_id), int(quantity)))
+        return known
+    
+    def run(self, path: str, fmt: str = "auto", rejects_path: Optional[str] = None) -> Dict:
+        """
+        Importe un fichier.
+        
+        Args:
+            path: Fichier source ("-" pour l'entrée standard)
+            fmt: "auto", "csv", "jsonl", "json" ou "marc"
+            rejects_path: Fichier CSV recevant les lignes rejetées et leur motif
+            
+        Returns:
+            Rapport: lignes lues, livres ajoutés, lignes fusionnées dans
+            un livre existant, lignes rejetées, durée
+        """
+        self._start = time.perf_counter()
+        if self._known is None:
+            self._known = self._load_known_isbns()
+        
+        rejects_file = open(rejects_path, "w", encoding="utf-8", newline="") if rejects_path else None
+        try:
+            self._rejects_writer = csv.writer(rejects_file) if rejects_file else None
+            self._rejects_header = False
+            for chunk in read_chunks(path, fmt, self.chunk_size):
+                self.import_chunk(chunk)
+        finally:
+            self._rejects_writer = None
+            if rejects_file is not None:
+                rejects_file.close()
+        return self.report
+    
+    def import_chunk(self, raw: pd.DataFrame) -> None:
+        """Valide, regroupe et écrit un bloc de lignes source."""
+        if self._known is None:
+            self._known = self._load_known_isbns()
+        if self._start is None:
+            self._start = time.perf_counter()
+        raw = raw.reset_index(drop=True)
+        self.report["lus"] += len(raw)
+        
+        valid, rejected = validate_chunk(map_columns(raw))
+        self._reject(raw.loc[rejected.index], rejected["Motif"])
+        
+        # Doublons à l'intérieur du bloc: une seule ligne par ISBN, quantités cumulées
+        without_isbn = valid[valid["ISBN"] == ""]
+        valid = valid[valid["ISBN"] != ""]
+        totals = valid.groupby("ISBN", sort=False)["Quantity"].sum()
+        first = valid.drop_duplicates("ISBN").set_index("ISBN")
+        first["Quantity"] = totals
+        merged_in_chunk = len(valid) - len(first)
+        
+        known = self._known
+        existing = np.fromiter((isbn in known for isbn in first.index), dtype=bool, count=len(first))
+        new_books = first[~existing]
+        updates = {}
+        if self.merge_duplicates:
+            for isbn, quantity in first.loc[existing, "Quantity"].items():
+                book_id, current = known[isbn]
+                updates[book_id] = {"Quantity": current + int(quantity)}
+                known[isbn] = (book_id, current + int(quantity))
+            self.report["fusionnés"] += merged_in_chunk + len(updates)
+        else:
+            duplicates = valid[valid["ISBN"].isin(first.index[existing])]
+            self._reject(raw.loc[duplicates.index], pd.Series("ISBN déjà présent", index=duplicates.index))
+            self.report["fusionnés"] += merged_in_chunk
+        
+        with self.db.transaction():
+            if updates:
+                self.db.update_books(updates)
+            if len(new_books) or len(without_isbn):
+                new_ids = self.db.add_books(pd.concat([new_books.reset_index(), without_isbn], ignore_index=True))
+                quantities = new_books["Quantity"].astype(int).tolist()
+                known.update(zip(new_books.index, zip(new_ids, quantities)))
+        self.report["ajoutés"] += len(new_books) + len(without_isbn)
+        self.report["durée_s"] = round(time.perf_counter() - self._start, 3)
+        if self.progress is not None:
+            self.progress(dict(self.report))
+    
+    def _reject(self, rows: pd.DataFrame, reasons: pd.Series) -> None:
+        """Compte des lignes rejetées et les écrit dans le fichier de rejets."""
+        if len(rows) == 0:
+            return
+        self.report["rejetés"] += len(rows)
+        if self._rejects_writer is None:
+            return
+        if not self._rejects_header:
+            self._rejects_writer.writerow(list(rows.columns) + ["Motif"])
+            self._rejects_header = True
+        for values, reason in zip(rows.itertuples(index=False), reasons):
+            self._rejects_writer.writerow(list(values) + [reason])
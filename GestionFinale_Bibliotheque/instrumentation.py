@@ -0,0 +1,297 @@
+
+import bisect
+import cProfile
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Variables d'environnement activant l'instrumentation sans option de ligne
+# de commande: chemin du fichier de métriques ("1" pour le chemin par
+# défaut) et chemin du profil cProfile
+ENV_METRICS = "BIBLIOTHEQUE_METRICS"
+ENV_PROFILE = "BIBLIOTHEQUE_PROFILE"
+
+DEFAULT_METRICS_PATH = "data/metrics.json"
+
+class Histogram:
+    """
+    Histogramme de durées à classes logarithmiques (millisecondes).
+    
+    Le coût d'un ajout est constant et la taille fixe, quel que soit le
+    nombre de mesures; les percentiles sont estimés par la borne
+    supérieure de leur classe.
+    """
+    
+    BORNES_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BORNES_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def add(self, duration_ms: float) -> None:
+        """Enregistre une durée."""
+        self.counts[bisect.bisect_left(self.BORNES_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+    
+    def percentile(self, q: float) -> float:
+        """Estimation du percentile q (0-100), en millisecondes."""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                bound = self.BORNES_MS[i] if i < len(self.BORNES_MS) else self.max_ms
+                return round(min(bound, self.max_ms), 3)
+        return round(self.max_ms, 3)
+    
+    def to_dict(self) -> Dict:
+        """Représentation JSON de l'histogramme."""
+        labels = [f"<={bound}" for bound in self.BORNES_MS] + [f">{self.BORNES_MS[-1]}"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+class Instrumentation:
+    """
+    Mesures de performance optionnelles d'une session.
+    
+    - instrument() remplace des méthodes d'un objet par des versions
+      chronométrées (sur l'instance: la classe n'est pas modifiée);
+    - watch_event_loop() détecte les blocages de la boucle Tk;
+    - les histogrammes sont écrits périodiquement (thread en arrière-plan)
+      et à la fermeture dans un fichier JSON qui garde les MAX_SESSIONS
+      dernières sessions;
+    - un profil cProfile du thread principal peut être enregistré pour la
+      session.
+      
+    Exemple:
+        instrumentation = Instrumentation.from_environment()
+        if instrumentation:
+            instrumentation.instrument(db, prefix="db.")
+        ...
+        instrumentation.close()
+    """
+    
+    MAX_SESSIONS = 20
+    DELAI_ECRITURE = 10.0
+    
+    def __init__(self, metrics_path: str = DEFAULT_METRICS_PATH, profile_path: Optional[str] = None):
+        """
+        Args:
+            metrics_path: Fichier JSON des histogrammes
+            profile_path: Fichier de profil cProfile (None: pas de profil)
+        """
+        self.metrics_path = metrics_path
+        self.profile_path = profile_path
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.session_id = f"{self.started}-{os.getpid()}"
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        
+        self._profiler = None
+        if profile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        
+        self._thread = threading.Thread(target=self._run, name="metrics", daemon=True)
+        self._thread.start()
+    
+    @classmethod
+    def from_environment(cls, metrics_path: Optional[str] = None,
+                         profile_path: Optional[str] = None) -> Optional["Instrumentation"]:
+        """
+        Crée l'instrumentation si elle est demandée par les arguments ou
+        par les variables d'environnement BIBLIOTHEQUE_METRICS et
+        BIBLIOTHEQUE_PROFILE.
+        
+        Args:
+            metrics_path: Fichier de métriques demandé en ligne de commande
+            profile_path: Fichier de profil demandé en ligne de commande
+            
+        Returns:
+            Instance, ou None si rien n'est demandé
+        """
+        metrics_path = metrics_path or os.environ.get(ENV_METRICS) or None
+        profile_path = profile_path or os.environ.get(ENV_PROFILE) or None
+        if metrics_path in ("1", "true", "yes"):
+            metrics_path = DEFAULT_METRICS_PATH
+        if profile_path in ("1", "true", "yes"):
+            profile_path = default_profile_path()
+        if metrics_path is None and profile_path is None:
+            return None
+        return cls(metrics_path or DEFAULT_METRICS_PATH, profile_path)
+    
+    # ===================
+    # MESURES
+    # ===================
+    
+    def record(self, name: str, duration_ms: float) -> None:
+        """Ajoute une durée à l'histogramme name (tout thread)."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(duration_ms)
+    
+    @contextmanager
+    def timed(self, name: str):
+        """Chronomètre le bloc et l'enregistre sous name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+    
+    def wrap(self, name: str, function):
+        """Retourne une version chronométrée de function."""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+    
+    def instrument(self, obj, names: Optional[Iterable[str]] = None, prefix: str = "") -> List[str]:
+        """
+        Chronomètre des méthodes d'un objet.
+        
+        Les méthodes sont remplacées sur l'instance: les appels internes
+        (self.methode()) sont donc chronométrés eux aussi. Les méthodes
+        doivent être instrumentées avant que des références liées ne
+        soient conservées ailleurs (par exemple command= d'un bouton).
+        
+        Args:
+            obj: Objet instrumenté
+            names: Méthodes à chronométrer (par défaut toutes les méthodes
+                   de la classe, hors méthodes spéciales)
+            prefix: Préfixe des noms de mesures (ex. "db.")
+            
+        Returns:
+            Noms des méthodes instrumentées
+        """
+        if names is None:
+            names = [
+                name for name in dir(type(obj))
+                if not name.startswith("__")
+                and inspect.isfunction(inspect.getattr_static(type(obj), name, None))
+            ]
+        instrumented = []
+        for name in names:
+            method = getattr(obj, name, None)
+            if not callable(method):
+                continue
+            setattr(obj, name, self.wrap(prefix + name, method))
+            instrumented.append(name)
+        return instrumented
+    
+    def watch_event_loop(self, root, interval_ms: int = 50, threshold_ms: int = 100) -> None:
+        """
+        Détecte les blocages de la boucle d'événements Tk.
+        
+        Un rappel est planifié toutes les interval_ms; un retard supérieur
+        à threshold_ms signifie que la boucle n'a pas pu traiter les
+        événements (interface figée) pendant ce temps. Les retards sont
+        enregistrés dans "tk.stall".
+        
+        Args:
+            root: Fenêtre Tk racine
+            interval_ms: Période du rappel
+            threshold_ms: Retard à partir duquel un blocage est compté
+        """
+        def tick(expected):
+            if self._closed.is_set():
+                return
+            now = time.perf_counter()
+            late_ms = (now - expected) * 1000
+            if late_ms > threshold_ms:
+                self.record("tk.stall", late_ms)
+            try:
+                root.after(interval_ms, tick, now + interval_ms / 1000)
+            except Exception:
+                # Fenêtre détruite
+                pass
+        root.after(interval_ms, tick, time.perf_counter() + interval_ms / 1000)
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        """Histogrammes courants (copie JSON)."""
+        with self._lock:
+            return {name: histogram.to_dict() for name, histogram in sorted(self._histograms.items())}
+    
+    # ===================
+    # ÉCRITURE
+    # ===================
+    
+    def flush(self) -> None:
+        """Écrit les histogrammes de la session dans le fichier de métriques."""
+        session = {
+            "id": self.session_id,
+            "started": self.started,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+            "pid": os.getpid(),
+            "metrics": self.snapshot(),
+        }
+        try:
+            with open(self.metrics_path, encoding="utf-8") as f:
+                sessions = json.load(f).get("sessions", [])
+        except (OSError, ValueError):
+            sessions = []
+        sessions = [s for s in sessions if s.get("id") != self.session_id]
+        sessions.append(session)
+        sessions = sessions[-self.MAX_SESSIONS:]
+        
+        try:
+            Path(self.metrics_path).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{self.metrics_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"sessions": sessions}, f, indent=1, ensure_ascii=False)
+            os.replace(tmp_path, self.metrics_path)
+        except OSError as e:
+            print(f"Avertissement: métriques non enregistrées: {e}")
+    
+    def _run(self) -> None:
+        while not self._closed.wait(self.DELAI_ECRITURE):
+            self.flush()
+    
+    def close(self) -> None:
+        """Arrête les mesures, écrit les métriques et le profil éventuel."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._thread.join()
+        self.flush()
+        
+        if self._profiler is not None:
+            self._profiler.disable()
+            try:
+                Path(self.profile_path).parent.mkdir(parents=True, exist_ok=True)
+                self._profiler.dump_stats(self.profile_path)
+                print(f"Profil enregistré dans {self.profile_path}")
+            except OSError as e:
+                print(f"Avertissement: profil non enregistré: {e}")
+
+def default_profile_path() -> str:
+    """Chemin du profil cProfile d'une nouvelle session."""
+    return f"data/profiles/session-{datetime.now():%Y%m%d-%H%M%S}.prof"
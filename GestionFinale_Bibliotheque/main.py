@@ -1,5 +1,5 @@
 
-import tkinter as tk
+import argparse
 import sys
 import os
 from pathlib import Path
@@ -8,13 +8,41 @@ from pathlib import Path
 current_dir = Path(__file__).parent.absolute()
 sys.path.insert(0, str(current_dir))
 
-from app import BibliothequApp
+from database import open_database
+from instrumentation import Instrumentation
 
 def main():
     """
     Fonction principale.
     Initialise et lance l'application.
+    
+    "python main.py catalog ..." lance la ligne de commande de maintenance
+    (catalog.py) sans charger l'interface graphique.
     """
+    if sys.argv[1:2] == ["catalog"]:
+        import catalog
+        sys.exit(catalog.main(sys.argv[2:]))
+    
+    # Interface graphique importée seulement ici: la ligne de commande
+    # fonctionne sans tkinter ni PIL
+    import tkinter as tk
+    from app import BibliothequApp
+    
+    parser = argparse.ArgumentParser(description="Gestion de bibliothèque")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Laisser le catalogue sur disque (seul un index est chargé)")
+    parser.add_argument("--shared", action="store_true",
+                        help="Catalogue partagé entre plusieurs postes (verrou de fichier)")
+    parser.add_argument("--metrics", nargs="?", const="1", metavar="FICHIER",
+                        help="Enregistrer les temps d'exécution (data/metrics.json par défaut)")
+    parser.add_argument("--profile", nargs="?", const="1", metavar="FICHIER",
+                        help="Enregistrer un profil cProfile de la session")
+    args = parser.parse_args()
+    
+    # Mesures de performance (options ou variables BIBLIOTHEQUE_METRICS /
+    # BIBLIOTHEQUE_PROFILE)
+    instrumentation = Instrumentation.from_environment(args.metrics, args.profile)
+    
     # Créer la fenêtre racine
     root = tk.Tk()
     
@@ -27,10 +55,16 @@ def main():
         print(f"Avertissement: Icône non trouvée: {e}")
     
     # Initialiser l'application
-    app = BibliothequApp(root)
+    options = {"shared": True} if args.shared else {}
+    db = open_database(backend="rowstore" if args.low_memory else None, **options)
+    app = BibliothequApp(root, db, instrumentation)
     
     # Lancer la boucle principale
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        if instrumentation is not None:
+            instrumentation.close()
 
 if __name__ == "__main__":
     main()
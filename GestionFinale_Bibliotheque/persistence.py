@@ -0,0 +1,141 @@
+
+import queue
+import threading
+import time
+from typing import Dict, List
+
+class WriteBehindWriter:
+    """
+    Thread d'écriture différée pour LibraryDatabase.
+    
+    Les modifications sont appliquées en mémoire par le thread appelant;
+    leurs opérations de journal sont confiées à ce thread, qui les regroupe
+    pendant DELAI_REGROUPEMENT secondes puis les écrit en une seule fois
+    (et lance la compaction atomique lorsqu'elle est due). Les erreurs
+    d'écriture sont placées dans la file errors, que l'interface lit depuis
+    sa boucle d'événements.
+    
+    Exemple:
+        writer = WriteBehindWriter(db)
+        db.add_book(...)   # retourne sans attendre le disque
+        writer.close()     # écrit ce qui reste puis arrête le thread
+    """
+    
+    DELAI_REGROUPEMENT = 0.2
+    
+    def __init__(self, db, delay: float = None):
+        """
+        Démarre le thread et l'attache à la base (db.writer).
+        
+        Args:
+            db: Base de données (LibraryDatabase ou dérivée)
+            delay: Délai de regroupement en secondes
+        """
+        self.db = db
+        self.delay = self.DELAI_REGROUPEMENT if delay is None else delay
+        self.errors: "queue.Queue[Exception]" = queue.Queue()
+        
+        self._cond = threading.Condition()
+        self._pending: List[Dict] = []
+        self._writing = False
+        self._flush_requested = False
+        self._closed = False
+        self._failures = 0
+        
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        db.writer = self
+    
+    def submit(self, records: List[Dict]) -> None:
+        """Confie des opérations au thread (appelé par LibraryDatabase._persist)."""
+        with self._cond:
+            self._pending.extend(records)
+            self._cond.notify_all()
+    
+    @property
+    def pending(self) -> int:
+        """Nombre d'opérations pas encore écrites."""
+        with self._cond:
+            return len(self._pending) + (1 if self._writing else 0)
+    
+    @property
+    def queued(self) -> int:
+        """Nombre d'opérations confiées que le thread n'a pas encore prises en charge."""
+        with self._cond:
+            return len(self._pending)
+    
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Attend que toutes les opérations confiées soient écrites, ou
+        qu'une écriture échoue.
+        
+        Args:
+            timeout: Attente maximale en secondes (None: illimitée)
+            
+        Returns:
+            True si tout a été écrit
+        """
+        with self._cond:
+            failures = self._failures
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(
+                lambda: (not self._pending and not self._writing) or self._failures > failures,
+                timeout
+            )
+            self._flush_requested = False
+            return not self._pending and not self._writing
+    
+    def close(self, timeout: float = None) -> None:
+        """
+        Écrit les opérations restantes, arrête le thread et le détache de
+        la base (les écritures suivantes redeviennent synchrones).
+        
+        Les opérations que le thread n'a pas pu écrire sont écrites une
+        dernière fois de façon synchrone; une erreur est alors propagée.
+        
+        Args:
+            timeout: Attente maximale en secondes (None: illimitée)
+        """
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if self.db.writer is self:
+            self.db.writer = None
+        
+        with self._cond:
+            records = self._pending
+            self._pending = []
+        if records:
+            self.db._write_records(records)
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if self._closed and not self._pending:
+                    return
+                # Regrouper les opérations qui arrivent pendant le délai
+                self._cond.wait_for(lambda: self._flush_requested or self._closed, self.delay)
+                records = self._pending
+                self._pending = []
+                self._writing = True
+            
+            try:
+                self.db._write_records(records, background=True)
+            except Exception as e:
+                # Remettre les opérations en tête de file pour une nouvelle tentative
+                with self._cond:
+                    self._pending[:0] = records
+                    self._failures += 1
+                    closed = self._closed
+                self.errors.put(e)
+                if closed:
+                    return
+                time.sleep(self.delay)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
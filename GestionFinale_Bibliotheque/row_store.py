@@ -0,0 +1,856 @@
+
+import bisect
+import csv
+import io
+import json
+import mmap
+import os
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aggregates import CatalogStatistics
+from database import LibraryDatabase, exclusive, reduce_journal, synchronized
+from file_watcher import file_stamp
+from schema import (CATEGORY_COLUMNS, COLUMNS, INTEGER_COLUMNS, READ_DTYPES, apply_schema, check_fields,
+                    check_frame, in_range, set_cell)
+from search_index import TrigramIndex
+
+class RowStoreLibraryDatabase(LibraryDatabase):
+    """
+    Catalogue à faible empreinte mémoire: les livres restent dans le CSV.
+    
+    Seul un index ID -> position dans le fichier est gardé en mémoire (deux
+    tableaux compacts triés par ID, 16 octets par livre); les lignes sont
+    lues à la demande dans le fichier projeté en mémoire (mmap). Les
+    modifications sont écrites dans le journal, au même format que
+    LibraryDatabase, et gardées en mémoire comme surcharges jusqu'à la
+    compaction, qui réécrit le CSV en flux. La mémoire occupée ne dépend
+    donc que du seuil de compaction, pas de la taille du catalogue.
+    
+    Les lectures globales (recherche sans index, statistiques, export)
+    parcourent le fichier par blocs de CHUNK_SIZE lignes. L'index de
+    recherche par trigrammes est optionnel (search_index=True), car sa
+    taille est proportionnelle au catalogue.
+    
+    Le mode partagé (shared=True) fonctionne comme pour LibraryDatabase;
+    après une compaction faite par un autre processus, seul l'index des
+    positions est reconstruit. Une modification du CSV par un autre
+    programme entraîne une réindexation complète (événement "reloaded"),
+    le catalogue n'étant pas en mémoire pour en calculer la différence.
+    """
+    
+    CHUNK_SIZE = 50000
+    
+    # Indique à l'interface qu'elle doit afficher les lignes à la demande
+    low_memory = True
+    
+    def __init__(self, csv_path: str = "data/library.csv", compaction_threshold: int = 10000,
+                 search_index: bool = False, shared: bool = False):
+        
+        self.csv_path = csv_path
+        self.journal_path = csv_path + ".journal"
+        self.lock = threading.RLock()
+        self.journal = True
+        self.primary = "csv"
+        self.snapshot = False
+        self.compaction_threshold = compaction_threshold
+        self.use_search_index = search_index
+        self._journal_entries = 0
+        self._transaction_depth = 0
+        self._pending_records = []
+        self._search_index = None
+        self._stats = None
+        self._listeners = []
+        self.writer = None
+        self._storage_stamp = None
+        
+        self._file = None
+        self._mmap = None
+        self._header: List[str] = []
+        self._ids = array("q")
+        self._offsets = array("q")
+        self._overrides: Dict[int, Dict] = {}
+        self._added: Dict[int, Dict] = {}
+        self._deleted = set()
+        # Rang des livres ajoutés et IDs supprimés triés (voir _pending_positions)
+        self._positions: Optional[Tuple[Dict[int, int], List[int]]] = None
+        self._next_id = 1
+        self._init_sharing(shared)
+        
+        # Créer le fichier s'il n'existe pas, puis indexer et rejouer le journal
+        Path(csv_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._file_locked():
+            if not os.path.exists(csv_path):
+                pd.DataFrame(columns=self.COLUMNS).to_csv(csv_path, index=False)
+            self._load_file()
+    
+    def _load_file(self) -> None:
+        """Indexe le fichier et rejoue le journal (modifications en attente effacées)."""
+        self._overrides = {}
+        self._added = {}
+        self._deleted = set()
+        self._positions = None
+        self._storage_stamp = file_stamp(self.csv_path)
+        self._open_file()
+        self._build_offsets()
+        self._replay_journal()
+        last_ids = [self._ids[-1]] if len(self._ids) else []
+        self._next_id = max(last_ids + list(self._added) + [self._next_id - 1]) + 1
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        """Catalogue complet chargé en mémoire (coûteux: réservé à l'export)."""
+        return self.get_all_books()
+    
+    def __len__(self) -> int:
+        """Nombre de livres, ajouts et suppressions en attente compris."""
+        return len(self._ids) - len(self._deleted) + len(self._added)
+    
+    # ===================
+    # FICHIER ET INDEX
+    # ===================
+    
+    def _open_file(self) -> None:
+        """Ouvre le CSV en lecture et le projette en mémoire."""
+        self._close_file()
+        self._file = open(self.csv_path, "rb")
+        if os.fstat(self._file.fileno()).st_size > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def _close_file(self) -> None:
+        """Libère la projection mémoire et le fichier."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def _build_offsets(self) -> None:
+        """
+        Parcourt le fichier une fois pour relever la position de chaque ligne.
+        
+        Un champ entre guillemets peut contenir un retour à la ligne: une
+        ligne physique avec un nombre impair de guillemets ouvre ou ferme
+        un tel champ, et la ligne logique continue jusqu'à sa fermeture.
+        """
+        ids = array("q")
+        offsets = array("q")
+        self._header = []
+        mm = self._mmap
+        if mm is None:
+            self._ids, self._offsets = ids, offsets
+            return
+        
+        mm.seek(0)
+        self._header = next(csv.reader([mm.readline().decode("utf-8-sig")]), [])
+        id_field = self._header.index("ID") if "ID" in self._header else 0
+        
+        in_quotes = False
+        start = 0
+        first = b""
+        while True:
+            offset = mm.tell()
+            line = mm.readline()
+            if not line:
+                break
+            if not in_quotes:
+                start, first = offset, line
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if in_quotes or not line.strip():
+                continue
+            if id_field == 0:
+                token = first.split(b",", 1)[0].strip(b'" \r\n')
+            else:
+                token = self._read_record(start)[id_field]
+                mm.seek(offset + len(line))
+            try:
+                book_id = int(float(token))
+            except ValueError:
+                continue
+            ids.append(book_id)
+            offsets.append(start)
+        
+        # Trier par ID si le fichier ne l'est pas (recherche par dichotomie)
+        if any(ids[i] > ids[i + 1] for i in range(len(ids) - 1)):
+            order = sorted(range(len(ids)), key=ids.__getitem__)
+            ids = array("q", (ids[i] for i in order))
+            offsets = array("q", (offsets[i] for i in order))
+        self._ids, self._offsets = ids, offsets
+    
+    def _raw_record(self, offset: int) -> bytes:
+        """Retourne les octets de la ligne logique commençant à offset."""
+        mm = self._mmap
+        mm.seek(offset)
+        data = mm.readline()
+        while data.count(b'"') % 2:
+            more = mm.readline()
+            if not more:
+                break
+            data += more
+        return data
+    
+    def _read_record(self, offset: int) -> List[str]:
+        """Lit et découpe la ligne logique commençant à offset."""
+        text = self._raw_record(offset).decode("utf-8")
+        return next(csv.reader(io.StringIO(text, newline="")), [])
+    
+    def _locate(self, book_id: int) -> Optional[int]:
+        """Retourne l'indice d'un ID dans l'index du fichier, ou None."""
+        ids = self._ids
+        i = bisect.bisect_left(ids, book_id)
+        if i < len(ids) and ids[i] == book_id:
+            return i
+        return None
+    
+    @staticmethod
+    def _typed_row(raw: Dict[str, str]) -> Dict:
+        """Convertit une ligne lue dans le CSV aux types du schéma."""
+        row = {}
+        for column in COLUMNS:
+            value = raw.get(column)
+            value = "" if value is None else value
+            if column in INTEGER_COLUMNS:
+                try:
+                    row[column] = in_range(column, int(float(value)))
+                except (TypeError, ValueError, OverflowError):
+                    row[column] = pd.NA
+            elif column in CATEGORY_COLUMNS:
+                row[column] = value if value != "" else pd.NA
+            else:
+                row[column] = value
+        return row
+    
+    def _file_row(self, index: int) -> Dict:
+        """Lit la ligne du fichier d'indice index (dans l'ordre des IDs)."""
+        values = self._read_record(self._offsets[index])
+        return self._typed_row(dict(zip(self._header, values)))
+    
+    @staticmethod
+    def _encode_row(row: Dict) -> bytes:
+        """Formate une ligne en CSV, comme DataFrame.to_csv."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(["" if pd.isna(row.get(column)) else row.get(column) for column in COLUMNS])
+        return buffer.getvalue().encode("utf-8")
+    
+    def _iter_frames(self) -> Iterator[pd.DataFrame]:
+        """
+        Parcourt le catalogue par blocs, modifications en attente comprises.
+        
+        Yields:
+            DataFrames d'au plus CHUNK_SIZE lignes, au schéma déclaré
+        """
+        if self._mmap is not None:
+            for chunk in pd.read_csv(self.csv_path, dtype=READ_DTYPES, chunksize=self.CHUNK_SIZE):
+                chunk = apply_schema(chunk)
+                chunk = chunk[chunk["ID"].notna()]
+                if self._deleted:
+                    chunk = chunk[~chunk["ID"].isin(self._deleted)]
+                chunk = chunk.reset_index(drop=True)
+                if self._overrides:
+                    hits = np.flatnonzero(chunk["ID"].isin(self._overrides).to_numpy())
+                    for pos in hits:
+                        row = self._overrides[int(chunk.iat[pos, 0])]
+                        for column in COLUMNS:
+                            set_cell(chunk, pos, column, row[column])
+                if len(chunk):
+                    yield chunk
+        if self._added:
+            yield apply_schema(pd.DataFrame(list(self._added.values()), columns=self.COLUMNS))
+    
+    # ===================
+    # JOURNAL
+    # ===================
+    
+    def _replay_journal(self) -> None:
+        """Charge les opérations du journal comme surcharges du fichier."""
+        records = self._read_journal()
+        self._journal_entries = len(records)
+        if not records:
+            return
+        
+        added, updated, deleted = reduce_journal(records)
+        for book_id in deleted:
+            if self._locate(book_id) is not None:
+                self._deleted.add(book_id)
+        for book_id, fields in updated.items():
+            index = self._locate(book_id)
+            if index is not None and book_id not in self._deleted:
+                self._overrides[book_id] = {**self._file_row(index), **fields}
+        for book_id, row in added.items():
+            self._added[book_id] = self._typed_row({column: row.get(column, "") for column in COLUMNS})
+    
+    def _compaction_due(self) -> bool:
+        # Seuil fixe: il borne la mémoire occupée par les surcharges
+        return self._journal_entries >= self.compaction_threshold
+    
+    @exclusive
+    def save(self) -> None:
+        """
+        Réécrit le CSV en flux avec les modifications en attente, puis vide
+        le journal.
+        
+        Les lignes non modifiées sont recopiées octet pour octet; le
+        nouvel index des positions est calculé pendant l'écriture. Un CSV
+        modifié par un autre programme est d'abord réindexé.
+        """
+        self._merge_storage()
+        tmp_path = self.csv_path + ".tmp"
+        raw_copy = self._header == self.COLUMNS
+        ids = array("q")
+        offsets = array("q")
+        try:
+            with open(tmp_path, "wb") as out:
+                out.write((",".join(self.COLUMNS) + "\n").encode("utf-8"))
+                for index, book_id in enumerate(self._ids):
+                    if book_id in self._deleted:
+                        continue
+                    ids.append(book_id)
+                    offsets.append(out.tell())
+                    row = self._overrides.get(book_id)
+                    if row is None and raw_copy:
+                        data = self._raw_record(self._offsets[index])
+                        out.write(data if data.endswith(b"\n") else data + b"\n")
+                    else:
+                        out.write(self._encode_row(row or self._file_row(index)))
+                for book_id in sorted(self._added):
+                    ids.append(book_id)
+                    offsets.append(out.tell())
+                    out.write(self._encode_row(self._added[book_id]))
+            
+            # La projection doit être libérée avant de remplacer le fichier
+            self._close_file()
+            os.replace(tmp_path, self.csv_path)
+            self._storage_stamp = file_stamp(self.csv_path)
+            self._truncate_journal()
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde: {e}")
+            raise
+        finally:
+            if self._file is None:
+                self._open_file()
+        
+        self._overrides = {}
+        self._added = {}
+        self._deleted = set()
+        self._positions = None
+        if all(ids[i] < ids[i + 1] for i in range(len(ids) - 1)):
+            self._header = list(self.COLUMNS)
+            self._ids, self._offsets = ids, offsets
+        else:
+            self._build_offsets()
+    
+    def background_save(self) -> None:
+        # La réécriture lit le fichier projeté en mémoire: elle reste sous
+        # verrou. Voir LibraryDatabase.background_save pour le report
+        with self.lock:
+            self._merge_storage(background=True)
+            if self._storage_modified():
+                return
+            self.save()
+    
+    # ===================
+    # MODE PARTAGÉ
+    # ===================
+    
+    def _merge_records(self, records: List[Dict]) -> bool:
+        """Applique des opérations d'un autre processus comme surcharges du fichier."""
+        added, updated, deleted = reduce_journal(records)
+        added_ids = [int(r["row"]["ID"]) for r in records if r.get("op") == "add"]
+        if added_ids:
+            self._next_id = max(self._next_id, max(added_ids) + 1)
+        
+        removed_rows = [self._remove(book_id) for book_id in deleted if self.has_book(book_id)]
+        if removed_rows:
+            self._after_delete(removed_rows)
+        
+        old_rows, new_rows = [], []
+        for book_id, fields in updated.items():
+            if self.has_book(book_id):
+                fields = {column: in_range(column, value) for column, value in fields.items()}
+                old_rows.append(self._set_fields(book_id, fields))
+                new_rows.append(self.get_book_by_id(book_id))
+        if old_rows:
+            self._after_update(old_rows, new_rows)
+        
+        rows = [self._typed_row({column: row.get(column, "") for column in COLUMNS}) for row in added.values()]
+        for row in rows:
+            self._added[row["ID"]] = row
+        if rows:
+            self._positions = None
+            self._after_add(rows)
+        return bool(removed_rows or old_rows or rows)
+    
+    def _after_compaction(self) -> None:
+        # Le CSV réécrit contient les surcharges: seul l'index est à refaire
+        self._overrides = {}
+        self._added = {}
+        self._deleted = set()
+        self._positions = None
+        self._storage_stamp = file_stamp(self.csv_path)
+        self._open_file()
+        self._build_offsets()
+    
+    def _reload(self) -> None:
+        self._load_file()
+        self._reset_derived()
+    
+    def apply_external_changes(self) -> bool:
+        """
+        Intègre les modifications faites hors de cette instance: journal
+        des autres processus, puis CSV modifié par un autre programme
+        (réindexé entièrement, voir _merge_storage).
+        
+        Returns:
+            True si le catalogue a changé
+        """
+        if self.writer is not None:
+            self.writer.flush()
+        changed = self.refresh()
+        with self.lock, self._exclusive():
+            return self._merge_storage() or changed
+    
+    def _merge_storage(self, fresh: Optional[pd.DataFrame] = None, stamp=None,
+                       background: bool = False) -> bool:
+        # Pas de différence ligne à ligne (elle chargerait tout le
+        # catalogue): le CSV modifié est réindexé et le journal rejoué
+        if not self._storage_modified() or self._unjournaled(background) > 0:
+            return False
+        self._reload()
+        return True
+    
+    @synchronized
+    def save_to_csv(self, csv_path: Optional[str] = None) -> None:
+        """
+        Sans argument, équivaut à compact(); sinon exporte le catalogue
+        dans csv_path, bloc par bloc.
+        
+        Args:
+            csv_path: Fichier de destination (optionnel)
+        """
+        if csv_path is None or os.path.abspath(csv_path) == os.path.abspath(self.csv_path):
+            self.save()
+            return
+        
+        tmp_path = csv_path + ".tmp"
+        header = True
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            for chunk in self._iter_frames():
+                chunk.to_csv(f, index=False, header=header)
+                header = False
+            if header:
+                pd.DataFrame(columns=self.COLUMNS).to_csv(f, index=False)
+        os.replace(tmp_path, csv_path)
+    
+    @synchronized
+    def close(self) -> None:
+        """Compacte le journal s'il contient des opérations, puis ferme le fichier."""
+        super().close()
+        self._close_file()
+    
+    # ===================
+    # STRUCTURES DÉRIVÉES
+    # ===================
+    
+    def _snapshot(self):
+        return dict(self._overrides), dict(self._added), set(self._deleted)
+    
+    def _restore(self, snapshot) -> None:
+        self._overrides, self._added, self._deleted = snapshot
+        self._positions = None
+    
+    def _get_stats(self) -> CatalogStatistics:
+        """Calcule les agrégats en un parcours par blocs, à la première utilisation."""
+        if self._stats is None:
+            stats = CatalogStatistics()
+            for chunk in self._iter_frames():
+                stats.add_frame(chunk)
+            self._stats = stats
+        return self._stats
+    
+    def _get_search_index(self) -> TrigramIndex:
+        """Construit l'index de recherche par blocs, à la première utilisation."""
+        if self._search_index is None:
+            index = TrigramIndex()
+            for chunk in self._iter_frames():
+                index.add_frame(chunk)
+            self._search_index = index
+        return self._search_index
+    
+    @synchronized
+    def memory_report(self) -> Dict[str, int]:
+        """
+        Retourne la mémoire occupée par l'index et les modifications en attente.
+        
+        Returns:
+            Dictionnaire {structure: octets} avec une entrée "total"
+        """
+        report = {
+            "index": self._ids.itemsize * len(self._ids) + self._offsets.itemsize * len(self._offsets),
+            "overrides": len(json.dumps([self._overrides, self._added], default=str)),
+        }
+        report["total"] = sum(report.values())
+        return report
+    
+    # ===================
+    # LECTURES
+    # ===================
+    
+    @synchronized
+    def get_position(self, book_id: int) -> Optional[int]:
+        """
+        Retourne la position d'un livre dans get_book_ids(), ou None.
+        
+        Args:
+            book_id: ID du livre
+            
+        Returns:
+            Position ou None si l'ID est inconnu
+        """
+        try:
+            book_id = int(book_id)
+        except (TypeError, ValueError):
+            return None
+        added_ranks, deleted = self._pending_positions()
+        rank = added_ranks.get(book_id)
+        if rank is not None:
+            return len(self) - len(self._added) + rank
+        index = self._locate(book_id)
+        if index is None or book_id in self._deleted:
+            return None
+        return index - bisect.bisect_left(deleted, book_id)
+    
+    def _pending_positions(self) -> Tuple[Dict[int, int], List[int]]:
+        """
+        Retourne le rang de chaque livre ajouté et les IDs supprimés triés.
+        
+        Calculés à la première lecture après une modification des ajouts
+        ou des suppressions: get_position coûte ensuite O(log n) au lieu
+        d'un parcours des modifications en attente à chaque appel.
+        """
+        if self._positions is None:
+            self._positions = (
+                {book_id: rank for rank, book_id in enumerate(self._added)},
+                sorted(self._deleted),
+            )
+        return self._positions
+    
+    @synchronized
+    def has_book(self, book_id: int) -> bool:
+        """Indique si un livre existe (recherche par dichotomie dans l'index)."""
+        try:
+            book_id = int(book_id)
+        except (TypeError, ValueError):
+            return False
+        if book_id in self._added:
+            return True
+        return book_id not in self._deleted and self._locate(book_id) is not None
+    
+    @synchronized
+    def get_book_by_id(self, book_id: int) -> Optional[Dict]:
+        """
+        Récupère un livre par son ID en lisant sa seule ligne dans le fichier.
+        
+        Args:
+            book_id: ID du livre
+            
+        Returns:
+            Dictionnaire avec les données du livre ou None
+        """
+        if not self.has_book(book_id):
+            return None
+        book_id = int(book_id)
+        row = self._added.get(book_id) or self._overrides.get(book_id)
+        if row is not None:
+            return dict(row)
+        return self._file_row(self._locate(book_id))
+    
+    def iter_books(self, chunk_size: int = None) -> Iterator[pd.DataFrame]:
+        """
+        Parcourt le catalogue par blocs lus dans le fichier.
+        
+        Args:
+            chunk_size: Ignoré: les blocs font au plus CHUNK_SIZE livres
+            
+        Yields:
+            DataFrames au schéma déclaré
+        """
+        return self._iter_frames()
+    
+    @synchronized
+    def get_books_by_ids(self, book_ids: List[int]) -> List[Dict]:
+        """
+        Récupère plusieurs livres (par exemple la fenêtre visible du tableau).
+        
+        Args:
+            book_ids: IDs des livres
+            
+        Returns:
+            Lignes trouvées, dans l'ordre des IDs fournis
+        """
+        books = (self.get_book_by_id(book_id) for book_id in book_ids)
+        return [book for book in books if book is not None]
+    
+    @synchronized
+    def get_book_ids(self) -> array:
+        """
+        Retourne les IDs de tous les livres, dans l'ordre d'affichage.
+        
+        Returns:
+            Tableau compact d'IDs (8 octets par livre)
+        """
+        if self._deleted:
+            ids = array("q", (book_id for book_id in self._ids if book_id not in self._deleted))
+        else:
+            ids = array("q", self._ids)
+        ids.extend(self._added)
+        return ids
+    
+    @synchronized
+    def get_all_books(self) -> pd.DataFrame:
+        """
+        Retourne tous les livres dans un DataFrame.
+        
+        Le catalogue entier est chargé en mémoire: à réserver à l'export.
+        
+        Returns:
+            DataFrame avec tous les livres
+        """
+        frames = list(self._iter_frames())
+        if not frames:
+            return apply_schema(pd.DataFrame(columns=self.COLUMNS))
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    
+    @synchronized
+    def search_book_ids(self, query: str) -> List[int]:
+        """
+        Recherche les IDs des livres par titre, auteur, catégorie ou ISBN.
+        
+        Args:
+            query: Texte de recherche
+            
+        Returns:
+            IDs correspondants, dans l'ordre d'affichage
+        """
+        query = query.lower()
+        if not query:
+            return list(self.get_book_ids())
+        
+        if self.use_search_index:
+            book_ids = self._get_search_index().search(query)
+            if book_ids is not None:
+                return sorted(book_ids, key=self.get_position)
+        
+        # Parcours du fichier par blocs
+        found = []
+        for chunk in self._iter_frames():
+            mask = np.zeros(len(chunk), dtype=bool)
+            for field in TrigramIndex.FIELDS:
+                mask |= chunk[field].astype("string").str.lower().str.contains(
+                    query, regex=False).fillna(False).to_numpy(dtype=bool)
+            found.extend(chunk.loc[mask, "ID"].astype(int).tolist())
+        return found
+    
+    @synchronized
+    def search_books(self, query: str) -> pd.DataFrame:
+        """
+        Recherche des livres par titre, auteur, catégorie ou ISBN.
+        
+        Args:
+            query: Texte de recherche
+            
+        Returns:
+            DataFrame avec les livres correspondants
+        """
+        if not query:
+            return self.get_all_books()
+        rows = self.get_books_by_ids(self.search_book_ids(query))
+        return apply_schema(pd.DataFrame(rows, columns=self.COLUMNS))
+    
+    @synchronized
+    def search_page(self, query: str, offset: int = 0, limit: int = 50):
+        """
+        Recherche paginée: seules les lignes de la page sont lues.
+        
+        Returns:
+            (nombre total de résultats, DataFrame de la page)
+        """
+        book_ids = self.search_book_ids(query)
+        rows = self.get_books_by_ids(list(book_ids[offset:offset + limit]))
+        return len(book_ids), apply_schema(pd.DataFrame(rows, columns=self.COLUMNS))
+    
+    # ===================
+    # MODIFICATIONS
+    # ===================
+    
+    def _set_fields(self, book_id: int, fields: Dict) -> Dict:
+        """
+        Applique des champs modifiés à un livre existant.
+        
+        Returns:
+            Ligne avant modification
+        """
+        old_row = self.get_book_by_id(book_id)
+        new_row = {**old_row, **fields}
+        if book_id in self._added:
+            self._added[book_id] = new_row
+        else:
+            self._overrides[book_id] = new_row
+        return old_row
+    
+    def _remove(self, book_id: int) -> Dict:
+        """
+        Supprime un livre existant.
+        
+        Returns:
+            Ligne supprimée
+        """
+        old_row = self.get_book_by_id(book_id)
+        if self._added.pop(book_id, None) is None:
+            self._overrides.pop(book_id, None)
+            self._deleted.add(book_id)
+        self._positions = None
+        return old_row
+    
+    @exclusive
+    def add_book(self, titre: str, auteur: str, année: int,
+                 catégorie: str, isbn: str, quantité: int,
+                 chemin_image: str = "") -> int:
+        """
+        Ajoute un livre (écrit dans le journal, intégré au CSV à la compaction).
+        
+        Returns:
+            ID attribué
+        """
+        # Année inconnue (None) => valeur manquante
+        year = None if année is None else int(année)
+        check_fields({"Year": year, "Quantity": int(quantité)})
+        new_id = self._next_id
+        self._next_id += 1
+        new_row = {
+            "ID": new_id,
+            "Title": titre,
+            "Author": auteur,
+            "Year": year,
+            "Category": catégorie,
+            "ISBN": isbn,
+            "Quantity": int(quantité),
+            "ImagePath": chemin_image
+        }
+        self._added[new_id] = new_row
+        self._positions = None
+        self._after_add([new_row])
+        self._persist([{"op": "add", "row": new_row}])
+        return new_id
+    
+    @exclusive
+    def update_book(self, book_id: int, titre: str = None, auteur: str = None,
+                    année: int = None, catégorie: str = None, isbn: str = None,
+                    quantité: int = None, chemin_image: str = None) -> bool:
+        """
+        Met à jour les informations d'un livre.
+        
+        Returns:
+            True si la mise à jour a réussi, False sinon
+        """
+        if not self.has_book(book_id):
+            return False
+        book_id = int(book_id)
+        fields = self._book_fields(titre, auteur, année, catégorie, isbn, quantité, chemin_image)
+        old_row = self._set_fields(book_id, fields)
+        self._after_update([old_row], [self.get_book_by_id(book_id)])
+        self._persist([{"op": "update", "id": book_id, "fields": fields}])
+        return True
+    
+    @exclusive
+    def delete_book(self, book_id: int) -> bool:
+        """
+        Supprime un livre.
+        
+        Returns:
+            True si la suppression a réussi, False sinon
+        """
+        if not self.has_book(book_id):
+            return False
+        book_id = int(book_id)
+        self._after_delete([self._remove(book_id)])
+        self._persist([{"op": "delete", "id": book_id}])
+        return True
+    
+    @exclusive
+    def add_books(self, books) -> List[int]:
+        """
+        Ajoute plusieurs livres en une seule opération.
+        
+        Returns:
+            Liste des IDs attribués, dans l'ordre des livres fournis
+        """
+        new_rows = pd.DataFrame(books)
+        if new_rows.empty:
+            return []
+        check_frame(new_rows)
+        
+        start_id = self._next_id
+        self._next_id += len(new_rows)
+        new_rows = new_rows.reindex(columns=self.COLUMNS)
+        new_rows["ID"] = range(start_id, start_id + len(new_rows))
+        rows = json.loads(apply_schema(new_rows).to_json(orient="records", force_ascii=False))
+        
+        with self.transaction():
+            for row in rows:
+                self._added[row["ID"]] = row
+            self._positions = None
+            self._after_add(rows)
+            self._persist([{"op": "add", "row": row} for row in rows])
+        return [row["ID"] for row in rows]
+    
+    @exclusive
+    def update_books(self, updates: Dict[int, Dict]) -> int:
+        """
+        Met à jour plusieurs livres en une seule opération.
+        
+        Returns:
+            Nombre de livres mis à jour
+        """
+        found = {int(book_id): dict(fields) for book_id, fields in updates.items() if self.has_book(book_id)}
+        if not found:
+            return 0
+        for fields in found.values():
+            for column in ("Year", "Quantity"):
+                if column in fields:
+                    fields[column] = int(fields[column])
+            check_fields(fields)
+        
+        with self.transaction():
+            old_rows = []
+            records = []
+            for book_id, fields in found.items():
+                old_rows.append(self._set_fields(book_id, fields))
+                records.append({"op": "update", "id": book_id, "fields": fields})
+            self._after_update(old_rows, self.get_books_by_ids(list(found)))
+            self._persist(records)
+        return len(found)
+    
+    @exclusive
+    def delete_books(self, book_ids: List[int]) -> int:
+        """
+        Supprime plusieurs livres en une seule opération.
+        
+        Returns:
+            Nombre de livres supprimés
+        """
+        found = [int(book_id) for book_id in dict.fromkeys(book_ids) if self.has_book(book_id)]
+        if not found:
+            return 0
+        
+        with self.transaction():
+            self._after_delete([self._remove(book_id) for book_id in found])
+            self._persist([{"op": "delete", "id": book_id} for book_id in found])
+        return len(found)
@@ -0,0 +1,185 @@
+
+from typing import Dict, Iterable
+
+import pandas as pd
+
+# Colonnes du catalogue, dans l'ordre du fichier CSV
+COLUMNS = ["ID", "Title", "Author", "Year", "Category", "ISBN", "Quantity", "ImagePath"]
+
+# Types déclarés: entiers nullables compacts, "category" pour les colonnes
+# très répétées (auteurs, catégories) et "string" pour le texte libre
+SCHEMA = {
+    "ID": "Int32",
+    "Title": "string",
+    "Author": "category",
+    "Year": "Int16",
+    "Category": "category",
+    "ISBN": "string",
+    "Quantity": "Int32",
+    "ImagePath": "string",
+}
+
+INTEGER_COLUMNS = [column for column, dtype in SCHEMA.items() if dtype.startswith("Int")]
+CATEGORY_COLUMNS = [column for column, dtype in SCHEMA.items() if dtype == "category"]
+TEXT_COLUMNS = [column for column, dtype in SCHEMA.items() if dtype == "string"]
+
+# Plages acceptées pour les colonnes entières (bornes comprises): une
+# valeur hors plage ne tient pas dans le type déclaré ("Int16" pour
+# l'année) ou vient d'une faute de frappe ("20255")
+PLAGES = {
+    "ID": (0, 2**31 - 1),
+    "Year": (0, 9999),
+    "Quantity": (0, 2**31 - 1),
+}
+
+# Types passés à pd.read_csv: le texte est lu tel quel (un ISBN vide ou
+# numérique ne devient pas un float), les entiers sont convertis ensuite
+READ_DTYPES = {column: SCHEMA[column] for column in TEXT_COLUMNS + CATEGORY_COLUMNS}
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convertit un DataFrame vers le schéma déclaré.
+    
+    Args:
+        df: DataFrame avec tout ou partie des colonnes du catalogue
+        
+    Returns:
+        Nouveau DataFrame avec exactement les colonnes COLUMNS typées
+    """
+    df = df.reindex(columns=COLUMNS)
+    converted = {}
+    for column in COLUMNS:
+        series = df[column]
+        dtype = SCHEMA[column]
+        if column in INTEGER_COLUMNS:
+            if series.dtype != dtype:
+                series = pd.to_numeric(series, errors="coerce").round()
+            series = _drop_out_of_range(column, series).astype(dtype)
+        elif column in TEXT_COLUMNS:
+            if series.dtype != dtype:
+                series = series.astype(dtype)
+            series = series.fillna("")
+        elif not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype("string").astype("category")
+        converted[column] = series
+    return pd.DataFrame(converted, index=df.index)
+
+def _drop_out_of_range(column: str, series: pd.Series) -> pd.Series:
+    """Remplace par NA, avec un avertissement, les valeurs lues hors de PLAGES."""
+    low, high = PLAGES[column]
+    outside = series.notna() & ~series.between(low, high)
+    if not outside.any():
+        return series
+    print(f"Attention: {int(outside.sum())} valeur(s) de {column} hors de [{low}, {high}] "
+          f"remplacée(s) par une valeur manquante")
+    return series.mask(outside)
+
+def check_fields(fields: Dict) -> Dict:
+    """
+    Vérifie les valeurs entières à écrire (avant leur journalisation).
+    
+    Args:
+        fields: {colonne: valeur}
+        
+    Returns:
+        fields, inchangé
+        
+    Raises:
+        ValueError: Si une valeur est hors de la plage de sa colonne
+    """
+    for column, value in fields.items():
+        if column in PLAGES and value is not None and not pd.isna(value):
+            low, high = PLAGES[column]
+            if not low <= value <= high:
+                raise ValueError(f"{column} doit être compris entre {low} et {high} (reçu: {value})")
+    return fields
+
+def check_frame(df: pd.DataFrame) -> None:
+    """
+    Vérifie les colonnes entières d'un lot de livres à écrire.
+    
+    Raises:
+        ValueError: Si une valeur est hors de la plage de sa colonne
+    """
+    for column, (low, high) in PLAGES.items():
+        if column in df.columns:
+            values = pd.to_numeric(df[column], errors="coerce")
+            outside = values.notna() & ~values.between(low, high)
+            if outside.any():
+                check_fields({column: values[outside].iloc[0]})
+
+def in_range(column: str, value):
+    """Valeur lue (journal, autre processus): NA, avec un avertissement, si hors plage."""
+    try:
+        check_fields({column: value})
+    except ValueError as e:
+        print(f"Attention: {e}, remplacé par une valeur manquante")
+        return pd.NA
+    return value
+
+def ensure_categories(df: pd.DataFrame, column: str, values: Iterable) -> None:
+    """
+    Ajoute aux catégories d'une colonne "category" les valeurs inconnues,
+    pour qu'elles puissent y être affectées.
+    
+    Args:
+        df: DataFrame modifié en place
+        column: Nom de la colonne
+        values: Valeurs qui vont être écrites
+    """
+    if column not in CATEGORY_COLUMNS or not isinstance(df[column].dtype, pd.CategoricalDtype):
+        return
+    categories = df[column].cat.categories
+    missing = pd.Index([value for value in set(values) if not pd.isna(value)]).difference(categories)
+    if len(missing):
+        df[column] = df[column].cat.add_categories(missing)
+
+def set_cell(df: pd.DataFrame, position: int, column: str, value) -> None:
+    """
+    Affecte une valeur à une cellule en respectant le type de la colonne.
+    
+    Args:
+        df: DataFrame modifié en place
+        position: Position de la ligne
+        column: Nom de la colonne
+        value: Nouvelle valeur
+    """
+    value = in_range(column, value)
+    ensure_categories(df, column, [value])
+    df.iat[position, df.columns.get_loc(column)] = value
+
+def append_rows(df: pd.DataFrame, new_rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Concatène des lignes à la fin du catalogue sans perdre les types
+    (les colonnes "category" reçoivent l'union des catégories).
+    
+    Args:
+        df: DataFrame du catalogue (au schéma déclaré)
+        new_rows: Lignes à ajouter
+        
+    Returns:
+        Nouveau DataFrame avec un index 0..n-1
+    """
+    new_rows = apply_schema(new_rows)
+    if len(df) == 0:
+        return new_rows.reset_index(drop=True)
+    
+    for column in CATEGORY_COLUMNS:
+        ensure_categories(df, column, new_rows[column].cat.categories)
+        new_rows[column] = new_rows[column].cat.set_categories(df[column].cat.categories)
+    return pd.concat([df, new_rows], ignore_index=True)
+
+def memory_report(df: pd.DataFrame) -> Dict[str, int]:
+    """
+    Mesure la mémoire occupée par chaque colonne.
+    
+    Args:
+        df: DataFrame à mesurer
+        
+    Returns:
+        Dictionnaire {colonne: octets} avec une entrée "total"
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    report = {column: int(usage[column]) for column in df.columns}
+    report["total"] = int(usage.sum())
+    return report
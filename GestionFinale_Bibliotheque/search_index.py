@@ -0,0 +1,162 @@
+
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+class TrigramIndex:
+    """
+    Index inversé de trigrammes pour la recherche de sous-chaînes.
+    
+    Chaque livre est représenté par le texte en minuscules de ses champs
+    recherchables (séparés par un caractère nul, pour qu'aucun trigramme
+    ne chevauche deux champs). Une requête est résolue à partir de la
+    liste de livres de son trigramme le plus rare, puis vérifiée par
+    comparaison exacte de sous-chaîne.
+    
+    Les suppressions sont paresseuses: le livre est retiré du texte de
+    référence mais reste dans les listes de trigrammes jusqu'à la
+    prochaine reconstruction (voir needs_rebuild). Une modification
+    n'ajoute que les trigrammes dont le livre est absent; ceux qui ont
+    disparu du texte restent de même en place (et sont retenus dans
+    _extra) jusqu'à la reconstruction.
+    """
+    
+    FIELDS = ("Title", "Author", "Category", "ISBN")
+    GRAM = 3
+    SEPARATOR = "\x00"
+    
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = {}
+        self._docs: Dict[int, str] = {}
+        # Trigrammes obsolètes dont les livres modifiés sont encore listés
+        self._extra: Dict[int, Set[str]] = {}
+        # Entrées des listes de trigrammes: total et obsolètes
+        self._entries = 0
+        self._stale = 0
+    
+    def __len__(self) -> int:
+        return len(self._docs)
+    
+    @classmethod
+    def _text(cls, row: Dict) -> str:
+        """Construit le texte indexé d'un livre."""
+        return cls.SEPARATOR.join(
+            "" if pd.isna(row.get(field)) else str(row.get(field)).lower()
+            for field in cls.FIELDS
+        )
+    
+    @classmethod
+    def _grams(cls, text: str) -> Set[str]:
+        """Retourne l'ensemble des trigrammes d'un texte."""
+        return {text[i:i + cls.GRAM] for i in range(len(text) - cls.GRAM + 1)}
+    
+    def _insert(self, book_id: int, text: str) -> None:
+        """Ajoute un texte déjà normalisé à l'index."""
+        self._docs[book_id] = text
+        self._post(book_id, self._grams(text))
+    
+    def _post(self, book_id: int, grams: Set[str]) -> None:
+        """Ajoute un livre aux listes des trigrammes donnés."""
+        postings = self._postings
+        self._entries += len(grams)
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = [book_id]
+            else:
+                posting.append(book_id)
+    
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "TrigramIndex":
+        """
+        Construit l'index à partir du DataFrame du catalogue.
+        
+        Args:
+            df: DataFrame avec les colonnes ID et FIELDS
+            
+        Returns:
+            Index construit
+        """
+        index = cls()
+        index.add_frame(df)
+        return index
+    
+    def add_frame(self, df: pd.DataFrame) -> None:
+        """
+        Indexe un bloc de livres (construction de l'index par blocs).
+        
+        Args:
+            df: DataFrame avec les colonnes ID et FIELDS
+        """
+        # Colonnes "string" ou "category": conversion en chaînes sans NA
+        texts = {field: df[field].astype("string").fillna("").str.lower() for field in self.FIELDS}
+        joined = texts[self.FIELDS[0]]
+        for field in self.FIELDS[1:]:
+            joined = joined + self.SEPARATOR + texts[field]
+        for book_id, text in zip(df["ID"].astype(int).tolist(), joined.tolist()):
+            self._insert(book_id, text)
+    
+    def add(self, book_id: int, row: Dict) -> None:
+        """Indexe un nouveau livre."""
+        self._insert(int(book_id), self._text(row))
+    
+    def update(self, book_id: int, row: Dict) -> None:
+        """Réindexe un livre modifié (row contient la ligne complète)."""
+        book_id = int(book_id)
+        text = self._text(row)
+        old_text = self._docs.get(book_id)
+        if old_text == text:
+            return
+        if old_text is None:
+            self._insert(book_id, text)
+            return
+        # Le livre figure déjà dans les listes de ses anciens trigrammes
+        posted = self._grams(old_text) | self._extra.get(book_id, set())
+        grams = self._grams(text)
+        self._docs[book_id] = text
+        self._post(book_id, grams - posted)
+        extra = posted - grams
+        self._stale += len(extra) - len(self._extra.pop(book_id, ()))
+        if extra:
+            self._extra[book_id] = extra
+    
+    def remove(self, book_id: int) -> None:
+        """Retire un livre de l'index."""
+        text = self._docs.pop(int(book_id), None)
+        if text is not None:
+            self._stale += len(self._grams(text)) + len(self._extra.pop(int(book_id), ()))
+    
+    @property
+    def needs_rebuild(self) -> bool:
+        """Vrai lorsque les entrées obsolètes dépassent les entrées valides."""
+        return self._stale > max(4096, self._entries - self._stale)
+    
+    def search(self, query: str) -> Optional[Set[int]]:
+        """
+        Recherche les livres dont un champ contient la requête.
+        
+        Args:
+            query: Texte recherché (au moins GRAM caractères)
+            
+        Returns:
+            Ensemble des IDs correspondants, ou None si la requête est trop
+            courte pour utiliser l'index
+        """
+        query = query.lower()
+        if len(query) < self.GRAM:
+            return None
+        
+        postings = []
+        for gram in self._grams(query):
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        
+        # Partir de la liste la plus courte et vérifier chaque candidat
+        candidates: Iterable[int] = min(postings, key=len)
+        docs = self._docs
+        return {
+            book_id for book_id in set(candidates)
+            if query in docs.get(book_id, "")
+        }
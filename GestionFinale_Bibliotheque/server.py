@@ -0,0 +1,552 @@
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+# Ajouter le répertoire courant au chemin Python
+current_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(current_dir))
+
+from database import open_database
+from schema import COLUMNS, INTEGER_COLUMNS, check_fields
+
+RAISONS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 408: "Request Timeout", 413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+class HttpError(Exception):
+    """Erreur renvoyée au client avec un statut HTTP."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def _json_default(value):
+    """Types numpy/pandas -> types JSON."""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+def _clean_row(row: Dict) -> Dict:
+    """Ligne du catalogue prête à sérialiser (valeurs manquantes -> None)."""
+    return {key: (None if value is pd.NA or value is None or value != value else value)
+            for key, value in row.items()}
+
+class CatalogServer:
+    """
+    Service HTTP/JSON local sur le catalogue, pour plusieurs postes clients.
+    
+    Un seul processus ouvre le catalogue. Les connexions sont traitées par
+    la boucle asyncio (HTTP/1.1, connexions persistantes). Les lectures
+    s'exécutent en parallèle dans un pool de threads; les écritures passent
+    par une file consommée par une seule tâche d'écriture, qui les applique
+    une à une dans leur ordre d'arrivée. Les pages de recherche sont gardées
+    en cache jusqu'à la prochaine modification du catalogue.
+    
+    Routes:
+        GET    /books?q=texte&offset=0&limit=50   recherche paginée
+        GET    /books/{id}                        un livre
+        POST   /books                             ajout (JSON)
+        PUT    /books/{id}  (ou PATCH)            modification (JSON partiel)
+        DELETE /books/{id}                        suppression
+        GET    /stats                             statistiques
+        GET    /categories                        distribution par catégorie
+        GET    /health                            état du service
+    """
+    
+    LIMITE_DEFAUT = 50
+    LIMITE_MAX = 500
+    TAILLE_CORPS_MAX = 1024 * 1024
+    TAILLE_LIGNE_MAX = 8 * 1024
+    EN_TETES_MAX = 100
+    DELAI_INACTIVITE = 15.0
+    PAGES_EN_CACHE = 256
+    
+    def __init__(self, db, host: str = "127.0.0.1", port: int = 8765, read_workers: int = 4):
+        """
+        Args:
+            db: Base de données (LibraryDatabase ou moteur compatible)
+            host: Adresse d'écoute (locale par défaut)
+            port: Port d'écoute (0: port libre choisi par le système)
+            read_workers: Threads de lecture
+        """
+        self.db = db
+        self.host = host
+        self.port = port
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="lecture")
+        self._writer_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ecriture")
+        self._writes: Optional[asyncio.Queue] = None
+        self._writer_task = None
+        self._server = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.requests_served = 0
+        
+        # Cache des pages de recherche, vidé à chaque modification; la
+        # génération évite d'y ranger une page calculée avant la modification
+        self._pages: "OrderedDict[Tuple[str, int, int], Dict]" = OrderedDict()
+        self._pages_lock = threading.Lock()
+        self._generation = 0
+        db.add_listener(self._on_change)
+    
+    # ===================
+    # CYCLE DE VIE
+    # ===================
+    
+    async def start(self) -> None:
+        """Ouvre le port d'écoute et démarre la tâche d'écriture."""
+        self._writes = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=self.TAILLE_LIGNE_MAX)
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self) -> None:
+        """Démarre le service et le garde actif jusqu'à son annulation."""
+        await self.start()
+        print(f"Catalogue servi sur http://{self.host}:{self.port}")
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.stop()
+    
+    async def stop(self) -> None:
+        """Ferme le port, termine les écritures en attente et les pools."""
+        if self._server is not None:
+            self._server.close()
+            # Les connexions persistantes restantes sont fermées côté serveur:
+            # leurs tâches se terminent normalement au lieu d'être annulées
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._writer_task is not None:
+            await self._writes.join()
+            self._writer_task.cancel()
+            self._writer_task = None
+        self._readers.shutdown(wait=True)
+        self._writer_thread.shutdown(wait=True)
+        self.db.remove_listener(self._on_change)
+    
+    # ===================
+    # LECTURES ET ÉCRITURES
+    # ===================
+    
+    async def _read(self, function, *args):
+        """Exécute une lecture dans le pool de lecture."""
+        return await asyncio.get_running_loop().run_in_executor(self._readers, function, *args)
+    
+    async def _write(self, function, *args):
+        """Confie une écriture à la tâche d'écriture et attend son résultat."""
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((function, args, future))
+        return await future
+    
+    async def _writer_loop(self) -> None:
+        """Applique les écritures une à une, dans l'ordre d'arrivée."""
+        loop = asyncio.get_running_loop()
+        while True:
+            function, args, future = await self._writes.get()
+            try:
+                result = await loop.run_in_executor(self._writer_thread, function, *args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._writes.task_done()
+    
+    # ===================
+    # HTTP
+    # ===================
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Traite les requêtes d'une connexion tant qu'elle reste ouverte."""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.DELAI_INACTIVITE)
+                except asyncio.TimeoutError:
+                    break
+                except HttpError as e:
+                    await self._send(writer, e.status, {"erreur": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                
+                method, target, version, headers, body = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                try:
+                    status, payload = await self._dispatch(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {"erreur": str(e)}
+                except Exception as e:
+                    status, payload = 500, {"erreur": f"{type(e).__name__}: {e}"}
+                self.requests_served += 1
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            # Erreur imprévue hors d'une route: réponse 500 si la connexion
+            # le permet encore, puis fermeture
+            try:
+                await self._send(writer, 500, {"erreur": f"{type(e).__name__}: {e}"}, keep_alive=False)
+            except Exception:
+                pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """
+        Lit une requête HTTP/1.x.
+        
+        Returns:
+            (méthode, cible, version, en-têtes, corps), ou None si le client
+            a fermé la connexion
+        """
+        line = await self._read_line(reader)
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "Ligne de requête invalide")
+        
+        headers = {}
+        while True:
+            line = await self._read_line(reader)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= self.EN_TETES_MAX:
+                raise HttpError(400, "Trop d'en-têtes")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        length = headers.get("content-length", "").strip() or "0"
+        if not (length.isascii() and length.isdigit()):
+            raise HttpError(400, "Content-Length invalide")
+        length = int(length)
+        if length > self.TAILLE_CORPS_MAX:
+            raise HttpError(413, "Corps de requête trop volumineux")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, version.upper(), headers, body
+    
+    async def _read_line(self, reader: asyncio.StreamReader) -> bytes:
+        """Lit une ligne de la requête, d'au plus TAILLE_LIGNE_MAX octets."""
+        try:
+            return await reader.readline()
+        except ValueError:
+            # Limite du StreamReader dépassée (voir start)
+            raise HttpError(400, "Ligne de requête ou en-tête trop long")
+    
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool) -> None:
+        """Écrit une réponse JSON."""
+        body = b"" if status == 204 else json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {RAISONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+    
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        """Appelle la route correspondant à la requête."""
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        
+        if parts in (["health"], ["stats"], ["categories"]):
+            if method != "GET":
+                raise HttpError(405, "Méthode non autorisée")
+            if parts == ["health"]:
+                return 200, {"statut": "ok", "requêtes": self.requests_served}
+            if parts == ["stats"]:
+                return 200, await self._read(self.db.get_statistics)
+            return 200, await self._read(self.db.get_category_distribution)
+        
+        if parts == ["books"]:
+            if method == "GET":
+                return 200, await self._read(self._search_page, query)
+            if method == "POST":
+                fields = self._parse_book(body, required=True)
+                book_id = await self._write(self._add_book, fields)
+                return 201, {"ID": book_id}
+            raise HttpError(405, "Méthode non autorisée")
+        
+        if len(parts) == 2 and parts[0] == "books":
+            try:
+                book_id = int(parts[1])
+            except ValueError:
+                raise HttpError(404, "Livre introuvable")
+            if method == "GET":
+                book = await self._read(self.db.get_book_by_id, book_id)
+                if book is None:
+                    raise HttpError(404, "Livre introuvable")
+                return 200, _clean_row(book)
+            if method in ("PUT", "PATCH"):
+                fields = self._parse_book(body, required=False)
+                if fields:
+                    await self._write(self.db.update_books, {book_id: fields})
+                book = await self._read(self.db.get_book_by_id, book_id)
+                if book is None:
+                    raise HttpError(404, "Livre introuvable")
+                return 200, _clean_row(book)
+            if method == "DELETE":
+                if not await self._write(self.db.delete_book, book_id):
+                    raise HttpError(404, "Livre introuvable")
+                return 204, None
+            raise HttpError(405, "Méthode non autorisée")
+        
+        raise HttpError(404, "Route inconnue")
+    
+    # ===================
+    # OPÉRATIONS
+    # ===================
+    
+    def _search_page(self, query: Dict[str, str]) -> Dict:
+        """
+        Recherche paginée (exécutée dans le pool de lecture).
+        
+        Args:
+            query: Paramètres q, offset et limit
+            
+        Returns:
+            {"total", "offset", "limit", "items"}
+        """
+        try:
+            offset = max(0, int(query.get("offset", 0)))
+            limit = min(self.LIMITE_MAX, max(1, int(query.get("limit", self.LIMITE_DEFAUT))))
+        except ValueError:
+            raise HttpError(400, "offset et limit doivent être des entiers")
+        key = (query.get("q", ""), offset, limit)
+        
+        with self._pages_lock:
+            result = self._pages.get(key)
+            if result is not None:
+                self._pages.move_to_end(key)
+                return result
+            generation = self._generation
+        
+        # Seule la page est copiée, pas l'ensemble des résultats
+        total, page = self.db.search_page(key[0], offset, limit)
+        items = json.loads(page.to_json(orient="records", force_ascii=False))
+        result = {"total": total, "offset": offset, "limit": limit, "items": items}
+        
+        with self._pages_lock:
+            if generation == self._generation:
+                self._pages[key] = result
+                if len(self._pages) > self.PAGES_EN_CACHE:
+                    self._pages.popitem(last=False)
+        return result
+    
+    def _on_change(self, event: str, book_ids: List[int]) -> None:
+        """Vide le cache des pages après une modification du catalogue."""
+        with self._pages_lock:
+            self._generation += 1
+            self._pages.clear()
+    
+    @staticmethod
+    def _parse_book(body: bytes, required: bool) -> Dict:
+        """
+        Valide le corps JSON d'un ajout ou d'une modification.
+        
+        Args:
+            body: Corps de la requête
+            required: Exiger titre et auteur (ajout)
+            
+        Returns:
+            Champs {colonne: valeur}
+        """
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "JSON invalide")
+        if not isinstance(data, dict):
+            raise HttpError(400, "Un objet JSON est attendu")
+        
+        fields = {}
+        for column, value in data.items():
+            if column == "ID":
+                continue
+            if column not in COLUMNS:
+                raise HttpError(400, f"Champ inconnu: {column}")
+            if column in INTEGER_COLUMNS:
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    raise HttpError(400, f"{column} doit être un entier")
+            elif value is not None and not isinstance(value, str):
+                value = str(value)
+            fields[column] = value
+        if required and not all(fields.get(column) for column in ("Title", "Author")):
+            raise HttpError(400, "Title et Author sont obligatoires")
+        try:
+            return check_fields(fields)
+        except ValueError as e:
+            raise HttpError(400, str(e))
+    
+    def _add_book(self, fields: Dict) -> int:
+        """Ajoute un livre (exécuté par la tâche d'écriture)."""
+        return self.db.add_book(
+            fields["Title"], fields["Author"], fields.get("Year"),
+            fields.get("Category") or "", fields.get("ISBN") or "",
+            fields.get("Quantity") if fields.get("Quantity") is not None else 1,
+            fields.get("ImagePath") or ""
+        )
+
+# ===================
+# TEST DE CHARGE
+# ===================
+
+async def _client(host: str, port: int, requests: List[Tuple[str, str, Optional[Dict]]],
+                  latencies: List[float], errors: List[str]) -> None:
+    """Client à connexion persistante qui envoie ses requêtes l'une après l'autre."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for method, path, payload in requests:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+            start = time.perf_counter()
+            writer.write(
+                f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n"
+                f"Content-Type: application/json\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            if length:
+                await reader.readexactly(length)
+            latencies.append((time.perf_counter() - start) * 1000)
+            status = int(status_line.split()[1])
+            if status >= 500:
+                errors.append(f"{method} {path}: {status}")
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+async def load_test(host: str, port: int, clients: int = 20, requests_per_client: int = 200,
+                    write_ratio: float = 0.1) -> Dict:
+    """
+    Test de charge: clients simultanés à connexions persistantes mêlant
+    recherches paginées, lectures par ID, statistiques et écritures.
+    
+    Args:
+        host: Adresse du service
+        port: Port du service
+        clients: Nombre de connexions simultanées
+        requests_per_client: Requêtes par connexion
+        write_ratio: Proportion d'écritures (ajout puis modification)
+        
+    Returns:
+        Débit (requêtes/s), latences p50/p90/p99/max (ms) et erreurs
+    """
+    import random
+    rng = random.Random(0)
+    queries = ["", "nuit", "martin", "roman", "tome", "garden", "978"]
+    plans = []
+    for _ in range(clients):
+        plan = []
+        for _ in range(requests_per_client):
+            draw = rng.random()
+            if draw < write_ratio / 2:
+                plan.append(("POST", "/books", {"Title": "Test de charge", "Author": "Client",
+                                                "Year": 2024, "Category": "Test", "ISBN": "", "Quantity": 1}))
+            elif draw < write_ratio:
+                plan.append(("PATCH", f"/books/{rng.randint(1, 1000)}", {"Quantity": rng.randint(1, 9)}))
+            elif draw < 0.5:
+                plan.append(("GET", f"/books?q={rng.choice(queries)}&offset={rng.randint(0, 5) * 50}&limit=50", None))
+            elif draw < 0.9:
+                plan.append(("GET", f"/books/{rng.randint(1, 1000)}", None))
+            else:
+                plan.append(("GET", "/stats", None))
+        plans.append(plan)
+    
+    latencies: List[float] = []
+    errors: List[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, plan, latencies, errors) for plan in plans))
+    duration = time.perf_counter() - start
+    
+    latencies.sort()
+    def pct(q):
+        return round(latencies[min(len(latencies) - 1, int(q / 100 * len(latencies)))], 3)
+    return {
+        "requêtes": len(latencies),
+        "durée_s": round(duration, 3),
+        "requêtes_par_s": round(len(latencies) / duration, 1),
+        "p50_ms": pct(50), "p90_ms": pct(90), "p99_ms": pct(99), "max_ms": round(latencies[-1], 3),
+        "erreurs": errors[:10],
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Lance le service, ou un test de charge contre un service."""
+    parser = argparse.ArgumentParser(description="Service HTTP/JSON du catalogue")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    p = subparsers.add_parser("serve", help="Servir le catalogue")
+    p.add_argument("--db", default="data/library.csv", help="Fichier du catalogue")
+    p.add_argument("--backend", choices=["csv", "sqlite", "rowstore"])
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--read-workers", type=int, default=4)
+    p.add_argument("--shared", action="store_true",
+                   help="Catalogue ouvert en même temps par d'autres postes (verrou de fichier)")
+    
+    p = subparsers.add_parser("loadtest", help="Test de charge d'un service")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--clients", type=int, default=20)
+    p.add_argument("--requests", type=int, default=200, help="Requêtes par client")
+    p.add_argument("--write-ratio", type=float, default=0.1)
+    args = parser.parse_args(argv)
+    
+    if args.command == "loadtest":
+        report = asyncio.run(load_test(args.host, args.port, args.clients, args.requests, args.write_ratio))
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 1 if report["erreurs"] else 0
+    
+    options = {"shared": True} if args.shared else {}
+    db = open_database(args.db, backend=args.backend, **options)
+    server = CatalogServer(db, args.host, args.port, args.read_workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+
+import importlib.util
+import os
+
+import pandas as pd
+
+from file_watcher import file_stamp
+from schema import apply_schema
+
+# Métadonnée de l'instantané: état (inode, taille, date en ns) du CSV écrit
+# avec lui. Une date seule ne suffit pas: sur un système de fichiers à
+# dates grossières, un CSV modifié juste après l'instantané a la même
+# date que lui
+SOURCE_ATTR = "source_csv"
+
+def snapshot_available() -> bool:
+    """Indique si un moteur Parquet (pyarrow ou fastparquet) est installé."""
+    return any(importlib.util.find_spec(engine) is not None for engine in ("pyarrow", "fastparquet"))
+
+def snapshot_path_for(csv_path: str) -> str:
+    """Chemin de l'instantané Parquet associé à un fichier CSV."""
+    root, _ = os.path.splitext(csv_path)
+    return root + ".parquet"
+
+def is_fresh(snapshot_path: str, csv_path: str) -> bool:
+    """
+    Indique si l'instantané peut remplacer la lecture du CSV.
+    
+    Args:
+        snapshot_path: Chemin de l'instantané
+        csv_path: Chemin du CSV
+        
+    Returns:
+        True si l'instantané existe et que le CSV est exactement dans
+        l'état enregistré à son écriture (un CSV modifié à la main est
+        donc toujours relu)
+    """
+    if not os.path.exists(snapshot_path):
+        return False
+    stamp = file_stamp(csv_path)
+    if stamp is None:
+        return True
+    try:
+        source = pd.read_parquet(snapshot_path, columns=[]).attrs.get(SOURCE_ATTR)
+    except Exception:
+        return False
+    return source is not None and tuple(source) == stamp
+
+def read_snapshot(path: str) -> pd.DataFrame:
+    """
+    Lit un instantané Parquet et lui applique le schéma déclaré.
+    
+    Args:
+        path: Chemin de l'instantané
+        
+    Returns:
+        DataFrame du catalogue
+    """
+    return apply_schema(pd.read_parquet(path))
+
+def write_snapshot(df: pd.DataFrame, path: str, csv_path: str = None) -> None:
+    """
+    Écrit un instantané Parquet de façon atomique (fichier temporaire
+    renommé ensuite).
+    
+    Args:
+        df: DataFrame du catalogue
+        path: Chemin de l'instantané
+        csv_path: CSV venant d'être écrit avec le même contenu (optionnel);
+                  son état est enregistré pour is_fresh
+    """
+    stamp = file_stamp(csv_path) if csv_path else None
+    df = df.copy(deep=False)
+    df.attrs = {SOURCE_ATTR: list(stamp) if stamp else None}
+    tmp_path = path + ".tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
@@ -0,0 +1,460 @@
+
+import sqlite3
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Dict, Optional
+
+import pandas as pd
+
+def _unicode_lower(value):
+    """Fonction SQL unicode_lower: minuscules Unicode (NULL inchangé)."""
+    return value.lower() if isinstance(value, str) else value
+
+class SQLiteLibraryDatabase:
+    """
+    Stockage du catalogue dans une base SQLite.
+    
+    Expose les mêmes méthodes publiques que LibraryDatabase mais s'appuie
+    sur des index (ID, ISBN, Author, Category) au lieu de parcourir un
+    DataFrame complet, et n'écrit que les lignes modifiées.
+    """
+    
+    COLUMNS = ["ID", "Title", "Author", "Year", "Category", "ISBN", "Quantity", "ImagePath"]
+    
+    # Condition de recherche (?1: texte recherché en minuscules). LIKE
+    # n'ignore la casse que pour l'ASCII: les champs passent par
+    # unicode_lower (str.lower, comme le moteur pandas) pour que "É"
+    # trouve "é"
+    _SEARCH_WHERE = ("(instr(unicode_lower(Title), ?1) OR instr(unicode_lower(Author), ?1) "
+                     "OR instr(unicode_lower(Category), ?1) OR instr(unicode_lower(ISBN), ?1))")
+    
+    _TABLE_SQL = """
+            CREATE TABLE IF NOT EXISTS {name} (
+                ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                Title TEXT NOT NULL,
+                Author TEXT NOT NULL,
+                Year INTEGER,
+                Category TEXT,
+                ISBN TEXT,
+                Quantity INTEGER,
+                ImagePath TEXT DEFAULT ''
+            )
+            """
+    
+    def __init__(self, db_path: str = "data/library.db", csv_source: Optional[str] = None):
+        """
+        Ouvre (ou crée) la base SQLite.
+        
+        Args:
+            db_path: Chemin du fichier SQLite
+            csv_source: CSV à importer si la base est vide
+                        (par défaut, le .csv de même nom à côté de la base)
+        """
+        self.db_path = db_path
+        self.csv_source = csv_source or str(Path(db_path).with_suffix(".csv"))
+        
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self._listeners = []
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.create_function("unicode_lower", 1, _unicode_lower, deterministic=True)
+        self._create_schema()
+        self._migrate_from_csv()
+        self._data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _create_schema(self) -> None:
+        """
+        Crée la table, les index et active le mode WAL.
+        
+        Les IDs sont en AUTOINCREMENT: comme avec le CSV, l'ID d'un livre
+        supprimé n'est jamais réattribué. Une table créée sans (anciennes
+        versions) est recopiée dans une table qui l'utilise.
+        """
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(self._TABLE_SQL.format(name="books"))
+        self._migrate_autoincrement()
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_books_isbn ON books(ISBN)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_books_author ON books(Author)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_books_category ON books(Category)")
+    
+    def _migrate_autoincrement(self) -> None:
+        """Recrée la table books avec AUTOINCREMENT si elle a été créée sans."""
+        sql = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'books'"
+        ).fetchone()[0]
+        if "AUTOINCREMENT" in sql.upper():
+            return
+        with self.transaction():
+            self.conn.execute(self._TABLE_SQL.format(name="books_autoincrement"))
+            self.conn.execute("INSERT INTO books_autoincrement SELECT * FROM books")
+            self.conn.execute("DROP TABLE books")
+            self.conn.execute("ALTER TABLE books_autoincrement RENAME TO books")
+    
+    def _migrate_from_csv(self) -> None:
+        """Importe le CSV existant (journal compris) lors de la première ouverture."""
+        count = self.conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+        if count > 0 or not os.path.exists(self.csv_source):
+            return
+        
+        from database import LibraryDatabase
+        
+        df = LibraryDatabase(self.csv_source).get_all_books()
+        if df.empty:
+            return
+        
+        print(f"Migration de {len(df)} livres depuis {self.csv_source}")
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO books VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._row_values(row) for row in df.to_dict("records"))
+            )
+    
+    @staticmethod
+    def _row_values(row: Dict) -> tuple:
+        """Convertit une ligne (dictionnaire) en tuple SQL, NaN devenant vide."""
+        def clean(value, default=""):
+            return default if pd.isna(value) else value
+        
+        return (
+            int(row["ID"]),
+            str(clean(row["Title"])),
+            str(clean(row["Author"])),
+            int(clean(row["Year"], 0)),
+            str(clean(row["Category"])),
+            str(clean(row.get("ISBN"))),
+            int(clean(row["Quantity"], 0)),
+            str(clean(row.get("ImagePath")))
+        )
+    
+    def _query_df(self, sql: str, params=()) -> pd.DataFrame:
+        """Exécute une requête et retourne le résultat sous forme de DataFrame."""
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return pd.DataFrame([tuple(row) for row in rows], columns=self.COLUMNS)
+    
+    # ===================
+    # ÉVÉNEMENTS
+    # ===================
+    
+    def add_listener(self, callback: Callable[[str, List[int]], None]) -> None:
+        """Abonne une fonction (type, ids) aux modifications, comme LibraryDatabase."""
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str, List[int]], None]) -> None:
+        """Désabonne une fonction ajoutée par add_listener."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _emit(self, kind: str, book_ids: List[int]) -> None:
+        """Notifie les abonnés d'une modification."""
+        for callback in list(self._listeners):
+            try:
+                callback(kind, book_ids)
+            except Exception as e:
+                print(f"Erreur dans un abonné aux modifications: {e}")
+    
+    # ===================
+    # MODIFICATIONS EXTERNES
+    # ===================
+    
+    def watched_paths(self) -> List[str]:
+        """Fichiers à surveiller: la base et son WAL, où écrivent les autres connexions."""
+        return [self.db_path, self.db_path + "-wal"]
+    
+    def apply_external_changes(self) -> bool:
+        """
+        Signale les modifications faites par une autre connexion.
+        
+        Les requêtes lisent toujours la base à jour: il suffit de comparer
+        PRAGMA data_version (qui change à chaque écriture d'une autre
+        connexion) et de notifier les abonnés par "reloaded", SQLite
+        n'indiquant pas quelles lignes ont changé.
+        
+        Returns:
+            True si la base a été modifiée
+        """
+        with self._lock:
+            version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return False
+            self._data_version = version
+        self._emit("reloaded", [])
+        return True
+    
+    # ===================
+    # TRANSACTIONS
+    # ===================
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Regroupe plusieurs modifications dans une seule transaction SQLite.
+        Annule tout en cas d'exception.
+        """
+        with self._lock:
+            if self._transaction_depth > 0:
+                self._transaction_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._transaction_depth -= 1
+                return
+            
+            self.conn.execute("BEGIN")
+            self._transaction_depth = 1
+            try:
+                yield self
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+            finally:
+                self._transaction_depth = 0
+    
+    def save_to_csv(self, csv_path: Optional[str] = None) -> None:
+        """
+        Exporte la base au format CSV.
+        
+        Args:
+            csv_path: Fichier de destination (par défaut csv_source)
+        """
+        self.get_all_books().to_csv(csv_path or self.csv_source, index=False, encoding='utf-8')
+    
+    def compact(self) -> None:
+        """Intègre le WAL dans le fichier principal."""
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    
+    def close(self) -> None:
+        """Ferme la connexion."""
+        with self._lock:
+            self.compact()
+            self.conn.close()
+    
+    # ===================
+    # CRUD
+    # ===================
+    
+    def add_book(self, titre: str, auteur: str, année: int,
+                 catégorie: str, isbn: str, quantité: int,
+                 chemin_image: str = "") -> int:
+        """
+        Ajoute un livre et retourne son ID.
+        """
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO books (Title, Author, Year, Category, ISBN, Quantity, ImagePath) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (titre, auteur, None if année is None else int(année), catégorie, isbn, int(quantité), chemin_image)
+            )
+            new_id = int(cursor.lastrowid)
+        self._emit("inserted", [new_id])
+        return new_id
+    
+    def add_books(self, books) -> List[int]:
+        """
+        Ajoute plusieurs livres dans une seule transaction.
+        
+        Args:
+            books: Liste de dictionnaires ou DataFrame (colonnes du CSV)
+            
+        Returns:
+            Liste des IDs attribués
+        """
+        rows = pd.DataFrame(books).reindex(columns=self.COLUMNS).to_dict("records")
+        ids = []
+        with self.transaction():
+            for row in rows:
+                values = self._row_values({**row, "ID": 0})[1:]
+                cursor = self.conn.execute(
+                    "INSERT INTO books (Title, Author, Year, Category, ISBN, Quantity, ImagePath) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    values
+                )
+                ids.append(int(cursor.lastrowid))
+        self._emit("inserted", ids)
+        return ids
+    
+    def get_all_books(self) -> pd.DataFrame:
+        """
+        Retourne tous les livres de la base de données.
+        """
+        return self._query_df("SELECT * FROM books ORDER BY ID")
+    
+    def iter_books(self, chunk_size: int = 50000) -> Iterator[pd.DataFrame]:
+        """
+        Parcourt le catalogue par blocs (curseur lu avec fetchmany).
+        """
+        with self._lock:
+            cursor = self.conn.execute("SELECT * FROM books ORDER BY ID")
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield pd.DataFrame([tuple(row) for row in rows], columns=self.COLUMNS)
+    
+    def get_book_by_id(self, book_id: int) -> Optional[Dict]:
+        """
+        Récupère un livre par son ID (recherche par clé primaire).
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM books WHERE ID = ?", (int(book_id),)).fetchone()
+        return dict(row) if row is not None else None
+    
+    def has_book(self, book_id: int) -> bool:
+        """
+        Indique si un livre existe (recherche par clé primaire).
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM books WHERE ID = ?", (int(book_id),)).fetchone()
+        return row is not None
+    
+    def search_books(self, query: str) -> pd.DataFrame:
+        """
+        Recherche des livres par titre, auteur, catégorie ou ISBN.
+        """
+        return self._query_df("SELECT * FROM books WHERE " + self._SEARCH_WHERE + " ORDER BY ID",
+                              (query.lower(),))
+    
+    def search_page(self, query: str, offset: int = 0, limit: int = 50):
+        """
+        Recherche paginée (LIMIT/OFFSET): seules les lignes de la page sont lues.
+        
+        Returns:
+            (nombre total de résultats, DataFrame de la page)
+        """
+        pattern = query.lower()
+        with self._lock:
+            total = self.conn.execute("SELECT COUNT(*) FROM books WHERE " + self._SEARCH_WHERE,
+                                      (pattern,)).fetchone()[0]
+        page = self._query_df("SELECT * FROM books WHERE " + self._SEARCH_WHERE + " ORDER BY ID LIMIT ?2 OFFSET ?3",
+                              (pattern, limit, offset))
+        return total, page
+    
+    def update_book(self, book_id: int, titre: str = None, auteur: str = None,
+                    année: int = None, catégorie: str = None, isbn: str = None,
+                    quantité: int = None, chemin_image: str = None) -> bool:
+        """
+        Met à jour les champs fournis d'un livre.
+        
+        Returns:
+            True si la mise à jour a réussi, False sinon
+        """
+        fields = {}
+        if titre is not None:
+            fields["Title"] = titre
+        if auteur is not None:
+            fields["Author"] = auteur
+        if année is not None:
+            fields["Year"] = int(année)
+        if catégorie is not None:
+            fields["Category"] = catégorie
+        if isbn is not None:
+            fields["ISBN"] = isbn
+        if quantité is not None:
+            fields["Quantity"] = int(quantité)
+        if chemin_image is not None:
+            fields["ImagePath"] = chemin_image
+        
+        if not fields:
+            return self.get_book_by_id(book_id) is not None
+        return self.update_books({book_id: fields}) == 1
+    
+    def update_books(self, updates: Dict[int, Dict]) -> int:
+        """
+        Met à jour plusieurs livres dans une seule transaction.
+        
+        Args:
+            updates: Dictionnaire {ID: {colonne: nouvelle valeur}}
+            
+        Returns:
+            Nombre de livres mis à jour
+        """
+        updated_ids = []
+        with self.transaction():
+            for book_id, fields in updates.items():
+                fields = dict(fields)
+                for column in ("Year", "Quantity"):
+                    if column in fields:
+                        fields[column] = int(fields[column])
+                columns = [column for column in fields if column in self.COLUMNS and column != "ID"]
+                if not columns:
+                    continue
+                assignments = ", ".join(f"{column} = ?" for column in columns)
+                cursor = self.conn.execute(
+                    f"UPDATE books SET {assignments} WHERE ID = ?",
+                    [fields[column] for column in columns] + [int(book_id)]
+                )
+                if cursor.rowcount:
+                    updated_ids.append(int(book_id))
+        if updated_ids:
+            self._emit("updated", updated_ids)
+        return len(updated_ids)
+    
+    def delete_book(self, book_id: int) -> bool:
+        """
+        Supprime un livre de la base de données.
+        """
+        return self.delete_books([book_id]) == 1
+    
+    def delete_books(self, book_ids: List[int]) -> int:
+        """
+        Supprime plusieurs livres dans une seule transaction.
+        """
+        deleted_ids = []
+        with self.transaction():
+            for book_id in book_ids:
+                cursor = self.conn.execute("DELETE FROM books WHERE ID = ?", (int(book_id),))
+                if cursor.rowcount:
+                    deleted_ids.append(int(book_id))
+        if deleted_ids:
+            self._emit("deleted", deleted_ids)
+        return len(deleted_ids)
+    
+    # ===================
+    # STATISTIQUES
+    # ===================
+    
+    def get_statistics(self) -> Dict:
+        """
+        Calcule les statistiques de la bibliothèque en SQL.
+        """
+        with self._lock:
+            total, quantity, categories = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(Quantity), 0), COUNT(DISTINCT Category) FROM books"
+            ).fetchone()
+            author = self.conn.execute(
+                "SELECT Author FROM books GROUP BY Author ORDER BY COUNT(*) DESC, Author LIMIT 1"
+            ).fetchone()
+        
+        return {
+            "total_livres": int(total),
+            "quantité_totale": int(quantity),
+            "catégories_uniques": int(categories),
+            "auteur_frequent": author[0] if author else "N/A"
+        }
+    
+    def get_categories(self) -> List[str]:
+        """
+        Retourne la liste des catégories uniques (via l'index sur Category).
+        """
+        with self._lock:
+            rows = self.conn.execute("SELECT DISTINCT Category FROM books ORDER BY Category").fetchall()
+        return [row[0] for row in rows]
+    
+    def get_category_distribution(self) -> Dict[str, int]:
+        """
+        Retourne la distribution des livres par catégorie.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT Category, COUNT(*) FROM books GROUP BY Category ORDER BY COUNT(*) DESC"
+            ).fetchall()
+        return {row[0]: int(row[1]) for row in rows}
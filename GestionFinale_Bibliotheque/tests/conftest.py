@@ -0,0 +1,36 @@
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Les modules de l'application s'importent à plat (voir main.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import LibraryDatabase
+
+def sample_books(n: int, start: int = 0):
+    """Livres de test pour add_books."""
+    return [
+        {
+            "Title": f"Titre {i}",
+            "Author": f"Auteur {i % 3}",
+            "Year": 2000 + i,
+            "Category": f"Catégorie {i % 2}",
+            "ISBN": "",
+            "Quantity": 1 + i % 4,
+        }
+        for i in range(start, start + n)
+    ]
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """Chemin d'un catalogue CSV vide dans un répertoire temporaire."""
+    return str(tmp_path / "library.csv")
+
+@pytest.fixture
+def db(csv_path):
+    """Catalogue CSV avec journal, sans instantané Parquet."""
+    database = LibraryDatabase(csv_path, snapshot=False)
+    yield database
+    database.close()
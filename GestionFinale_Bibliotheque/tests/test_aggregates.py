@@ -0,0 +1,59 @@
+
+import random
+from collections import Counter
+
+import pandas as pd
+
+from aggregates import FrequencyCounter
+from tests.conftest import sample_books
+
+def brute_most_common(counts: Counter):
+    counts = {key: count for key, count in counts.items() if count}
+    if not counts:
+        return None
+    top = max(counts.values())
+    return min(key for key, count in counts.items() if count == top)
+
+def test_most_common_matches_brute_force():
+    rng = random.Random(3)
+    counter = FrequencyCounter()
+    expected = Counter()
+    keys = [f"clé {i}" for i in range(8)]
+    for _ in range(2000):
+        key = rng.choice(keys)
+        if rng.random() < 0.55:
+            counter.increment(key)
+            expected[key] += 1
+        elif expected[key]:
+            counter.decrement(key)
+            expected[key] -= 1
+        assert counter.most_common() == brute_most_common(expected)
+    assert counter.to_dict() == {key: count for key, count in expected.items() if count}
+
+def test_most_common_ties_and_series():
+    counter = FrequencyCounter.from_series(pd.Series(["b", "c", "b", "c", "a"]))
+    assert counter.most_common() == "b"
+    counter.increment("a")
+    assert counter.most_common() == "a"
+    counter.decrement("b")
+    assert counter.most_common() == "a"
+    counter.decrement("a")
+    counter.decrement("c")
+    assert counter.most_common() == "a"
+    assert FrequencyCounter().most_common() is None
+
+def test_statistics_match_catalogue(db):
+    ids = db.add_books(sample_books(40))
+    db.get_statistics()
+    rng = random.Random(5)
+    for book_id in rng.sample(ids, 10):
+        db.delete_book(book_id)
+    for book_id in rng.sample(db.df["ID"].tolist(), 10):
+        db.update_book(book_id, auteur=rng.choice(["Auteur 0", "Auteur 9"]), quantité=rng.randint(0, 5))
+    
+    df = db.df
+    stats = db.get_statistics()
+    assert stats["total_livres"] == len(df)
+    assert stats["quantité_totale"] == int(df["Quantity"].sum())
+    assert stats["catégories_uniques"] == df["Category"].astype(str).nunique()
+    assert stats["auteur_frequent"] == df["Author"].astype(str).mode()[0]
@@ -0,0 +1,76 @@
+
+import random
+from collections import Counter
+
+from dedup import find_duplicates, is_similar, levenshtein, merge_duplicates, normalize_key, value_counts
+from tests.conftest import sample_books
+
+def levenshtein_dp(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+def test_levenshtein_matches_dynamic_programming():
+    rng = random.Random(4)
+    for _ in range(2000):
+        a = "".join(rng.choice("abcé ") for _ in range(rng.randint(0, 12)))
+        b = "".join(rng.choice("abcé ") for _ in range(rng.randint(0, 12)))
+        assert levenshtein(a, b) == levenshtein_dp(a, b), (a, b)
+    assert levenshtein("x" * 100, "y" + "x" * 99) == 1
+
+def test_normalize_key():
+    assert normalize_key("OUssama Muslim") == normalize_key("Ousama  MUSLIM") == "ousama muslim"
+    assert normalize_key("Émile Zola.") == "emile zola"
+
+def test_is_similar():
+    assert is_similar(normalize_key("Victor Hugo"), normalize_key("Victor Hugp"))
+    assert is_similar(normalize_key("Hugo Victor"), normalize_key("Victor Hugo"), any_order=True)
+    assert not is_similar(normalize_key("Hugo Victor"), normalize_key("Victor Hugo"))
+    assert not is_similar(normalize_key("Tome 1"), normalize_key("Tome 2"))
+    assert not is_similar(normalize_key("Le Rouge et le Noir"), normalize_key("La Rouge et le Noir"))
+
+def test_find_duplicates_groups_variants():
+    counts = Counter({
+        "Victor Hugo": 40, "victor hugo": 3, "Victor Hugp": 1, "Hugo Victor": 1,
+        "Émile Zola": 20, "Emile Zola": 2,
+        "Jane Martin": 10, "Anne Martin": 9,
+        "Tome 1": 5, "Tome 2": 5,
+    })
+    clusters = find_duplicates(counts, any_order=True)
+    by_canonical = {cluster["canonique"]: cluster for cluster in clusters}
+    
+    assert set(by_canonical) == {"Victor Hugo", "Émile Zola"}
+    assert by_canonical["Victor Hugo"]["variantes"] == {"victor hugo": 3, "Victor Hugp": 1, "Hugo Victor": 1}
+    assert by_canonical["Victor Hugo"]["livres"] == 5
+    assert by_canonical["Émile Zola"]["variantes"] == {"Emile Zola": 2}
+    assert clusters[0]["canonique"] == "Victor Hugo"
+
+def test_merge_duplicates(db):
+    books = sample_books(6)
+    for book, author in zip(books, ["Victor Hugo"] * 4 + ["victor  hugo", "Victor Hugp"]):
+        book["Author"] = author
+    db.add_books(books)
+    
+    clusters = find_duplicates(value_counts(db, "Author"))
+    assert merge_duplicates(db, "Author", clusters) == 2
+    assert set(db.get_all_books()["Author"].astype(str)) == {"Victor Hugo"}
+
+def test_frequent_same_key_values_are_not_merged():
+    # Les lettres répétées étant simplifiées, ces paires ont la même clé
+    counts = Counter({
+        "Thomas More": 30, "Thomas Moore": 25,
+        "Anna Karina": 10, "Ana Karina": 9,
+        "Abbott": 5, "Abott": 5,
+    })
+    assert normalize_key("Thomas More") == normalize_key("Thomas Moore")
+    assert find_duplicates(counts, any_order=True) == []
+    
+    # Une variante rare de même clé reste fusionnée
+    counts["thomas  more"] = 1
+    [cluster] = find_duplicates(counts, any_order=True)
+    assert cluster["canonique"] == "Thomas More"
+    assert cluster["variantes"] == {"thomas  more": 1}
@@ -0,0 +1,90 @@
+
+import pandas as pd
+import pytest
+
+from database import LibraryDatabase, diff_records, read_journal
+from persistence import WriteBehindWriter
+from row_store import RowStoreLibraryDatabase
+from tests.conftest import sample_books
+
+EXTERNAL_ROW = "99,Ajouté à la main,Auteur X,1999,Roman,,1,\n"
+
+def append_external_row(csv_path):
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write(EXTERNAL_ROW)
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=["ID", "Title", "Author", "Year", "Category", "ISBN", "Quantity", "ImagePath"])
+
+def test_diff_records():
+    old = frame([
+        [1, "A", "X", 2000, "Roman", "", 1, ""],
+        [2, "B", "Y", 2001, "Roman", "", 1, ""],
+        [3, "C", "Z", 2002, "Roman", "", 1, ""],
+    ])
+    new = frame([
+        [1, "A", "X", 2000, "Roman", "", 1, ""],
+        [3, "C", "Z", 2002, "Essai", "", 4, ""],
+        [4, "D", "W", 2003, "Roman", "", 1, ""],
+    ])
+    records = diff_records(old, new)
+    
+    assert records[0] == {"op": "delete", "id": 2}
+    assert records[1] == {"op": "update", "id": 3, "fields": {"Category": "Essai", "Quantity": 4}}
+    assert [r["op"] for r in records[2:]] == ["add"]
+    assert records[2]["row"]["ID"] == 4
+    assert diff_records(new, new) == []
+
+def test_apply_external_changes(db, csv_path):
+    db.add_books(sample_books(3))
+    db.compact()
+    append_external_row(csv_path)
+    
+    events = []
+    db.add_listener(lambda kind, ids: events.append((kind, ids)))
+    assert db.apply_external_changes()
+    assert db.get_book_by_id(99)["Title"] == "Ajouté à la main"
+    assert ("inserted", [99]) in events
+    assert not db.apply_external_changes()
+
+def test_apply_external_changes_with_writer(db, csv_path):
+    db.add_books(sample_books(3))
+    db.compact()
+    writer = WriteBehindWriter(db, delay=0.01)
+    try:
+        db.add_book("Pendant l'écriture", "Auteur", 2020, "Roman", "", 1)
+        append_external_row(csv_path)
+        assert db.apply_external_changes()
+        assert db.has_book(99)
+        assert len(db) == 5
+    finally:
+        writer.close()
+
+BACKENDS = [
+    lambda path: LibraryDatabase(path, snapshot=False, compaction_threshold=1),
+    lambda path: RowStoreLibraryDatabase(path, compaction_threshold=1),
+]
+
+@pytest.mark.parametrize("open_db", BACKENDS, ids=["pandas", "row_store"])
+def test_background_compaction_keeps_external_rows(csv_path, open_db):
+    db = open_db(csv_path)
+    db.add_books(sample_books(2))
+    db.compact()
+    append_external_row(csv_path)
+    
+    writer = WriteBehindWriter(db, delay=0.01)
+    try:
+        # Des modifications (le catalogue ne grandit pas): la compaction devient due
+        for quantity in range(2, 6):
+            db.update_book(1, quantité=quantity)
+            assert writer.flush(5)
+        assert writer.errors.empty()
+    finally:
+        writer.close()
+    
+    assert db.has_book(99)
+    assert len(read_journal(db.journal_path)) < 4
+    reopened = LibraryDatabase(csv_path, snapshot=False)
+    assert reopened.has_book(99)
+    assert len(reopened) == 3
+    assert reopened.get_book_by_id(1)["Quantity"] == 5
@@ -0,0 +1,84 @@
+
+import random
+
+from row_store import RowStoreLibraryDatabase
+from tests.conftest import sample_books
+
+def assert_index_matches(db):
+    ids = db.df["ID"].astype(int).tolist()
+    assert db._get_id_index() == {book_id: pos for pos, book_id in enumerate(ids)}
+
+def test_delete_keeps_index(db):
+    ids = db.add_books(sample_books(10))
+    db.get_position(ids[0])
+    index = db._id_index
+    
+    assert db.delete_book(ids[3])
+    assert db._id_index is index
+    assert db.get_position(ids[3]) is None
+    assert db.get_position(ids[4]) == 3
+    assert_index_matches(db)
+
+def test_delete_books_keeps_index(db):
+    ids = db.add_books(sample_books(10))
+    index = db._get_id_index()
+    
+    assert db.delete_books([ids[1], ids[5], ids[9]]) == 3
+    assert db._id_index is index
+    assert_index_matches(db)
+
+def test_index_after_mixed_operations(db):
+    rng = random.Random(0)
+    ids = db.add_books(sample_books(30))
+    for i in range(200):
+        if rng.random() < 0.5 and ids:
+            book_id = ids.pop(rng.randrange(len(ids)))
+            assert db.delete_book(book_id)
+        else:
+            book = sample_books(1, start=i)[0]
+            ids.append(db.add_book(book["Title"], book["Author"], book["Year"], book["Category"], "", 1))
+        book_id = rng.choice(ids)
+        assert db.get_book_by_id(book_id)["ID"] == book_id
+    assert_index_matches(db)
+    assert sorted(db.df["ID"].tolist()) == sorted(ids)
+
+def test_rolled_back_delete_restores_positions(db):
+    ids = db.add_books(sample_books(5))
+    try:
+        with db.transaction():
+            db.delete_book(ids[0])
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert db.get_position(ids[0]) == 0
+    assert_index_matches(db)
+
+def test_row_store_positions_after_pending_changes(csv_path):
+    db = RowStoreLibraryDatabase(csv_path, compaction_threshold=10_000)
+    db.add_books(sample_books(40))
+    db.save()
+    rng = random.Random(1)
+    for i in range(150):
+        ids = list(db.get_book_ids())
+        if rng.random() < 0.5:
+            db.delete_book(rng.choice(ids))
+        else:
+            db.add_book(f"Titre {i}", "Auteur", 2000, "Roman", "", 1)
+        if i % 25 == 0:
+            try:
+                with db.transaction():
+                    db.delete_book(ids[0])
+                    db.add_book("Annulé", "Auteur", 2000, "Roman", "", 1)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        ids = list(db.get_book_ids())
+        book_id = rng.choice(ids)
+        assert db.get_position(book_id) == ids.index(book_id)
+    
+    ids = list(db.get_book_ids())
+    assert [db.get_position(book_id) for book_id in ids] == list(range(len(ids)))
+    assert db.search_book_ids("titre 1") == [
+        book_id for book_id in ids if "titre 1" in db.get_book_by_id(book_id)["Title"].lower()
+    ]
+    db.close()
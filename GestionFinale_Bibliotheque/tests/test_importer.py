@@ -0,0 +1,53 @@
+
+import pandas as pd
+
+from importer import BulkImporter, normalize_isbn, validate_chunk
+
+def raw_chunk(rows):
+    return pd.DataFrame(rows, columns=["Title", "Author", "Year", "Category", "ISBN", "Quantity", "ImagePath"])
+
+def test_normalize_isbn_checksums():
+    isbn, valid = normalize_isbn(pd.Series([
+        "978-0-306-40615-7",  # ISBN-13 valide
+        "0-306-40615-2",      # ISBN-10 valide, converti en ISBN-13
+        "080442957X",         # ISBN-10 valide à clé X
+        "978-0-306-40615-8",  # clé de contrôle fausse
+        "0-306-40615-3",      # clé de contrôle fausse
+        "12345",              # mal formé
+        None,
+    ]))
+    assert isbn.tolist()[:3] == ["9780306406157", "9780306406157", "9780804429573"]
+    assert valid.tolist() == [True, True, True, False, False, False, False]
+    assert isbn.tolist()[5:] == ["", ""]
+
+def test_validate_chunk_accepts_missing_isbn():
+    valid, rejected = validate_chunk(raw_chunk([
+        ["Sans ISBN", "Auteur", "2001", "Roman", "", "1", ""],
+        ["ISBN absent", "Auteur", "2001", "Roman", None, "1", ""],
+        ["Valide", "Auteur", "2001", "Roman", "0-306-40615-2", "2", ""],
+        ["Clé fausse", "Auteur", "2001", "Roman", "978-0-306-40615-8", "1", ""],
+        ["Mal formé", "Auteur", "2001", "Roman", "12-34", "1", ""],
+    ]))
+    assert valid["Title"].tolist() == ["Sans ISBN", "ISBN absent", "Valide"]
+    assert valid["ISBN"].tolist() == ["", "", "9780306406157"]
+    assert rejected["Motif"].tolist() == ["clé de contrôle ISBN invalide", "ISBN mal formé"]
+
+def test_import_merges_isbns_and_adds_books_without_isbn(db):
+    importer = BulkImporter(db)
+    importer.import_chunk(raw_chunk([
+        ["A", "Auteur", "2001", "Roman", "9780306406157", "1", ""],
+        ["A bis", "Auteur", "2001", "Roman", "0306406152", "2", ""],
+        ["Sans ISBN 1", "Auteur", "2001", "Roman", "", "1", ""],
+        ["Sans ISBN 2", "Auteur", "2001", "Roman", "", "1", ""],
+    ]))
+    importer.import_chunk(raw_chunk([
+        ["A ter", "Auteur", "2001", "Roman", "978-0-306-40615-7", "4", ""],
+        ["Sans ISBN 3", "Auteur", "2001", "Roman", "", "1", ""],
+    ]))
+    
+    books = db.get_all_books()
+    assert sorted(books["Title"].tolist()) == ["A", "Sans ISBN 1", "Sans ISBN 2", "Sans ISBN 3"]
+    assert int(books.loc[books["Title"] == "A", "Quantity"].iloc[0]) == 7
+    assert importer.report["ajoutés"] == 4
+    assert importer.report["fusionnés"] == 2
+    assert importer.report["rejetés"] == 0
@@ -0,0 +1,32 @@
+
+import math
+import random
+
+from instrumentation import Histogram
+
+def test_percentile_is_the_upper_bound_of_its_bucket():
+    rng = random.Random(2)
+    samples = [rng.lognormvariate(0, 1.5) for _ in range(5000)]
+    histogram = Histogram()
+    for sample in samples:
+        histogram.add(sample)
+    
+    samples.sort()
+    bounds = list(Histogram.BORNES_MS) + [max(samples)]
+    for q in (1, 50, 90, 99, 100):
+        exact = samples[max(0, math.ceil(q / 100 * len(samples)) - 1)]
+        bound = min(next(b for b in bounds if b >= exact), max(samples))
+        assert histogram.percentile(q) == round(bound, 3)
+        assert histogram.percentile(q) >= round(exact, 3)
+
+def test_percentile_edge_cases():
+    histogram = Histogram()
+    assert histogram.percentile(50) == 0.0
+    
+    histogram.add(3.0)
+    assert histogram.percentile(0) == 3.0
+    assert histogram.percentile(100) == 3.0
+    
+    histogram.add(20000.0)
+    assert histogram.percentile(100) == 20000.0
+    assert histogram.to_dict()["count"] == 2
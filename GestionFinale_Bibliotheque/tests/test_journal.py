@@ -0,0 +1,68 @@
+
+import os
+
+from pandas.testing import assert_frame_equal
+
+from database import LibraryDatabase, read_journal, reduce_journal
+from tests.conftest import sample_books
+
+def reopen(path):
+    return LibraryDatabase(path, snapshot=False)
+
+def test_mutations_are_appended_to_the_journal(db, csv_path):
+    book_id = db.add_book("Les Misérables", "Victor Hugo", 1862, "Roman", "", 2)
+    db.update_book(book_id, quantité=5)
+    
+    ops = [record["op"] for record in read_journal(db.journal_path)]
+    assert ops == ["add", "update"]
+    # Le CSV n'est pas réécrit avant la compaction
+    assert "Misérables" not in open(csv_path, encoding="utf-8").read()
+
+def test_journal_is_replayed_on_load(db, csv_path):
+    ids = db.add_books(sample_books(5))
+    db.update_book(ids[0], titre="Modifié")
+    db.delete_book(ids[1])
+    expected = db.get_all_books()
+    
+    other = reopen(csv_path)
+    assert_frame_equal(other.get_all_books(), expected, check_dtype=False)
+    assert other.get_book_by_id(ids[0])["Title"] == "Modifié"
+    assert not other.has_book(ids[1])
+
+def test_compaction_writes_csv_and_empties_journal(db, csv_path):
+    db.add_books(sample_books(3))
+    db.compact()
+    
+    assert read_journal(db.journal_path) == []
+    assert os.path.getsize(csv_path) > 0
+    assert len(reopen(csv_path)) == 3
+
+def test_compaction_threshold_triggers_save(csv_path):
+    db = LibraryDatabase(csv_path, snapshot=False, compaction_threshold=2)
+    for book in sample_books(4):
+        db.add_book(book["Title"], book["Author"], book["Year"], book["Category"], "", 1)
+    assert len(read_journal(db.journal_path)) < 4
+    assert len(reopen(csv_path)) == 4
+
+def test_reduce_journal_keeps_final_effect():
+    records = [
+        {"op": "add", "row": {"ID": 1, "Title": "A"}},
+        {"op": "update", "id": 1, "fields": {"Title": "B"}},
+        {"op": "update", "id": 2, "fields": {"Quantity": 3}},
+        {"op": "delete", "id": 3},
+        {"op": "add", "row": {"ID": 4, "Title": "C"}},
+        {"op": "delete", "id": 4},
+    ]
+    added, updated, deleted = reduce_journal(records)
+    assert added == {1: {"ID": 1, "Title": "B"}}
+    assert updated == {2: {"Quantity": 3}}
+    assert deleted == {1, 3, 4}
+
+def test_replay_is_idempotent(db, csv_path):
+    # Une opération écrite deux fois (reprise après erreur) ne duplique rien
+    ids = db.add_books(sample_books(2))
+    with open(db.journal_path, "rb") as f:
+        content = f.read()
+    with open(db.journal_path, "ab") as f:
+        f.write(content)
+    assert sorted(reopen(csv_path).get_all_books()["ID"].tolist()) == ids
@@ -0,0 +1,95 @@
+
+import random
+
+import pandas as pd
+
+from search_index import TrigramIndex
+
+WORDS = ["hugo", "victor", "misérables", "roman", "étoile", "zola", "germinal", "essai", "poésie", "Été"]
+
+def random_row(rng, book_id):
+    return {
+        "ID": book_id,
+        "Title": " ".join(rng.choice(WORDS) for _ in range(3)),
+        "Author": rng.choice(WORDS).title(),
+        "Category": rng.choice(["Roman", "Essai", None]),
+        "ISBN": rng.choice(["", "9780306406157", "978230"]),
+    }
+
+def brute_force(rows, query):
+    query = query.lower()
+    return {
+        row["ID"] for row in rows.values()
+        if any(query in str(row[field]).lower() for field in TrigramIndex.FIELDS if row[field] is not None)
+    }
+
+def test_search_matches_brute_force():
+    rng = random.Random(7)
+    rows = {i: random_row(rng, i) for i in range(1, 200)}
+    index = TrigramIndex.build(pd.DataFrame(list(rows.values())))
+    
+    next_id = 200
+    for _ in range(300):
+        action = rng.random()
+        if action < 0.3:
+            rows[next_id] = random_row(rng, next_id)
+            index.add(next_id, rows[next_id])
+            next_id += 1
+        elif action < 0.6:
+            book_id = rng.choice(list(rows))
+            rows[book_id] = random_row(rng, book_id)
+            index.update(book_id, rows[book_id])
+        else:
+            book_id = rng.choice(list(rows))
+            del rows[book_id]
+            index.remove(book_id)
+    
+    queries = WORDS + ["ctor hu", "été", "ÉTOILE", "978", "xyz", "oman"]
+    for query in queries:
+        assert index.search(query) == brute_force(rows, query), query
+    assert len(index) == len(rows)
+
+def test_short_queries_are_not_indexed():
+    index = TrigramIndex.build(pd.DataFrame([{"ID": 1, "Title": "ab", "Author": "", "Category": "", "ISBN": ""}]))
+    assert index.search("ab") is None
+    assert index.search("") is None
+
+def test_search_books_matches_scan(db):
+    rng = random.Random(11)
+    rows = [random_row(rng, 0) for _ in range(150)]
+    db.add_books([dict(row, Year=2000, Quantity=1, Category=row["Category"] or "") for row in rows])
+    df = db.get_all_books()
+    for query in ["hugo", "ÉTÉ", "oman", "9780306", "ro"]:
+        expected = df[
+            df[["Title", "Author", "Category", "ISBN"]].astype(str)
+            .apply(lambda column: column.str.lower().str.contains(query.lower(), regex=False)).any(axis=1)
+        ]["ID"].tolist()
+        assert db.search_books(query)["ID"].tolist() == expected, query
+
+def posting_size(index):
+    return sum(len(posting) for posting in index._postings.values())
+
+def test_repeated_updates_do_not_grow_postings():
+    rows = [{"ID": 1, "Title": "Les Misérables", "Author": "Victor Hugo", "Category": "Roman", "ISBN": ""},
+            {"ID": 1, "Title": "Les Misérables (poche)", "Author": "Victor Hugo", "Category": "Roman", "ISBN": ""}]
+    index = TrigramIndex.build(pd.DataFrame(rows[:1]))
+    index.update(1, rows[1])
+    size = posting_size(index)
+    for i in range(1001):
+        index.update(1, rows[i % 2])
+    assert posting_size(index) == size
+    assert index.search("poche") == set()
+    assert index.search("misérables") == {1}
+
+def test_search_index_is_rebuilt_after_many_updates(db):
+    db.add_books([{"Title": f"Livre {i}", "Author": "Hugo", "Category": "Roman", "ISBN": "", "Year": 2000, "Quantity": 1}
+                  for i in range(10)])
+    book_id = int(db.get_all_books()["ID"].iloc[0])
+    db.search_books("livre")
+    for i in range(3000):
+        db.update_book(book_id, titre=f"Édition {i}")
+    index = db._get_search_index()
+    assert posting_size(index) < 2 * posting_size(TrigramIndex.build(db.df)) + 5000
+    assert db.search_books("dition 2999")["ID"].tolist() == [book_id]
+    assert db.search_books("dition 1500").empty
+
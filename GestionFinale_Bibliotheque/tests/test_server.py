@@ -0,0 +1,105 @@
+
+import asyncio
+import json
+
+import pandas as pd
+
+from database import LibraryDatabase
+from server import CatalogServer
+from tests.conftest import sample_books
+
+async def exchange(server, raw: bytes):
+    """Envoie une requête brute et retourne (statut, corps JSON)."""
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    try:
+        writer.write(raw)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        body = await reader.readexactly(length)
+        return status, json.loads(body) if body else None
+    finally:
+        writer.close()
+
+def run(db, *requests):
+    async def main():
+        server = CatalogServer(db, port=0)
+        await server.start()
+        try:
+            return [await exchange(server, raw) for raw in requests]
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+def test_get_and_post(db):
+    db.add_books(sample_books(3))
+    body = json.dumps({"Title": "Nouveau", "Author": "Auteur"}).encode()
+    (get_status, book), (post_status, _) = run(
+        db,
+        b"GET /books/1 HTTP/1.1\r\nConnection: close\r\n\r\n",
+        b"POST /books HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body),
+    )
+    assert get_status == 200 and book["Title"] == "Titre 0"
+    assert post_status == 201
+    assert len(db) == 4
+
+def test_invalid_content_length(db):
+    results = run(
+        db,
+        b"POST /books HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+        b"POST /books HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+        b"POST /books HTTP/1.1\r\nContent-Length: 99999999999\r\n\r\n",
+    )
+    assert [status for status, _ in results] == [400, 400, 413]
+
+def test_overlong_request_line_and_headers(db):
+    long_target = b"/" + b"x" * (CatalogServer.TAILLE_LIGNE_MAX * 2)
+    many_headers = b"".join(b"X-%d: 1\r\n" % i for i in range(CatalogServer.EN_TETES_MAX + 1))
+    results = run(
+        db,
+        b"GET " + long_target + b" HTTP/1.1\r\n\r\n",
+        b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * (CatalogServer.TAILLE_LIGNE_MAX * 2) + b"\r\n\r\n",
+        b"GET /health HTTP/1.1\r\n" + many_headers + b"\r\n",
+    )
+    assert [status for status, _ in results] == [400, 400, 400]
+
+def test_unexpected_error_returns_500(db, monkeypatch):
+    async def broken(*args):
+        raise RuntimeError("panne")
+    monkeypatch.setattr(CatalogServer, "_read_request", broken)
+    [(status, payload)] = run(db, b"GET /health HTTP/1.1\r\n\r\n")
+    assert status == 500
+    assert "panne" in payload["erreur"]
+
+def post(body):
+    body = json.dumps(body).encode()
+    return b"POST /books HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+
+def test_missing_year_is_stored_as_missing(db, csv_path):
+    [(status, payload)] = run(db, post({"Title": "Sans date", "Author": "Anonyme"}))
+    assert status == 201
+    assert pd.isna(db.get_book_by_id(payload["ID"])["Year"])
+    db.save()
+    reopened = LibraryDatabase(csv_path, snapshot=False)
+    assert pd.isna(reopened.get_book_by_id(payload["ID"])["Year"])
+
+def test_out_of_range_values_are_rejected(db):
+    db.add_books(sample_books(1))
+    patch = json.dumps({"Quantity": 2**40}).encode()
+    results = run(
+        db,
+        post({"Title": "Futur", "Author": "Auteur", "Year": 40000}),
+        post({"Title": "Stock", "Author": "Auteur", "Quantity": -1}),
+        b"PATCH /books/1 HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(patch), patch),
+    )
+    assert [status for status, _ in results] == [400, 400, 400]
+    assert "Year" in results[0][1]["erreur"]
+    assert len(db) == 1
+    assert db.get_book_by_id(1)["Quantity"] == sample_books(1)[0]["Quantity"]
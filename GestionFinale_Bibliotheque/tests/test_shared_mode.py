@@ -0,0 +1,78 @@
+
+import multiprocessing
+
+import pytest
+
+from database import LibraryDatabase
+from row_store import RowStoreLibraryDatabase
+from tests.conftest import sample_books
+
+BACKENDS = {
+    "pandas": lambda path: LibraryDatabase(path, snapshot=False, shared=True, compaction_threshold=10_000),
+    "row_store": lambda path: RowStoreLibraryDatabase(path, shared=True, compaction_threshold=10_000),
+}
+
+@pytest.fixture(params=list(BACKENDS))
+def open_shared(request):
+    return BACKENDS[request.param]
+
+def add(db, title):
+    return db.add_book(title, "Auteur", 2000, "Roman", "", 1)
+
+def test_instances_see_each_other(csv_path, open_shared):
+    a, b = open_shared(csv_path), open_shared(csv_path)
+    first = add(a, "Écrit par A")
+    second = add(b, "Écrit par B")
+    assert second == first + 1
+    
+    events = []
+    a.add_listener(lambda kind, ids: events.append((kind, ids)))
+    assert b.update_book(first, titre="Modifié par B")
+    assert a.refresh()
+    assert a.get_book_by_id(first)["Title"] == "Modifié par B"
+    assert a.get_book_by_id(second)["Title"] == "Écrit par B"
+    assert ("updated", [first]) in events
+    
+    assert a.delete_book(second)
+    b.refresh()
+    assert not b.has_book(second)
+    assert not a.refresh()
+
+def test_catch_up_after_compactions(csv_path, open_shared):
+    a, b = open_shared(csv_path), open_shared(csv_path)
+    add(a, "Avant")
+    b.refresh()
+    
+    # Une compaction: B rattrape la fin du journal précédent (.prev)
+    add(a, "Un")
+    a.compact()
+    add(a, "Deux")
+    b.refresh()
+    assert sorted(b.get_all_books()["Title"].tolist()) == ["Avant", "Deux", "Un"]
+    
+    # Plusieurs compactions manquées: B relit tout
+    for title in ("Trois", "Quatre"):
+        add(a, title)
+        a.compact()
+    b.refresh()
+    assert len(b) == 5
+    assert add(b, "Cinq") == 6
+
+def _add_books(backend, path, count):
+    db = BACKENDS[backend](path)
+    for i in range(count):
+        add(db, f"Livre {i}")
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_concurrent_processes_do_not_lose_books(csv_path, backend):
+    BACKENDS[backend](csv_path).add_books(sample_books(5))
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_add_books, args=(backend, csv_path, 20)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+    
+    ids = BACKENDS[backend](csv_path).get_all_books()["ID"].tolist()
+    assert sorted(ids) == list(range(1, 66))
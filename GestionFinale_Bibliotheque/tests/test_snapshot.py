@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from database import LibraryDatabase
+from snapshot import is_fresh, snapshot_available, snapshot_path_for
+from tests.conftest import sample_books
+
+pytestmark = pytest.mark.skipif(not snapshot_available(), reason="moteur Parquet absent")
+
+def saved_catalog(csv_path):
+    db = LibraryDatabase(csv_path, snapshot=True)
+    db.add_books(sample_books(3))
+    db.save()
+    db.close()
+    return snapshot_path_for(csv_path)
+
+def test_snapshot_is_fresh_after_save(csv_path):
+    snapshot_path = saved_catalog(csv_path)
+    assert is_fresh(snapshot_path, csv_path)
+    assert len(LibraryDatabase(csv_path, snapshot=True)) == 3
+
+def test_csv_edited_within_the_same_timestamp_is_reread(csv_path):
+    snapshot_path = saved_catalog(csv_path)
+    # Système de fichiers à dates grossières: le CSV modifié garde la
+    # date de l'instantané
+    mtime_ns = os.stat(snapshot_path).st_mtime_ns
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("99,Ajout manuel,Auteur,2001,Roman,,1,\n")
+    os.utime(csv_path, ns=(mtime_ns, mtime_ns))
+    
+    assert not is_fresh(snapshot_path, csv_path)
+    reopened = LibraryDatabase(csv_path, snapshot=True)
+    assert reopened.get_book_by_id(99)["Title"] == "Ajout manuel"
+
+def test_replaced_csv_is_reread(csv_path, tmp_path):
+    snapshot_path = saved_catalog(csv_path)
+    # Même taille et même date, mais un autre fichier (autre inode)
+    replacement = str(tmp_path / "copie.csv")
+    with open(csv_path, encoding="utf-8") as f:
+        content = f.read().replace("Titre 0", "Titre X")
+    with open(replacement, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    stat = os.stat(csv_path)
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, csv_path)
+    
+    assert not is_fresh(snapshot_path, csv_path)
+    titles = LibraryDatabase(csv_path, snapshot=True).get_all_books()["Title"].tolist()
+    assert "Titre X" in titles
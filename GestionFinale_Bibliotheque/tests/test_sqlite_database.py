@@ -0,0 +1,63 @@
+
+import sqlite3
+
+import pytest
+
+from sqlite_database import SQLiteLibraryDatabase
+from tests.conftest import sample_books
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    database = SQLiteLibraryDatabase(str(tmp_path / "library.db"))
+    yield database
+    database.close()
+
+def test_deleted_ids_are_not_reused(tmp_path):
+    db = SQLiteLibraryDatabase(str(tmp_path / "library.db"))
+    ids = db.add_books(sample_books(3))
+    assert db.delete_book(ids[-1])
+    new_id = db.add_book("Nouveau", "Auteur", 2020, "Roman", "", 1)
+    assert new_id == ids[-1] + 1
+    
+    db.delete_book(new_id)
+    db.close()
+    reopened = SQLiteLibraryDatabase(str(tmp_path / "library.db"))
+    try:
+        assert reopened.add_book("Encore", "Auteur", 2021, "Roman", "", 1) == new_id + 1
+    finally:
+        reopened.close()
+
+def test_legacy_table_is_migrated(tmp_path):
+    path = str(tmp_path / "library.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE books (ID INTEGER PRIMARY KEY, Title TEXT NOT NULL, Author TEXT NOT NULL, "
+                 "Year INTEGER, Category TEXT, ISBN TEXT, Quantity INTEGER, ImagePath TEXT DEFAULT '')")
+    conn.execute("INSERT INTO books VALUES (1, 'A', 'X', 2000, 'Roman', '', 1, ''), "
+                 "(7, 'B', 'Y', 2001, 'Roman', '', 1, '')")
+    conn.commit()
+    conn.close()
+    
+    db = SQLiteLibraryDatabase(path)
+    try:
+        assert db.get_book_by_id(7)["Title"] == "B"
+        db.delete_book(7)
+        assert db.add_book("C", "Z", 2002, "Roman", "", 1) == 8
+    finally:
+        db.close()
+
+def test_search_ignores_unicode_case(sqlite_db, db):
+    books = [
+        dict(sample_books(1)[0], Title="École des femmes", Author="Molière"),
+        dict(sample_books(1)[0], Title="Été indien", Author="ÉMILE ZOLA"),
+        dict(sample_books(1)[0], Title="100% pur", Author="A_B"),
+    ]
+    sqlite_db.add_books(books)
+    db.add_books(books)
+    
+    for query in ["école", "ÉCOLE", "été", "émile", "MOLIÈRE", "%", "_", "é"]:
+        expected = db.search_books(query)["ID"].tolist()
+        assert sqlite_db.search_books(query)["ID"].tolist() == expected, query
+        total, page = sqlite_db.search_page(query, 0, 2)
+        assert total == len(expected)
+        assert page["ID"].tolist() == expected[:2]
+    assert sqlite_db.search_books("école")["Title"].tolist() == ["École des femmes"]
@@ -0,0 +1,69 @@
+
+import json
+
+import pandas as pd
+import pytest
+
+from database import LibraryDatabase, read_journal
+from row_store import RowStoreLibraryDatabase
+from tests.conftest import sample_books
+
+HEADER = "ID,Title,Author,Year,Category,ISBN,Quantity,ImagePath\n"
+
+BACKENDS = {
+    "pandas": lambda path: LibraryDatabase(path, snapshot=False),
+    "row_store": lambda path: RowStoreLibraryDatabase(path),
+}
+
+@pytest.fixture(params=list(BACKENDS))
+def open_db(request):
+    return BACKENDS[request.param]
+
+def test_out_of_range_csv_values_are_dropped(csv_path, open_db, capsys):
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        f.write("1,Correct,Auteur,1999,Roman,,2,\n")
+        f.write("2,Faute de frappe,Auteur,40000,Roman,,99999999999,\n")
+    
+    db = open_db(csv_path)
+    books = db.get_all_books()
+    assert len(books) == 2
+    assert pd.isna(books.loc[1, "Year"]) and pd.isna(books.loc[1, "Quantity"])
+    assert books.loc[0, "Year"] == 1999
+    assert "Attention" in capsys.readouterr().out
+
+def test_out_of_range_journal_values_are_dropped(csv_path, open_db):
+    db = open_db(csv_path)
+    book_id = db.add_book("Livre", "Auteur", 2000, "Roman", "", 1)
+    # Opérations écrites par une version qui ne vérifiait pas les plages
+    with open(csv_path + ".journal", "a", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "update", "id": book_id, "fields": {"Year": 20255}}) + "\n")
+        row = {"ID": 99, "Title": "Ajout", "Author": "A", "Year": 40000, "Category": "Roman",
+               "ISBN": "", "Quantity": 1, "ImagePath": ""}
+        f.write(json.dumps({"op": "add", "row": row}) + "\n")
+    
+    books = open_db(csv_path).get_all_books().set_index("ID")
+    assert pd.isna(books.loc[book_id, "Year"])
+    assert pd.isna(books.loc[99, "Year"])
+    assert books.loc[99, "Title"] == "Ajout"
+
+def test_writes_reject_out_of_range_values(csv_path, open_db):
+    db = open_db(csv_path)
+    book_id = db.add_book("Livre", "Auteur", 2000, "Roman", "", 1)
+    journal = read_journal(db.journal_path)
+    
+    with pytest.raises(ValueError):
+        db.add_book("X", "Y", 40000, "Roman", "", 1)
+    with pytest.raises(ValueError):
+        db.add_book("X", "Y", 2000, "Roman", "", -1)
+    with pytest.raises(ValueError):
+        db.update_book(book_id, année=20255)
+    with pytest.raises(ValueError):
+        db.update_books({book_id: {"Quantity": 2**40}})
+    with pytest.raises(ValueError):
+        db.add_books([dict(sample_books(1)[0], Year=40000)])
+    
+    assert read_journal(db.journal_path) == journal
+    assert len(db) == 1
+    reopened = open_db(csv_path)
+    assert reopened.get_book_by_id(book_id)["Year"] == 2000
@@ -0,0 +1,67 @@
+
+import random
+
+import pandas as pd
+import pytest
+
+from schema import apply_schema
+from virtual_table import FrameSource
+from tests.conftest import sample_books
+
+def make_source(n=4):
+    df = apply_schema(pd.DataFrame(
+        [dict(book, ID=i + 1, ImagePath="") for i, book in enumerate(sample_books(n))]))
+    return FrameSource(df)
+
+def test_update_with_new_category():
+    source = make_source()
+    source.update([{"ID": 2, "Author": "Nouvel auteur", "Category": "Nouvelle catégorie"}])
+    
+    row = source.rows(1, 2)[0]
+    assert row["Author"] == "Nouvel auteur"
+    assert row["Category"] == "Nouvelle catégorie"
+
+def test_update_ignores_unknown_ids():
+    source = make_source()
+    before = source.rows(0, len(source))
+    source.update([{"ID": 42, "Title": "Absent"}])
+    assert source.rows(0, len(source)) == before
+
+@pytest.mark.parametrize("buffer_min", [4, 10_000])
+def test_matches_list_model(monkeypatch, buffer_min):
+    # Petit tampon: intégrations fréquentes; grand tampon: jamais intégré
+    monkeypatch.setattr(FrameSource, "TAMPON_MIN", buffer_min)
+    source = make_source(20)
+    model = source.rows(0, len(source))
+    template = dict(model[0])
+    removed_ids = set()
+    rng = random.Random(1)
+    next_id = 21
+    
+    for _ in range(300):
+        action = rng.random()
+        if action < 0.4:
+            row = dict(template, ID=next_id, Title=f"Ajout {next_id}")
+            next_id += 1
+            source.append([row])
+            model.append(row)
+        elif action < 0.7 and model:
+            removed = rng.sample([row["ID"] for row in model], min(len(model), rng.randint(1, 3)))
+            source.remove(removed)
+            model = [row for row in model if row["ID"] not in removed]
+            removed_ids.update(removed)
+        elif model:
+            book_id = rng.choice(model)["ID"]
+            source.update([{"ID": book_id, "Title": f"Modifié {book_id}"}])
+            for row in model:
+                if row["ID"] == book_id:
+                    row["Title"] = f"Modifié {book_id}"
+        
+        assert len(source) == len(model)
+        start = rng.randint(0, max(0, len(model) - 1))
+        assert source.ids(start, start + 7) == [row["ID"] for row in model[start:start + 7]]
+        assert [row["Title"] for row in source.rows(start, start + 7)] == [row["Title"] for row in model[start:start + 7]]
+    
+    for position, row in enumerate(model):
+        assert source.position_of(row["ID"]) == position
+    assert all(source.position_of(book_id) is None for book_id in removed_ids)
@@ -0,0 +1,327 @@
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from PIL import Image, ImageTk
+
+class ThumbnailCache:
+    """
+    Cache de miniatures des images de couverture.
+    
+    Deux niveaux:
+    - sur disque, une miniature PNG par (image source, taille), dont le nom
+      dérive du chemin, de la date de modification et de la taille du
+      fichier source: une image remplacée produit une nouvelle clé;
+    - en mémoire, les max_photos derniers PhotoImage prêts à afficher
+      (LRU), pour qu'un livre rouvert s'affiche sans aucun décodage.
+    
+    Le répertoire est limité à max_disk_bytes: au-delà, les miniatures
+    les moins récemment utilisées sont supprimées.
+    
+    get_image peut être appelé depuis n'importe quel thread; get_photo
+    crée des objets Tk et doit être appelé depuis le thread Tk.
+    """
+    
+    def __init__(self, cache_dir: str = "data/thumbnails", max_disk_bytes: int = 200 * 1024 * 1024,
+                 max_photos: int = 64):
+        self.cache_dir = Path(cache_dir)
+        self.max_disk_bytes = max_disk_bytes
+        self.max_photos = max_photos
+        self._photos: "OrderedDict[str, ImageTk.PhotoImage]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+    
+    @staticmethod
+    def key(path: str, size: Tuple[int, int]) -> Optional[str]:
+        """
+        Calcule la clé d'une miniature.
+        
+        Args:
+            path: Chemin de l'image source
+            size: Taille maximale (largeur, hauteur)
+            
+        Returns:
+            Clé hexadécimale, ou None si le fichier n'existe pas
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        ident = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}"
+        return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+    
+    def _cache_file(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.png"
+    
+    def get_image(self, path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+        """
+        Retourne la miniature d'une image (PIL), depuis le disque si possible.
+        
+        Args:
+            path: Chemin de l'image source
+            size: Taille maximale (largeur, hauteur), proportions conservées
+            
+        Returns:
+            Image chargée en mémoire, ou None si la source n'existe pas
+        """
+        key = self.key(path, size)
+        if key is None:
+            return None
+        
+        cache_file = self._cache_file(key)
+        try:
+            with Image.open(cache_file) as cached:
+                cached.load()
+            # Marquer la miniature comme récemment utilisée
+            os.utime(cache_file)
+            return cached
+        except (OSError, ValueError):
+            pass
+        
+        image = self.make_thumbnail(path, size)
+        self._store(cache_file, image)
+        return image
+    
+    @staticmethod
+    def make_thumbnail(path: str, size: Tuple[int, int]) -> Image.Image:
+        """
+        Décode et réduit une image source.
+        
+        Pour un JPEG, draft() demande au décodeur une version déjà réduite
+        (1/2, 1/4 ou 1/8 de la résolution) au lieu de décoder l'image
+        entière puis de la réduire.
+        
+        Args:
+            path: Chemin de l'image source
+            size: Taille maximale (largeur, hauteur)
+            
+        Returns:
+            Miniature en mémoire
+        """
+        with Image.open(path) as image:
+            if image.format == "JPEG":
+                image.draft("RGB", size)
+            image.thumbnail(size)
+            if image.mode not in ("RGB", "RGBA", "L", "LA"):
+                image = image.convert("RGBA")
+            image.load()
+            return image.copy()
+    
+    def _store(self, cache_file: Path, image: Image.Image) -> None:
+        """Écrit une miniature (fichier temporaire renommé) et applique la limite."""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f"{cache_file.stem}.{threading.get_ident()}.tmp")
+            image.save(tmp_file, format="PNG")
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"Avertissement: miniature non enregistrée: {e}")
+            return
+        
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(f.stat().st_size for f in self.cache_dir.glob("*/*.png"))
+            else:
+                self._disk_bytes += cache_file.stat().st_size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+    
+    def _evict(self) -> None:
+        """Supprime les miniatures les plus anciennes jusqu'à 90 % de la limite."""
+        files = []
+        for cache_file in self.cache_dir.glob("*/*.png"):
+            try:
+                stat = cache_file.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, cache_file))
+        files.sort()
+        
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 0.9
+        for _, size, cache_file in files:
+            if total <= target:
+                break
+            try:
+                cache_file.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+    
+    def get_photo(self, path: str, size: Tuple[int, int]) -> Optional[ImageTk.PhotoImage]:
+        """
+        Retourne une miniature prête à afficher dans un widget Tk.
+        
+        Args:
+            path: Chemin de l'image source
+            size: Taille maximale (largeur, hauteur)
+            
+        Returns:
+            PhotoImage, ou None si la source n'existe pas
+        """
+        photo = self.cached_photo(path, size)
+        if photo is not None:
+            return photo
+        
+        image = self.get_image(path, size)
+        if image is None:
+            return None
+        return self.photo_from_image(path, size, image)
+    
+    def cached_photo(self, path: str, size: Tuple[int, int]) -> Optional[ImageTk.PhotoImage]:
+        """Retourne le PhotoImage déjà en mémoire (aucun décodage), ou None."""
+        key = self.key(path, size)
+        photo = self._photos.get(key) if key is not None else None
+        if photo is not None:
+            self._photos.move_to_end(key)
+        return photo
+    
+    def photo_from_image(self, path: str, size: Tuple[int, int],
+                         image: Image.Image) -> Optional[ImageTk.PhotoImage]:
+        """
+        Convertit une miniature obtenue par get_image (par exemple dans un
+        autre thread) en PhotoImage, et l'ajoute au cache mémoire en
+        évinçant le plus ancien.
+        
+        Args:
+            path: Chemin de l'image source
+            size: Taille maximale (largeur, hauteur)
+            image: Miniature retournée par get_image
+            
+        Returns:
+            PhotoImage, ou None si la source n'existe plus
+        """
+        key = self.key(path, size)
+        if key is None:
+            return None
+        photo = ImageTk.PhotoImage(image)
+        self._photos[key] = photo
+        self._photos.move_to_end(key)
+        while len(self._photos) > self.max_photos:
+            self._photos.popitem(last=False)
+        return photo
+
+class ThumbnailLoader:
+    """
+    Chargement en arrière-plan des miniatures des lignes d'un tableau.
+    
+    request() retourne immédiatement une miniature déjà en mémoire, sinon
+    confie son décodage à executor et retourne None; la miniature est
+    remise à on_ready(book_id, photo) sur le thread Tk dès qu'elle est
+    prête. retain() abandonne les chargements des lignes sorties de la
+    fenêtre visible: un défilement rapide ne décode pas les couvertures de
+    toutes les lignes parcourues.
+    
+    Le chargeur garde une référence aux miniatures des lignes visibles,
+    qui restent donc affichées même si le cache mémoire les a évincées.
+    """
+    
+    DELAI_POLL = 30
+    
+    def __init__(self, root, cache: ThumbnailCache, size: Tuple[int, int], executor,
+                 on_ready: Callable[[int, ImageTk.PhotoImage], None]):
+        """
+        Args:
+            root: Widget Tk servant à planifier les vérifications (after)
+            cache: Cache de miniatures
+            size: Taille des miniatures (largeur, hauteur)
+            executor: Pool de threads de décodage
+            on_ready: Appelé sur le thread Tk avec (ID, miniature)
+        """
+        self.root = root
+        self.cache = cache
+        self.size = size
+        self.executor = executor
+        self.on_ready = on_ready
+        self._jobs: Dict[str, Tuple[object, Set[int]]] = {}
+        self._shown: Dict[int, ImageTk.PhotoImage] = {}
+        self._failed: Set[str] = set()
+        self._after_id = None
+    
+    def request(self, book_id: int, path: str) -> Optional[ImageTk.PhotoImage]:
+        """
+        Demande la miniature d'une ligne.
+        
+        Args:
+            book_id: ID de la ligne
+            path: Chemin de l'image de couverture
+            
+        Returns:
+            Miniature si elle est déjà en mémoire, sinon None (elle sera
+            remise à on_ready)
+        """
+        if not path or path in self._failed:
+            return None
+        photo = self.cache.cached_photo(path, self.size)
+        if photo is not None:
+            self._shown[book_id] = photo
+            return photo
+        
+        job = self._jobs.get(path)
+        if job is None:
+            job = self._jobs[path] = (self.executor.submit(self.cache.get_image, path, self.size), set())
+        job[1].add(book_id)
+        self._schedule()
+        return None
+    
+    def retain(self, book_ids: Iterable[int]) -> None:
+        """
+        Limite les chargements et les miniatures gardées aux lignes données.
+        
+        Args:
+            book_ids: IDs des lignes visibles
+        """
+        keep = set(book_ids)
+        for book_id in list(self._shown):
+            if book_id not in keep:
+                del self._shown[book_id]
+        for path, (future, ids) in list(self._jobs.items()):
+            ids &= keep
+            if not ids:
+                # Sans effet si le décodage a commencé: son résultat est ignoré
+                future.cancel()
+                del self._jobs[path]
+    
+    def cancel(self) -> None:
+        """Abandonne tous les chargements et libère les miniatures gardées."""
+        for future, _ in self._jobs.values():
+            future.cancel()
+        self._jobs.clear()
+        self._shown.clear()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def _schedule(self) -> None:
+        if self._after_id is None and self._jobs:
+            self._after_id = self.root.after(self.DELAI_POLL, self._poll)
+    
+    def _poll(self) -> None:
+        """Remet les miniatures décodées aux lignes qui les attendent."""
+        self._after_id = None
+        for path, (future, ids) in list(self._jobs.items()):
+            if not future.done():
+                continue
+            del self._jobs[path]
+            try:
+                image = future.result()
+            except Exception as e:
+                print(f"Miniature non chargée ({path}): {e}")
+                image = None
+            if image is None:
+                # Image absente ou illisible: ne pas la redemander à chaque défilement
+                self._failed.add(path)
+                continue
+            
+            photo = self.cache.photo_from_image(path, self.size, image)
+            if photo is None:
+                continue
+            for book_id in ids:
+                self._shown[book_id] = photo
+                self.on_ready(book_id, photo)
+        self._schedule()
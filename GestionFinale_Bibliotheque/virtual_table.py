@@ -0,0 +1,544 @@
+
+import bisect
+from array import array
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from schema import set_cell
+
+class FrameSource:
+    """
+    Lignes d'un tableau virtuel tenues dans un DataFrame indexé par ID.
+    
+    Une source fournit au tableau le nombre de lignes, les lignes d'une
+    fenêtre (rows, ids) et la position d'un ID, et reçoit les
+    modifications ciblées (append, update, remove).
+    
+    Ces modifications ne recopient pas le DataFrame à chaque événement:
+    les lignes ajoutées restent dans un tampon placé après lui et les
+    lignes retirées sont marquées par leur position (liste triée). Les deux
+    y sont intégrés en une seule fois lorsqu'ils dépassent une fraction de
+    sa taille, d'où un coût amorti constant par ligne.
+    """
+    
+    TAMPON_MIN = 256
+    FRACTION_TAMPON = 0.125
+    
+    def __init__(self, df: pd.DataFrame, id_column: str = "ID"):
+        self.id_column = id_column
+        ids = pd.Index(df[id_column].astype(int).to_numpy()) if len(df) else pd.Index([])
+        self._data = df.set_axis(ids, axis=0)
+        # Lignes ajoutées depuis la dernière intégration (après _data)
+        self._added: List[Dict] = []
+        self._added_positions: Dict[int, int] = {}
+        # Positions retirées, comptées sur _data puis _added
+        self._removed: List[int] = []
+    
+    def __len__(self) -> int:
+        return len(self._data) + len(self._added) - len(self._removed)
+    
+    def rows(self, start: int, end: int) -> List[Dict]:
+        """Lignes de positions start à end (exclue)."""
+        size = len(self._data)
+        positions = self._window(start, end)
+        in_frame = [position for position in positions if position < size]
+        rows = self._data.iloc[in_frame].to_dict("records") if in_frame else []
+        rows.extend(dict(self._added[position - size]) for position in positions if position >= size)
+        return rows
+    
+    def ids(self, start: int, end: int) -> List[int]:
+        """IDs des lignes de positions start à end (exclue)."""
+        size = len(self._data)
+        index = self._data.index
+        return [
+            int(index[position]) if position < size else int(self._added[position - size][self.id_column])
+            for position in self._window(start, end)
+        ]
+    
+    def position_of(self, book_id: int) -> Optional[int]:
+        """Retourne la position d'une ligne, ou None."""
+        position = self._physical_position(book_id)
+        if position is None:
+            return None
+        removed = bisect.bisect_left(self._removed, position)
+        if removed < len(self._removed) and self._removed[removed] == position:
+            return None
+        return position - removed
+    
+    def append(self, rows: List[Dict]) -> None:
+        """Ajoute des lignes complètes à la fin."""
+        for row in rows:
+            self._added_positions[int(row[self.id_column])] = len(self._added)
+            self._added.append(dict(row))
+        self._consolidate_if_needed()
+    
+    def update(self, rows: List[Dict]) -> None:
+        """Remplace les valeurs de lignes existantes (nouvelles catégories comprises)."""
+        size = len(self._data)
+        for row in rows:
+            if self.position_of(row[self.id_column]) is None:
+                continue
+            position = self._physical_position(row[self.id_column])
+            if position >= size:
+                self._added[position - size].update(row)
+                continue
+            for column, value in row.items():
+                if column in self._data.columns:
+                    set_cell(self._data, position, column, value)
+    
+    def remove(self, book_ids: List[int]) -> None:
+        """Retire des lignes présentes."""
+        for book_id in book_ids:
+            if self.position_of(book_id) is not None:
+                bisect.insort(self._removed, self._physical_position(book_id))
+        self._consolidate_if_needed()
+    
+    # ===================
+    # POSITIONS
+    # ===================
+    
+    def _physical_position(self, book_id: int) -> Optional[int]:
+        """Position d'un ID dans _data suivi de _added, lignes retirées comprises."""
+        book_id = int(book_id)
+        position = self._added_positions.get(book_id)
+        if position is not None:
+            return len(self._data) + position
+        try:
+            position = self._data.index.get_loc(book_id)
+        except KeyError:
+            return None
+        return position if isinstance(position, int) else None
+    
+    def _window(self, start: int, end: int) -> List[int]:
+        """Positions dans _data suivi de _added des lignes start à end (exclue)."""
+        end = min(end, len(self))
+        if start >= end:
+            return []
+        # Première position précédée de start lignes présentes: plus petite
+        # position p telle que p - (positions retirées <= p) >= start
+        low, high = start, start + len(self._removed)
+        while low < high:
+            middle = (low + high) // 2
+            if middle - bisect.bisect_right(self._removed, middle) < start:
+                low = middle + 1
+            else:
+                high = middle
+        position = low
+        
+        positions = []
+        removed = bisect.bisect_left(self._removed, position)
+        while len(positions) < end - start:
+            if removed < len(self._removed) and self._removed[removed] == position:
+                removed += 1
+            else:
+                positions.append(position)
+            position += 1
+        return positions
+    
+    def _consolidate_if_needed(self) -> None:
+        pending = len(self._added) + len(self._removed)
+        if pending > max(self.TAMPON_MIN, self.FRACTION_TAMPON * len(self._data)):
+            self._consolidate()
+    
+    def _consolidate(self) -> None:
+        """Intègre au DataFrame les lignes ajoutées et retire les lignes marquées."""
+        data, added = self._data, self._added
+        if self._removed:
+            size = len(data)
+            keep = np.ones(size, dtype=bool)
+            removed_added = set()
+            for position in self._removed:
+                if position < size:
+                    keep[position] = False
+                else:
+                    removed_added.add(position - size)
+            data = data.iloc[keep]
+            added = [row for i, row in enumerate(added) if i not in removed_added]
+        if added:
+            new_rows = pd.DataFrame(added)
+            new_rows.index = pd.Index([int(row[self.id_column]) for row in added])
+            if len(data) == 0:
+                data = new_rows
+            else:
+                data = pd.concat([data, new_rows.reindex(columns=data.columns)])
+        self._data = data
+        self._added = []
+        self._added_positions = {}
+        self._removed = []
+
+class LazySource:
+    """
+    Lignes d'un tableau virtuel lues à la demande.
+    
+    Seuls les IDs sont gardés (tableau compact, dans l'ordre d'affichage);
+    les lignes de la fenêtre visible sont demandées à fetch à chaque
+    affichage. Utilisé avec le catalogue à faible empreinte mémoire.
+    """
+    
+    def __init__(self, ids: Sequence[int], fetch: Callable[[List[int]], List[Dict]],
+                 id_column: str = "ID"):
+        """
+        Args:
+            ids: IDs des lignes, dans l'ordre d'affichage
+            fetch: Fonction liste d'IDs -> lignes complètes, dans le même ordre
+            id_column: Colonne identifiant une ligne
+        """
+        self.id_column = id_column
+        self._ids = ids if isinstance(ids, array) else array("q", ids)
+        self._fetch = fetch
+        self._sorted = all(self._ids[i] < self._ids[i + 1] for i in range(len(self._ids) - 1))
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def rows(self, start: int, end: int) -> List[Dict]:
+        return self._fetch(self.ids(start, end))
+    
+    def ids(self, start: int, end: int) -> List[int]:
+        return list(self._ids[start:end])
+    
+    def position_of(self, book_id: int) -> Optional[int]:
+        book_id = int(book_id)
+        if self._sorted:
+            position = bisect.bisect_left(self._ids, book_id)
+            if position < len(self._ids) and self._ids[position] == book_id:
+                return position
+            return None
+        try:
+            return self._ids.index(book_id)
+        except ValueError:
+            return None
+    
+    def append(self, rows: List[Dict]) -> None:
+        for row in rows:
+            book_id = int(row[self.id_column])
+            if len(self._ids) and book_id <= self._ids[-1]:
+                self._sorted = False
+            self._ids.append(book_id)
+    
+    def update(self, rows: List[Dict]) -> None:
+        # Rien à faire: les lignes sont relues à chaque affichage
+        pass
+    
+    def remove(self, book_ids: List[int]) -> None:
+        for book_id in book_ids:
+            position = self.position_of(book_id)
+            if position is not None:
+                del self._ids[position]
+
+class VirtualTreeview:
+    """
+    Tableau à défilement virtuel basé sur un ttk.Treeview.
+    
+    Seules les lignes de la fenêtre visible (plus une petite marge) sont
+    créées dans le Treeview; la barre de défilement, la molette et le
+    clavier déplacent cette fenêtre sur la source (DataFrame, ou lignes
+    lues à la demande avec LazySource). Le nombre d'éléments Tk reste donc
+    constant quelle que soit la taille du catalogue.
+    
+    Les lignes sont indexées par leur ID, ce qui permet d'appliquer des
+    modifications ciblées (append_rows, update_rows, remove_rows) sans
+    reconstruire le tableau ni perdre la position de défilement.
+    
+    Une image peut être affichée dans la colonne #0 (set_row_image): elle
+    n'est demandée que pour les lignes matérialisées, et on_window reçoit
+    les IDs de la fenêtre à chaque changement pour que l'appelant abandonne
+    les chargements devenus inutiles.
+    """
+    
+    HAUTEUR_LIGNE = 20
+    HAUTEUR_ENTETE = 25
+    
+    def __init__(self, parent, columns, format_row, id_column="ID", overscan=5, on_window=None):
+        """
+        Crée le tableau et sa barre de défilement dans parent.
+        
+        Args:
+            parent: Widget parent
+            columns: Noms des colonnes affichées
+            format_row: Fonction dict (ligne du DataFrame) -> tuple de valeurs
+            id_column: Colonne identifiant une ligne (sert d'iid Treeview)
+            overscan: Lignes créées en plus de la zone visible
+            on_window: Fonction appelée avec les IDs de la fenêtre matérialisée
+        """
+        self.format_row = format_row
+        self.row_image = None
+        self.on_window = on_window
+        self.id_column = id_column
+        self.overscan = overscan
+        
+        self._source = FrameSource(pd.DataFrame(), id_column)
+        self._offset = 0
+        self._visible_rows = 20
+        self._selected_ids = set()
+        
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.tree = ttk.Treeview(parent, columns=columns, height=self._visible_rows)
+        
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self._move_focus(-1))
+        self.tree.bind("<Down>", lambda e: self._move_focus(1))
+        self.tree.bind("<Prior>", lambda e: self._move_focus(-self._visible_rows))
+        self.tree.bind("<Next>", lambda e: self._move_focus(self._visible_rows))
+        self.tree.bind("<Home>", lambda e: self._move_focus(-len(self._source)))
+        self.tree.bind("<End>", lambda e: self._move_focus(len(self._source)))
+    
+    def __len__(self) -> int:
+        return len(self._source)
+    
+    def set_data(self, df: pd.DataFrame) -> None:
+        """
+        Remplace les données affichées et revient en haut du tableau.
+        
+        Args:
+            df: DataFrame source
+        """
+        self.set_source(FrameSource(df, self.id_column))
+    
+    def set_source(self, source) -> None:
+        """
+        Remplace la source des lignes (FrameSource ou LazySource) et revient
+        en haut du tableau.
+        
+        Args:
+            source: Source des lignes
+        """
+        self._source = source
+        self._offset = 0
+        self._selected_ids = set()
+        self._render()
+    
+    def set_row_image(self, row_image: Optional[Callable[[Dict], object]], style: str = "Treeview") -> None:
+        """
+        Active ou désactive l'image de la colonne #0 et redessine le tableau.
+        
+        Args:
+            row_image: Fonction ligne -> image Tk (ou None si pas encore
+                disponible), ou None pour ne plus afficher d'images
+            style: Style ttk du Treeview (hauteur de ligne adaptée aux images)
+        """
+        self.row_image = row_image
+        self.tree.configure(style=style)
+        self._resize(self.tree.winfo_height())
+        self._render()
+    
+    def set_image(self, book_id: int, image) -> None:
+        """Affiche une image arrivée après coup si la ligne est toujours matérialisée."""
+        iid = str(int(book_id))
+        if self.row_image is not None and self.tree.exists(iid):
+            self.tree.item(iid, image=image)
+    
+    def window_ids(self) -> List[int]:
+        """IDs des lignes actuellement matérialisées dans le Treeview."""
+        return [int(iid) for iid in self.tree.get_children()]
+    
+    def contains(self, book_id: int) -> bool:
+        """Indique si une ligne est présente dans les données affichées."""
+        return self.position_of(book_id) is not None
+    
+    def append_rows(self, rows: List[Dict]) -> None:
+        """
+        Ajoute des lignes à la fin des données.
+        
+        Args:
+            rows: Lignes complètes (dictionnaires colonne -> valeur)
+        """
+        if not rows:
+            return
+        self._source.append(rows)
+        self._fill_window()
+    
+    def update_rows(self, rows: List[Dict]) -> None:
+        """
+        Met à jour des lignes existantes et leur affichage si elles sont visibles.
+        
+        Args:
+            rows: Lignes complètes (dictionnaires colonne -> valeur)
+        """
+        self._source.update(rows)
+        for row in rows:
+            iid = str(int(row[self.id_column]))
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=self.format_row(row), **self._image_option(row))
+    
+    def remove_rows(self, book_ids: List[int]) -> None:
+        """
+        Retire des lignes en gardant les lignes visibles à leur place.
+        
+        Args:
+            book_ids: IDs des lignes à retirer
+        """
+        present = [int(book_id) for book_id in book_ids if self.contains(book_id)]
+        if not present:
+            return
+        
+        above = sum(1 for book_id in present if self.position_of(book_id) < self._offset)
+        self._source.remove(present)
+        for book_id in present:
+            iid = str(book_id)
+            self._selected_ids.discard(iid)
+            if self.tree.exists(iid):
+                self.tree.delete(iid)
+        
+        self._offset = min(max(0, self._offset - above), self._max_offset())
+        self._fill_window()
+    
+    def position_of(self, book_id: int) -> Optional[int]:
+        """Retourne la position d'une ligne dans les données, ou None."""
+        return self._source.position_of(book_id)
+    
+    def scroll(self, rows: int) -> str:
+        """Fait défiler la fenêtre visible de rows lignes."""
+        self._set_offset(self._offset + rows)
+        return "break"
+    
+    def see(self, position: int) -> None:
+        """Fait défiler le tableau pour rendre visible la ligne position."""
+        if position < self._offset:
+            self._set_offset(position)
+        elif position >= self._offset + self._visible_rows:
+            self._set_offset(position - self._visible_rows + 1)
+    
+    def _max_offset(self) -> int:
+        return max(0, len(self._source) - self._visible_rows)
+    
+    def _set_offset(self, offset: int) -> None:
+        offset = min(max(0, int(offset)), self._max_offset())
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+    
+    def _render(self) -> None:
+        """Matérialise uniquement les lignes de la fenêtre courante."""
+        tree = self.tree
+        current = tree.get_children()
+        
+        # Conserver la sélection des lignes sorties de la fenêtre
+        self._selected_ids.difference_update(current)
+        self._selected_ids.update(tree.selection())
+        
+        if current:
+            tree.delete(*current)
+        
+        end = min(len(self._source), self._offset + self._visible_rows + self.overscan)
+        window = self._source.rows(self._offset, end)
+        visible_selection = []
+        for row in window:
+            iid = self._insert(row)
+            if iid in self._selected_ids:
+                visible_selection.append(iid)
+        if visible_selection:
+            tree.selection_set(visible_selection)
+        
+        tree.yview_moveto(0)
+        self._update_scrollbar()
+        self._notify_window()
+    
+    def _insert(self, row: Dict) -> str:
+        """Crée l'élément Treeview d'une ligne et retourne son iid."""
+        iid = str(row[self.id_column])
+        self.tree.insert("", "end", iid=iid, values=self.format_row(row), **self._image_option(row))
+        return iid
+    
+    def _image_option(self, row: Dict) -> Dict:
+        if self.row_image is None:
+            return {}
+        image = self.row_image(row)
+        return {"image": image if image is not None else ""}
+    
+    def _notify_window(self) -> None:
+        if self.on_window is not None:
+            self.on_window(self.window_ids())
+    
+    def _fill_window(self) -> None:
+        """
+        Complète la fenêtre affichée après un ajout ou une suppression.
+        
+        Si les éléments présents correspondent toujours au début de la
+        fenêtre attendue, seules les lignes manquantes sont insérées; sinon
+        la fenêtre est redessinée.
+        """
+        end = min(len(self._source), self._offset + self._visible_rows + self.overscan)
+        expected = [str(book_id) for book_id in self._source.ids(self._offset, end)]
+        current = list(self.tree.get_children())
+        
+        if current != expected[:len(current)]:
+            self._render()
+            return
+        
+        missing = self._source.rows(self._offset + len(current), end)
+        for row in missing:
+            self._insert(row)
+        self._update_scrollbar()
+        self._notify_window()
+    
+    def _update_scrollbar(self) -> None:
+        total = len(self._source)
+        if total == 0:
+            self.scrollbar.set(0, 1)
+            return
+        first = self._offset / total
+        last = min(1.0, (self._offset + self._visible_rows) / total)
+        self.scrollbar.set(first, last)
+    
+    def _on_scrollbar(self, action, value, unit=None) -> None:
+        """Commande de la barre de défilement (moveto / scroll)."""
+        if action == "moveto":
+            self._set_offset(round(float(value) * len(self._source)))
+        elif action == "scroll":
+            step = self._visible_rows if unit == "pages" else 1
+            self.scroll(int(value) * step)
+    
+    def _on_mousewheel(self, event) -> str:
+        # Windows: multiples de 120; macOS: petites valeurs
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll(-delta * 3)
+    
+    def _on_configure(self, event) -> None:
+        """Adapte le nombre de lignes visibles à la hauteur du widget."""
+        if self._resize(event.height):
+            self._render()
+    
+    def _resize(self, height: int) -> bool:
+        """
+        Recalcule le nombre de lignes visibles pour une hauteur donnée.
+        
+        Returns:
+            True si ce nombre a changé
+        """
+        if height <= 1:
+            # Widget pas encore affiché
+            return False
+        style = self.tree.cget("style") or "Treeview"
+        rowheight = ttk.Style().lookup(style, "rowheight") or self.HAUTEUR_LIGNE
+        visible = max(1, (height - self.HAUTEUR_ENTETE) // int(rowheight))
+        if visible == self._visible_rows:
+            return False
+        self._visible_rows = visible
+        self._offset = min(self._offset, self._max_offset())
+        return True
+    
+    def _move_focus(self, step: int) -> str:
+        """Déplace le focus clavier en faisant défiler la fenêtre si besoin."""
+        if len(self._source) == 0:
+            return "break"
+        
+        items = self.tree.get_children()
+        focus = self.tree.focus()
+        position = self._offset + (items.index(focus) if focus in items else 0)
+        target = min(max(0, position + step), len(self._source) - 1)
+        
+        self.see(target)
+        iid = str(self._source.ids(target, target + 1)[0])
+        self._selected_ids = set()
+        self.tree.selection_set(iid)
+        self.tree.focus(iid)
+        return "break"